@@ -1,11 +1,26 @@
 # app.py (V2) — Spotify Popularity Dashboard (Upgraded UI)
+import os
+import json
+import random
+import functools
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from joblib import load
-import random
+from src.storage import AUDIO_FEATURES, load_table, dataset_fingerprint, file_digest
+from src.stats import load_stats
+from src.search import load_or_build_index
+from src.scoring import model_features, score_catalog, residual_leaderboard
+from src.figcache import FigureCache, figure_key, render_png
+from src.binning import fft_kde, hist2d_counts, linear_fit, stratified_sample
+from src.perf import PerfRecorder
+from src.featurestore import build_feature_store, ORIGINAL_PATH
+from src.inference import load_predictor
+from src.similar import SIMILAR_PATH, load_or_build_similar
+from src.cube import CUBE_PATH, load_or_build_cube, track_mask
+from src.trends import load_trends
+from src.registry import active_paths, current, list_versions, set_current
+from src.retrain import LOG_PATH as RETRAIN_LOG_PATH, RetrainBusy, job_status, start_background
 
 # ---------------------------
 # Page config & style
@@ -75,42 +90,198 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# seaborn theme & palettes
-plt.style.use("dark_background")
-sns.set_style("darkgrid")
-sns.set_palette(["#1DB954", "#4b5563", "#282828"])
+# seaborn theme & palettes (THEME ikut menjadi bagian key cache chart)
+THEME = {"style": "dark_background", "seaborn": "darkgrid", "palette": ["#1DB954", "#4b5563", "#282828"]}
+
+# matplotlib & seaborn (import paling berat) baru dimuat saat chart pertama
+# benar-benar perlu di-render, bukan saat startup
+@st.cache_resource
+def plotting():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use(THEME["style"])
+    sns.set_style(THEME["seaborn"])
+    sns.set_palette(THEME["palette"])
+    return plt, sns
 PALETTE_1 = "magma"
 PALETTE_2 = "coolwarm"
 PALETTE_3 = "viridis"
 
 # ---------------------------
-# Caching loaders
+# Instrumentasi performa
 # ---------------------------
-@st.cache_data
-def load_data(path="data/spotify_cleaned.csv"):
-    return pd.read_csv(path)
-
+# Satu recorder per proses (dipakai semua sesi). Panel "Performance" di sidebar
+# tersembunyi secara default; tampilkan dengan ?perf=1 atau SPOTIFY_DASHBOARD_PERF=1.
+# Jika SPOTIFY_DASHBOARD_METRICS_FILE di-set, metrik ditulis (format Prometheus
+# textfile) ke path tersebut setiap akhir rerun.
 @st.cache_resource
-def load_model(path="src/models/popularity_model.pkl"):
-    return load(path)
+def get_perf():
+    return PerfRecorder()
+
+perf = get_perf()
+perf_run = perf.begin_run()
+_cache_miss = threading.local()
+
+def instrumented(cache, name):
+    # Loader ber-cache yang mencatat hit/miss: isi fungsi hanya dieksekusi saat miss
+    def decorate(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            _cache_miss.flag = True
+            return func(*args, **kwargs)
+        cached = cache(body)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            # Simpan flag pemanggil supaya loader bersarang (mis. get_scores) tidak saling menimpa
+            outer = getattr(_cache_miss, "flag", False)
+            _cache_miss.flag = False
+            try:
+                with perf.timer(f"load:{name}"):
+                    result = cached(*args, **kwargs)
+                perf.cache_event(name, hit=not _cache_miss.flag)
+            finally:
+                _cache_miss.flag = outer
+            return result
+        return call
+    return decorate
+
+# ---------------------------
+# Caching loaders
+# ---------------------------
+# Dataset dimuat sekali per proses & dibagi semua sesi (tanpa pickle/salinan per rerun);
+# kolom numerik dari file .arrow tetap berupa view read-only ke memory map.
+# Setiap pemanggil mendapat salinan dangkal: dengan copy-on-write pandas, data tidak
+# disalin, dan perubahan kolom di satu sesi tidak terlihat di sesi lain.
+# Hanya kolom yang diminta halaman yang dibaca (di-key daftar kolom).
+@instrumented(st.cache_resource, "load_data")
+def _shared_data(path, columns):
+    return load_table(path, list(columns))
+
+def load_data(columns, path="data/spotify_cleaned.csv"):
+    return _shared_data(path, tuple(columns)).copy(deep=False)
+
+# Versi model yang dilayani dibaca dari pointer registry (src/registry.py) setiap rerun.
+# Cache model & skor di-key path versi: setelah retraining (atau rollback) sesi yang
+# sedang berjalan memakai versi baru pada rerun berikutnya, tanpa restart. Versi di
+# registry tidak pernah ditimpa, jadi artefak yang dibaca selalu utuh. Maksimal dua
+# versi (aktif & sebelumnya) disimpan di memori.
+MODEL_PATH, MODEL_INFERENCE_PATH, model_version = active_paths()
+MODEL_CHECK_SECONDS = 30
+
+if "model_version" in st.session_state and st.session_state["model_version"] != model_version:
+    st.toast(f"Model diperbarui ke versi {model_version}")
+st.session_state["model_version"] = model_version
+
+def rerun_if_model_changed():
+    if (current() or {}).get("version") != model_version:
+        st.rerun(scope="app")
+
+# Sesi yang sedang dibuka memeriksa pointer secara berkala (tanpa menunggu interaksi)
+@st.fragment(run_every=MODEL_CHECK_SECONDS)
+def model_watch():
+    rerun_if_model_changed()
+
+model_watch()
+
+@instrumented(st.cache_resource(max_entries=2), "load_model")
+def load_model(path=MODEL_PATH, inference_path=MODEL_INFERENCE_PATH):
+    # Artefak NumPy-only (src/inference.py) dipakai jika berasal dari .pkl yang sama;
+    # joblib + sklearn hanya diimpor sebagai fallback (mis. model non-linier)
+    try:
+        return load_predictor(inference_path, get_model_digest(path))
+    except (OSError, ValueError, KeyError):
+        from joblib import load
+        return load(path)
 
 # ---------------------------
 # Load resources
 # ---------------------------
-df = load_data()
-model = load_model()
+# Dataset, model, skor & indeks dimuat oleh halaman yang membutuhkannya saja
+# (lihat fungsi view_* di bawah); yang dibaca setiap rerun hanya artefak statistik.
+
+# Feature store per track_id (fitur bersih + metadata tampilan, lookup O(1)).
+# Menggantikan pemetaan posisi baris antara data mentah & data bersih.
+# Hanya kolom yang dipakai yang dibaca: fitur model aktif (skor & panel prediksi),
+# fitur audio (lagu serupa) dan target. Model baru dengan fitur berbeda membangun
+# store baru; maksimal dua disimpan di memori (seperti skor).
+@instrumented(st.cache_resource(max_entries=2), "get_feature_store")
+def _feature_store(columns):
+    return build_feature_store(columns=list(columns))
+
+def get_feature_store():
+    return _feature_store(tuple(dict.fromkeys(get_model_cols() + AUDIO_FEATURES + ['track_popularity'])))
+
+# Artefak statistik (ukuran dataset, korelasi, top fitur) dibangun sekali oleh
+# src/stats.py dan hanya dibaca di sini; agregat genre, ringkasan popularitas &
+# top/bottom 5 berasal dari filter cube (lihat filter_summary)
+@instrumented(st.cache_data, "get_stats")
+def get_stats():
+    return load_stats()
+
+stats = get_stats()
+
+top_features = stats["top_features"]
+corr_pop = pd.Series(stats["corr_pop"])
+
+# Indeks pencarian judul/artis (dibangun sekali, disimpan ke data/search_index.pkl)
+@instrumented(st.cache_resource, "get_search_index")
+def get_search_index(path="data/search_index.pkl"):
+    # Key indeks = track_id di feature store
+    return load_or_build_index(get_feature_store().meta, path, dataset_fingerprint(ORIGINAL_PATH))
+
+# Indeks "lagu serupa" (nearest neighbour fitur audio, disimpan ke data/similar_index.npz)
+@instrumented(st.cache_resource, "get_similar_index")
+def get_similar_index(path=SIMILAR_PATH):
+    return load_or_build_similar(get_feature_store(), path, dataset_fingerprint(ORIGINAL_PATH))
+
+# Filter cube (agregat pra-hitung genre/subgenre/tahun + indeks artis, data/filter_cube.npz)
+@instrumented(st.cache_resource, "get_filter_cube")
+def get_filter_cube(path=CUBE_PATH):
+    return load_or_build_cube(top_features, path, dataset_fingerprint(ORIGINAL_PATH))
+
+# Indeks tren per tahun rilis (dibangun src/trends.py, disimpan ke data/spotify_trends.npz)
+@instrumented(st.cache_resource, "get_trends")
+def get_trends():
+    return load_trends()
+
+# Fitur input model (urutan saat training) & skor seluruh katalog.
+# Prediksi dihitung sekali dalam satu batch saat model dimuat.
+def get_model_cols():
+    return model_features(load_model(MODEL_PATH, MODEL_INFERENCE_PATH), top_features)
+
+@instrumented(st.cache_resource(max_entries=2), "get_scores")
+def get_scores(path=MODEL_PATH, inference_path=MODEL_INFERENCE_PATH):
+    model, store = load_model(path, inference_path), get_feature_store()
+    with perf.timer("predict:score_catalog"):
+        scores = score_catalog(model, store.frame(), model_features(model, top_features))
+    return scores.join(store.meta[["track_name", "track_artist", "playlist_genre"]])
 
-# Load original dataset (untuk nama lagu & artis, genre, subgenre sebelum encoding)
-@st.cache_data
-def load_original_data(path="data/spotify_songs.csv"):
-    return pd.read_csv(path)
+# ---------------------------
+# Cache chart (PNG) lintas rerun & sesi
+# ---------------------------
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_bytes=64 * 1024 * 1024)
+
+@st.cache_resource(max_entries=8)
+def get_model_digest(path=MODEL_PATH):
+    return file_digest(path)
 
-df_original = load_original_data()
+fig_cache = get_figure_cache()
 
+def _render_chart(name, plot):
+    plt, sns = plotting()
+    with perf.timer(f"chart:{name}"):
+        return render_png(plot(plt, sns))
 
-# recompute top features (consistent with model training)
-corr_matrix = df.corr()
-top_features = corr_matrix['track_popularity'].abs().sort_values(ascending=False).index[1:6].tolist()
+def show_chart(name, params, plot):
+    # Render hanya jika belum ada di cache; key mencakup dataset, model, parameter & tema
+    key = figure_key(stats["fingerprint"], get_model_digest(MODEL_PATH), name, params, THEME)
+    png = fig_cache.get_or_render(key, lambda: _render_chart(name, plot))
+    st.image(png, width="stretch")
 
 # ---------------------------
 # Sidebar
@@ -135,9 +306,9 @@ st.sidebar.markdown("""
 # Dataset Info dengan metrik
 col1, col2 = st.sidebar.columns(2)
 with col1:
-    st.metric("Total Lagu", f"{len(df):,}")
+    st.metric("Total Lagu", f"{stats['n_rows']:,}")
 with col2:
-    st.metric("Fitur", f"{len(df.columns)}")
+    st.metric("Fitur", f"{stats['n_cols']}")
 
 # Fitur Dashboard
 st.sidebar.markdown("### Fitur Dashboard")
@@ -145,18 +316,61 @@ st.sidebar.markdown("""
 ✦ Analisis Distribusi Popularitas  
 ✦ Insight Genre & Subgenre  
 ✦ Analisis Korelasi Fitur  
+✦ Tren per Tahun Rilis  
 ✦ Prediksi Popularitas Lagu  
+✦ Evaluasi Prediksi Model  
 """)
 
+# Ringkasan tanpa filter = slice penuh filter cube, baris yang sama dengan hasil
+# filter apa pun (memilih semua genre memberi angka yang sama dengan tanpa filter).
+# Dihitung sekali per cube & dibagi semua sesi (read-only).
+def summarize(sl):
+    corr = sl.corr()
+    return {
+        "slice": sl,
+        "n_rows": sl.count,
+        "popularity": sl.popularity(),
+        "corr": corr,
+        "corr_pop": corr["track_popularity"].drop("track_popularity"),
+        "genre_counts": sl.counts("playlist_genre"),
+        "subgenre_counts": sl.counts("playlist_subgenre"),
+        "genre_popularity": sl.mean_popularity("playlist_genre"),
+        "top5": sl.songs(5, largest=True),
+        "bottom5": sl.songs(5, largest=False),
+    }
+
+@instrumented(st.cache_resource, "overall_summary")
+def overall_summary(fingerprint, measures):
+    return summarize(get_filter_cube().aggregate({}))
+
+cube = get_filter_cube()
+overall = overall_summary(cube.fingerprint, tuple(cube.measures))
+
 # Quick Stats
 st.sidebar.markdown("### Quick Stats")
 st.sidebar.markdown(f"""
-- **Genre Terpopuler berdasarkan lagu**: {df_original['playlist_genre'].value_counts().index[0]}
-- **Genre dengan rata rata popularitas tertinggi**: pop
-- **Rata-rata Popularitas**: {df['track_popularity'].mean():.2f}
-- **Total Genre**: {df_original['playlist_genre'].nunique()}
+- **Genre Terpopuler berdasarkan lagu**: {overall['genre_counts'].index[0]}
+- **Genre dengan rata rata popularitas tertinggi**: {overall['genre_popularity'].index[0]}
+- **Rata-rata Popularitas**: {overall['popularity']['mean']:.2f}
+- **Total Genre**: {len(cube.options('playlist_genre'))}
 """)
 
+# Filter (berlaku untuk semua halaman)
+st.sidebar.markdown("### Filter")
+filters = {}
+filters["playlist_genre"] = st.sidebar.multiselect("Genre", cube.options("playlist_genre"), key="filter_genre")
+filters["playlist_subgenre"] = st.sidebar.multiselect(
+    "Subgenre", cube.options("playlist_subgenre", filters["playlist_genre"]), key="filter_subgenre")
+filters["track_artist"] = st.sidebar.multiselect("Artis", cube.options("track_artist"), key="filter_artist")
+year_min, year_max = cube.year_range
+if year_max > year_min:
+    years = st.sidebar.slider("Tahun Rilis", year_min, year_max, (year_min, year_max), key="filter_year")
+    if years != (year_min, year_max):
+        filters["year"] = tuple(years)
+filters = {dim: value for dim, value in filters.items() if value}
+# Key filter ikut masuk parameter chart (cache PNG per kombinasi filter)
+filter_key = json.dumps(filters, sort_keys=True) if filters else None
+
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown("""
@@ -166,6 +380,38 @@ st.sidebar.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# ---------------------------
+# Ringkasan sesuai filter
+# ---------------------------
+# Dengan filter: dihitung dari slice filter cube (O(jumlah cell), bukan O(jumlah baris)).
+def filter_summary():
+    if not filters:
+        return overall
+    with perf.timer("filter:aggregate"):
+        return summarize(cube.aggregate(filters))
+
+summary = filter_summary()
+
+def filtered_rows(df):
+    # Baris dataset bersih yang lolos filter (untuk chart per baris)
+    if not filters:
+        return df
+    with perf.timer("filter:rows"):
+        return df[cube.row_mask(filters)]
+
+@st.cache_resource(max_entries=32)
+def _track_mask(key):
+    mask = track_mask(get_feature_store().meta, json.loads(key))
+    mask.flags.writeable = False
+    return mask
+
+def filtered_tracks():
+    # Mask per track di feature store (urutan sama dengan skor katalog); None jika tanpa filter
+    if not filters:
+        return None
+    with perf.timer("filter:tracks"):
+        return _track_mask(filter_key)
+
 # ---------------------------
 # Header
 # ---------------------------
@@ -176,20 +422,28 @@ st.markdown(
 )
 
 # ---------------------------
-# Tabs
+# Navigasi
 # ---------------------------
-tabs = st.tabs([
+# Berbeda dengan st.tabs (semua isi tab dieksekusi tiap rerun), hanya halaman
+# yang dipilih yang dijalankan. Widget di halaman interaktif dibungkus
+# st.fragment sehingga interaksi hanya me-rerun bagiannya sendiri.
+PAGES = [
     "Overview",
     "Popularitas",
     "Genre Insight",
     "Korelasi",
-    "Cari & Prediksi Lagu"
-])
+    "Tren Rilis",
+    "Cari & Prediksi Lagu",
+    "Evaluasi Model",
+]
+page = st.radio("Halaman", PAGES, horizontal=True, label_visibility="collapsed", key="page")
 
 # ---------------------------
 # Tab: Overview (UPDATED)
 # ---------------------------
-with tabs[0]:
+def view_overview():
+    df = filtered_rows(load_data(top_features + ['track_popularity']))
+    pop_stats, corr_pop = summary["popularity"], summary["corr_pop"]
     st.header("Overview Project")
 
     col1, col2, col3 = st.columns([1.5, 1, 1])
@@ -198,16 +452,16 @@ with tabs[0]:
     with col1:
         st.subheader("Dataset Snapshot")
         st.write(f"Jumlah baris: **{df.shape[0]:,}**")
-        st.write(f"Jumlah kolom: **{df.shape[1]}**")
+        st.write(f"Jumlah kolom: **{stats['n_cols']}**")
         st.write("Contoh beberapa kolom penting:")
-        st.dataframe(df[top_features + ['track_popularity']].head(6), use_container_width=True)
+        st.dataframe(df[top_features + ['track_popularity']].head(6), width="stretch")
 
     # Target Summary
     with col2:
         st.subheader("Target Summary")
-        mean_pop = df['track_popularity'].mean()
-        median_pop = df['track_popularity'].median()
-        max_pop = df['track_popularity'].max()
+        mean_pop = pop_stats['mean']
+        median_pop = pop_stats['median']
+        max_pop = pop_stats['max']
         st.metric("Mean Popularity", f"{mean_pop:.2f}")
         st.metric("Median Popularity", f"{median_pop:.2f}")
         st.metric("Max Popularity", f"{max_pop:.0f}")
@@ -216,38 +470,29 @@ with tabs[0]:
     with col3:
         st.subheader("Top Features (by abs correlation)")
         for i, f in enumerate(top_features, 1):
-            val = corr_matrix['track_popularity'][f]
+            val = corr_pop[f]
             st.write(f"{i}. **{f}** — korelasi: {val:.3f}")
 
     # ===========================
     # Tambahan Baru: Top 5 & Bottom 5 Lagu
     # ===========================
     
-    # Load data dari dataset original (spotify_songs.csv) untuk popularitas yang akurat
-    df_songs = pd.read_csv('data/spotify_songs.csv')
-    
-    # Menghilangkan duplikat dan data tidak valid
-    df_songs = df_songs.drop_duplicates(subset=['track_name', 'track_artist'])
-    df_valid = df_songs[
-        (df_songs['track_name'].str.len() > 0) &
-        (df_songs['track_artist'].str.len() > 0)
-    ]
-    
+    # Diambil dari artefak statistik (dataset original spotify_songs.csv, tanpa duplikat judul+artis)
     st.subheader("Top 5 Lagu Paling Populer")
-    # Ambil lagu dengan popularitas > 0 untuk menghindari data yang belum di-rate
-    df_top5 = df_valid[df_valid['track_popularity'] > 0].nlargest(5, "track_popularity")[["track_name", "track_artist", "track_popularity"]]
-    df_top5 = df_top5.reset_index(drop=True)
+    # Lagu dengan popularitas > 0 untuk menghindari data yang belum di-rate
+    df_top5 = summary["top5"].copy()
     df_top5.index += 1
-    st.dataframe(df_top5, use_container_width=True)
+    st.dataframe(df_top5, width="stretch")
 
     st.subheader("Bottom 5 Lagu Kurang Populer")
-    # Filter lagu dengan popularitas minimum 10 untuk menghindari lagu yang belum banyak di-rate
-    df_bottom5 = df_valid[df_valid['track_popularity'] >= 10].nsmallest(5, "track_popularity")[["track_name", "track_artist", "track_popularity"]]
-    df_bottom5 = df_bottom5.reset_index(drop=True)
+    # Lagu dengan popularitas minimum 10 untuk menghindari lagu yang belum banyak di-rate
+    df_bottom5 = summary["bottom5"].copy()
     df_bottom5.index += 1
-    st.dataframe(df_bottom5, use_container_width=True)
+    st.dataframe(df_bottom5, width="stretch")
 
     # Insight otomatis
+    if df_top5.empty or df_bottom5.empty:
+        return
     top_song = df_top5.iloc[0]["track_name"]
     top_artist = df_top5.iloc[0]["track_artist"]
     bottom_song = df_bottom5.iloc[0]["track_name"]
@@ -262,29 +507,48 @@ with tabs[0]:
 # ---------------------------
 # Tab: Popularitas (UPDATED)
 # ---------------------------
-with tabs[1]:
+def view_popularity():
+    sl = summary["slice"]
+    pop_stats = summary["popularity"]
     st.header("Distribusi Popularitas Lagu")
     st.markdown("Tab ini menunjukkan bagaimana popularitas lagu tersebar dalam dataset, lengkap dengan garis rata-rata (mean) dan median untuk membantu interpretasi.")
 
-    mean_pop = df['track_popularity'].mean()
-    median_pop = df['track_popularity'].median()
+    mean_pop = pop_stats['mean']
+    median_pop = pop_stats['median']
 
     # Histogram dengan garis Mean & Median
-    fig, ax = plt.subplots(figsize=(10, 4))
-    sns.histplot(df['track_popularity'], kde=True, stat="density", color=sns.color_palette("plasma", 1)[0], ax=ax)
-    ax.axvline(mean_pop, color='red', linestyle='--', linewidth=2, label=f"Mean: {mean_pop:.2f}")
-    ax.axvline(median_pop, color='green', linestyle='-', linewidth=2, label=f"Median: {median_pop:.2f}")
-    ax.set_xlabel("Track Popularity")
-    ax.set_ylabel("Density")
-    ax.set_title("Distribusi Popularitas Lagu")
-    ax.legend()
-    st.pyplot(fig, use_container_width=True)
+    # Histogram & KDE dihitung dari data yang sudah di-bin (biaya tetap, tidak tergantung jumlah baris)
+    def _plot_hist(plt, sns):
+        color = sns.color_palette("plasma", 1)[0]
+        # Histogram cube (100 bin) -> 50 bin; KDE dari tengah bin berbobot jumlahnya
+        counts, edges = sl.histogram(bins=50)
+        fine, fine_edges = sl.histogram()
+        grid, kde = fft_kde((fine_edges[:-1] + fine_edges[1:]) / 2, weights=fine)
+        density = counts / max(counts.sum(), 1) / np.diff(edges)
+        fig, ax = plt.subplots(figsize=(10, 4))
+        ax.stairs(density, edges, fill=True, color=color, alpha=0.6)
+        ax.plot(grid, kde, color=color, linewidth=2)
+        ax.axvline(mean_pop, color='red', linestyle='--', linewidth=2, label=f"Mean: {mean_pop:.2f}")
+        ax.axvline(median_pop, color='green', linestyle='-', linewidth=2, label=f"Median: {median_pop:.2f}")
+        ax.set_xlabel("Track Popularity")
+        ax.set_ylabel("Density")
+        ax.set_title("Distribusi Popularitas Lagu")
+        ax.legend()
+        return fig
+    show_chart("popularity_hist", {"figsize": (10, 4), "bins": 50, "filter": filter_key}, _plot_hist)
 
     # Boxplot (tetap digunakan untuk deteksi outlier)
     st.markdown("### Boxplot Popularitas (untuk melihat outlier)")
-    fig2, ax2 = plt.subplots(figsize=(10, 2))
-    sns.boxplot(x=df['track_popularity'], ax=ax2, palette=[sns.color_palette("plasma", 1)[0]])
-    st.pyplot(fig2, use_container_width=True)
+    def _plot_box(plt, sns):
+        fig2, ax2 = plt.subplots(figsize=(10, 2))
+        color = sns.color_palette("plasma", 1)[0]
+        # Kuartil & whisker dari histogram cube (outlier per lagu tidak digambar)
+        ax2.bxp([sl.box_stats()], orientation="horizontal", showfliers=False, patch_artist=True,
+                boxprops={"facecolor": color})
+        ax2.set_yticks([])
+        ax2.set_xlabel("track_popularity")
+        return fig2
+    show_chart("popularity_box", {"figsize": (10, 2), "filter": filter_key}, _plot_box)
 
     # Insight otomatis
     st.markdown("### Insight:")
@@ -299,14 +563,14 @@ with tabs[1]:
         f"Rata-rata popularitas: **{mean_pop:.2f}**, median: **{median_pop:.2f}**.\n"
         f"{skew_desc}\n"
         f"Mayoritas lagu berada pada rentang popularitas sekitar "
-        f"**{df['track_popularity'].quantile(0.25):.0f} hingga {df['track_popularity'].quantile(0.75):.0f}**."
+        f"**{pop_stats['q25']:.0f} hingga {pop_stats['q75']:.0f}**."
     )
 
 
 # ---------------------------
 # Tab: Genre Insight (UPDATED)
 # ---------------------------
-with tabs[2]:
+def view_genre():
     st.header("Genre & Popularitas Insight")
     st.markdown("""
     Tab ini menunjukkan distribusi jumlah lagu berdasarkan genre dan subgenre, 
@@ -320,40 +584,46 @@ with tabs[2]:
     # ============================
     with colg1:
         st.subheader("Top 6 Genre (Jumlah Lagu)")
-        top_genres = df_original['playlist_genre'].value_counts().head(10)
+        top_genres = summary["genre_counts"]
         top_genres_labeled = top_genres.index + " (" + top_genres.values.astype(str) + " lagu)"
-        figg1, axg1 = plt.subplots(figsize=(8, 4))
-        sns.barplot(x=top_genres.values, y=top_genres_labeled, palette="plasma", ax=axg1)
-        axg1.set_title("Top 6 Genre berdasarkan Jumlah Lagu")
-        axg1.set_xlabel("Jumlah Lagu")
-        axg1.set_ylabel("Genre")
-        st.pyplot(figg1, use_container_width=True)
+        def _plot_genres(plt, sns):
+            figg1, axg1 = plt.subplots(figsize=(8, 4))
+            sns.barplot(x=top_genres.values, y=top_genres_labeled, palette="plasma", ax=axg1)
+            axg1.set_title("Top 6 Genre berdasarkan Jumlah Lagu")
+            axg1.set_xlabel("Jumlah Lagu")
+            axg1.set_ylabel("Genre")
+            return figg1
+        show_chart("genre_counts", {"n": len(top_genres), "filter": filter_key}, _plot_genres)
 
     # ============================
     # Top 10 Subgenre (Jumlah Lagu)
     # ============================
     with colg2:
         st.subheader("Top 10 Subgenre (Jumlah Lagu)")
-        top_subgenres = df_original['playlist_subgenre'].value_counts().head(10)
+        top_subgenres = summary["subgenre_counts"]
         top_subgenres_labeled = top_subgenres.index + " (" + top_subgenres.values.astype(str) + " lagu)"
-        figg2, axg2 = plt.subplots(figsize=(8, 4))
-        sns.barplot(x=top_subgenres.values, y=top_subgenres_labeled, palette="plasma", ax=axg2)
-        axg2.set_title("Top 10 Subgenre berdasarkan Jumlah Lagu")
-        axg2.set_xlabel("Jumlah Lagu")
-        axg2.set_ylabel("Subgenre")
-        st.pyplot(figg2, use_container_width=True)
+        def _plot_subgenres(plt, sns):
+            figg2, axg2 = plt.subplots(figsize=(8, 4))
+            sns.barplot(x=top_subgenres.values, y=top_subgenres_labeled, palette="plasma", ax=axg2)
+            axg2.set_title("Top 10 Subgenre berdasarkan Jumlah Lagu")
+            axg2.set_xlabel("Jumlah Lagu")
+            axg2.set_ylabel("Subgenre")
+            return figg2
+        show_chart("subgenre_counts", {"n": len(top_subgenres), "filter": filter_key}, _plot_subgenres)
 
     # ============================
     # Rata-rata Popularitas per Genre
     # ============================
     st.subheader("Genre dengan Rata-rata Popularitas Tertinggi")
-    genre_popularity = df_original.groupby("playlist_genre")["track_popularity"].mean().sort_values(ascending=False).head(7)
-    figg3, axg3 = plt.subplots(figsize=(8, 4))
-    sns.barplot(x=genre_popularity.values, y=genre_popularity.index, palette="plasma", ax=axg3)
-    axg3.set_title("Top 6 Genre berdasarkan Rata-rata Popularitas")
-    axg3.set_xlabel("Rata-rata Popularitas")
-    axg3.set_ylabel("Genre")
-    st.pyplot(figg3, use_container_width=True)
+    genre_popularity = summary["genre_popularity"].head(7)
+    def _plot_genre_popularity(plt, sns):
+        figg3, axg3 = plt.subplots(figsize=(8, 4))
+        sns.barplot(x=genre_popularity.values, y=genre_popularity.index, palette="plasma", ax=axg3)
+        axg3.set_title("Top 6 Genre berdasarkan Rata-rata Popularitas")
+        axg3.set_xlabel("Rata-rata Popularitas")
+        axg3.set_ylabel("Genre")
+        return figg3
+    show_chart("genre_popularity", {"n": len(genre_popularity), "filter": filter_key}, _plot_genre_popularity)
 
     # Insight otomatis
     top_genre = genre_popularity.index[0]
@@ -369,7 +639,9 @@ with tabs[2]:
 # ---------------------------
 # Tab: Korelasi (UPDATED)
 # ---------------------------
-with tabs[3]:
+def view_correlation():
+    df = filtered_rows(load_data(top_features + ['track_popularity']))
+    corr_pop = summary["corr_pop"]
     st.header("Korelasi Fitur dengan Popularitas")
     st.markdown("""
     Korelasi membantu kita memahami seberapa kuat hubungan antara fitur audio dengan popularitas lagu.
@@ -381,13 +653,17 @@ with tabs[3]:
 
     # Heatmap (top features + target)
     cols_to_plot = top_features + ['track_popularity']
-    figc, axc = plt.subplots(figsize=(8, 6))
-    sns.heatmap(df[cols_to_plot].corr(), annot=True, cmap="coolwarm", ax=axc, vmin=-1, vmax=1)
-    axc.set_title("Heatmap Korelasi (Top Features vs Popularitas)")
-    st.pyplot(figc, use_container_width=True)
+    def _plot_heatmap(plt, sns):
+        figc, axc = plt.subplots(figsize=(8, 6))
+        corr_matrix = summary["corr"]
+        sns.heatmap(corr_matrix.loc[cols_to_plot, cols_to_plot], annot=True, cmap="coolwarm", ax=axc, vmin=-1, vmax=1)
+        axc.set_title("Heatmap Korelasi (Top Features vs Popularitas)")
+        return figc
+    # Timer mencakup build + render heatmap (atau lookup cache PNG jika sudah pernah dirender)
+    with perf.timer("correlation"):
+        show_chart("corr_heatmap", {"cols": cols_to_plot, "filter": filter_key}, _plot_heatmap)
 
     # Insight otomatis
-    corr_pop = df.corr()['track_popularity'].drop('track_popularity')
     top2_corr = corr_pop.sort_values(ascending=False).head(2)
     lowest_corr = corr_pop.sort_values(ascending=True).head(1)
     
@@ -402,14 +678,24 @@ with tabs[3]:
     # Scatter plots with interpretation
     st.subheader("Scatterplot: Hubungan Fitur vs Popularitas")
     st.markdown("Setiap grafik berikut menunjukkan hubungan antara fitur dan popularitas dengan garis regresi untuk melihat kecenderungan hubungan.")
+    st.caption("Warna menunjukkan kepadatan lagu per bin; titik adalah sampel terstratifikasi per bin.")
 
     for f in top_features:
-        figsc, axsc = plt.subplots(figsize=(6, 3))
-        sns.regplot(x=df[f], y=df['track_popularity'], scatter_kws={'alpha': 0.4}, line_kws={'color': 'black'}, ax=axsc)
-        axsc.set_xlabel(f)
-        axsc.set_ylabel("Popularity")
-        axsc.set_title(f"{f} vs Popularity")
-        st.pyplot(figsc, use_container_width=True)
+        # Density 2D + sampel terstratifikasi + garis regresi dari statistik ringkas
+        def _plot_scatter(plt, sns, f=f):
+            x, y = df[f].to_numpy(), df['track_popularity'].to_numpy()
+            counts, x_edges, y_edges = hist2d_counts(x, y, bins=60)
+            sample = stratified_sample(x, y, bins=30, per_bin=3)
+            slope, intercept = linear_fit(x, y)
+            figsc, axsc = plt.subplots(figsize=(6, 3))
+            axsc.pcolormesh(x_edges, y_edges, np.log1p(counts.T), cmap="plasma", shading="flat")
+            axsc.scatter(x[sample], y[sample], s=4, alpha=0.4, color="white", linewidths=0)
+            axsc.plot(x_edges[[0, -1]], intercept + slope * x_edges[[0, -1]], color='black', linewidth=2)
+            axsc.set_xlabel(f)
+            axsc.set_ylabel("Popularity")
+            axsc.set_title(f"{f} vs Popularity")
+            return figsc
+        show_chart("feature_scatter", {"feature": f, "bins": 60, "filter": filter_key}, _plot_scatter)
         
         # Caption otomatis
         corr_val = corr_pop[f]
@@ -430,15 +716,106 @@ with tabs[3]:
     )
 
 
+# ---------------------------
+# Tab: Tren Rilis
+# ---------------------------
+TREND_LABELS = {"track_popularity": "Popularitas (0–100)"}
+TREND_MIN_SONGS = 5
+
+def view_trends():
+    st.header("Tren Popularitas & Fitur Audio per Tahun Rilis")
+    st.markdown("""
+    Rata-rata popularitas dan fitur audio (satuan asli) berdasarkan tahun rilis album.
+    Dihitung dari indeks tren yang sudah diagregasi per tahun, genre & subgenre,
+    sehingga filter genre, subgenre & tahun di sidebar langsung berlaku.
+    """)
+    trend_panel()
+
+
+@st.fragment
+def trend_panel():
+    trends = get_trends()
+    colt1, colt2, colt3 = st.columns([2, 1, 1])
+    with colt1:
+        measure = st.selectbox("Metrik:", trends.measures, format_func=lambda m: TREND_LABELS.get(m, m),
+                               key="trend_measure")
+    with colt2:
+        by_genre = st.checkbox("Pisahkan per genre", key="trend_by_genre")
+    with colt3:
+        window = st.slider("Rata-rata bergerak (tahun):", 1, 5, 1, key="trend_window")
+    if filters.get("track_artist"):
+        st.caption("_Filter artis tidak berlaku di halaman ini (indeks tren diagregasi per tahun, genre & subgenre)._")
+
+    with perf.timer("trends:series"):
+        overall = trends.series(measure, filters)
+        # Tahun dengan lagu terlalu sedikit tidak ditampilkan (rata-rata terlalu berisik)
+        years = overall.index[overall["n"] >= TREND_MIN_SONGS]
+        lines = trends.series(measure, filters, by_genre=True) if by_genre else overall[["mean"]]
+        lines = lines.reindex(years).rolling(window, min_periods=1).mean()
+    if len(years) == 0:
+        st.warning(f"Tidak ada tahun rilis dengan minimal {TREND_MIN_SONGS} lagu untuk filter ini.")
+        return
+
+    label = TREND_LABELS.get(measure, measure)
+    params = {"measure": measure, "by_genre": by_genre, "window": window, "filter": filter_key}
+    def _plot_trend(plt, sns):
+        figt, axt = plt.subplots(figsize=(10, 4))
+        palette = sns.color_palette("plasma", len(lines.columns))
+        for color, col in zip(palette, lines.columns):
+            axt.plot(lines.index, lines[col], color=color, linewidth=2, label=col if by_genre else None)
+        if by_genre:
+            axt.legend(ncol=3, fontsize=8)
+        axt.set_xlabel("Tahun Rilis")
+        axt.set_ylabel(label)
+        axt.set_title(f"Rata-rata {label} per Tahun Rilis")
+        return figt
+    show_chart("trend_line", params, _plot_trend)
+
+    st.markdown("### Jumlah Lagu per Tahun Rilis")
+    counts = overall["n"].reindex(years)
+    def _plot_counts(plt, sns):
+        figc, axc = plt.subplots(figsize=(10, 2.5))
+        axc.bar(counts.index, counts.to_numpy(), color=sns.color_palette("plasma", 1)[0])
+        axc.set_xlabel("Tahun Rilis")
+        axc.set_ylabel("Jumlah Lagu")
+        return figc
+    show_chart("trend_counts", {"filter": filter_key}, _plot_counts)
+
+    # Insight otomatis (rata-rata tanpa smoothing)
+    means = overall["mean"].reindex(years)
+    first, last = means.iloc[:10].mean(), means.iloc[-10:].mean()
+    st.info(
+        f"Rata-rata **{label}** tertinggi ada pada lagu rilisan **{means.idxmax()}** ({means.max():.2f}), "
+        f"terendah pada **{means.idxmin()}** ({means.min():.2f}). "
+        f"Rata-rata 10 tahun rilis terakhir ({years[-min(10, len(years))]}–{years[-1]}): **{last:.2f}**, "
+        f"dibanding 10 tahun pertama ({years[0]}–{years[min(9, len(years) - 1)]}): **{first:.2f}**."
+    )
+
+
 ## ---------------------------
 # Tab: 🔍 Cari & Prediksi Lagu (gabungan random + manual)
 # ---------------------------
-with tabs[4]:
+def view_predict():
     st.header("Cari & Prediksi Lagu")
     st.markdown("""
     Tab ini memungkinkan kamu untuk **memilih lagu tertentu berdasarkan judul atau artis**, 
     atau menampilkan **prediksi acak** dari model Linear Regression.
     """)
+    predict_panel()
+
+
+@st.fragment
+def predict_panel():
+    store = get_feature_store()
+    scores = get_scores(MODEL_PATH, MODEL_INFERENCE_PATH)
+    model_cols = get_model_cols()
+    allowed = filtered_tracks()
+
+    def random_id():
+        # Lagu acak di antara track yang lolos filter sidebar
+        if allowed is None:
+            return store.random_id()
+        return store.index[random.choice(np.flatnonzero(allowed))]
 
     # Pilihan mode
     mode = st.radio(
@@ -456,14 +833,15 @@ with tabs[4]:
     if mode == "Prediksi Random":
         st.subheader("Prediksi Lagu Acak")
         if st.button("Ambil Lagu Acak Baru"):
-            st.session_state['sample_idx_v3'] = random.randint(0, len(df) - 1)
+            st.session_state['sample_track_id'] = random_id()
 
-        if 'sample_idx_v3' not in st.session_state:
-            st.session_state['sample_idx_v3'] = random.randint(0, len(df) - 1)
+        current = st.session_state.get('sample_track_id')
+        if current not in store or (allowed is not None and not allowed[store.position(current)]):
+            st.session_state['sample_track_id'] = random_id()
 
-        idx = st.session_state['sample_idx_v3']
-        sample = df.iloc[idx]
-        sample_orig = df_original.iloc[idx]
+        track_id = st.session_state['sample_track_id']
+        sample = store.features_of(track_id)
+        sample_orig = store.metadata_of(track_id)
 
         st.markdown(f"""
         **Judul:** {sample_orig['track_name']}  
@@ -474,14 +852,15 @@ with tabs[4]:
         """)
 
         st.markdown("#### Nilai Fitur (Top 5)")
-        st.table(pd.DataFrame([sample[top_features].round(4)], index=["value"]).T)
+        st.table(pd.DataFrame([sample[model_cols].round(4)], index=["value"]).T)
 
-        X = sample[top_features].values.reshape(1, -1)
-        y_pred = model.predict(X)[0]
+        # Prediksi diambil dari skor katalog yang sudah dihitung
+        with perf.timer("predict:lookup"):
+            y_pred = scores.at[track_id, 'predicted']
         
         # Konversi prediksi ke skala 0-100 untuk konsistensi dengan data asli
         y_pred_scaled = y_pred * 100
-        y_true = sample['track_popularity']
+        y_true = sample['track_popularity'] * 100
         diff = abs(y_pred_scaled - y_true)
 
         st.markdown("#### Hasil Prediksi")
@@ -497,27 +876,34 @@ with tabs[4]:
         st.caption(f"_Kriteria: skor popularitas ≥ {pop_threshold} dianggap populer berdasarkan distribusi dataset._")
         st.caption("_Nilai popularitas telah dinormalisasi (0–1). Semakin kecil selisih, semakin akurat model._")
 
+        similar_songs(track_id)
+
     # ---------------------------
     # MODE 2: Cari Lagu Manual
     # ---------------------------
     else:
         st.subheader("Cari Lagu Berdasarkan Judul atau Artis")
         query = st.text_input("Masukkan nama lagu atau artis:")
+        typo_tolerance = st.checkbox("Toleransi salah ketik", value=False)
 
         if query:
-            matches = df_original[df_original['track_name'].str.contains(query, case=False, na=False) |
-                                  df_original['track_artist'].str.contains(query, case=False, na=False)]
+            matches = get_search_index().search(query, limit=100, typo_tolerance=typo_tolerance)
+            if allowed is not None:
+                matches = [k for k in matches if allowed[store.position(k)]]
 
             if len(matches) == 0:
                 st.warning("Lagu atau artis tidak ditemukan. Coba ketik sebagian nama lain.")
             else:
-                st.success(f"Ditemukan {len(matches)} hasil. Pilih salah satu untuk diprediksi:")
-                selected = st.selectbox("Pilih lagu:", matches['track_name'] + " — " + matches['track_artist'])
+                st.success(f"Ditemukan {len(matches)} hasil teratas. Pilih salah satu untuk diprediksi:")
+                track_id = st.selectbox(
+                    "Pilih lagu:",
+                    matches,
+                    format_func=lambda k: f"{store.meta.at[k, 'track_name']} — {store.meta.at[k, 'track_artist']}",
+                )
 
-                if selected:
-                    row_idx = matches[matches['track_name'] + " — " + matches['track_artist'] == selected].index[0]
-                    sample = df.iloc[row_idx]
-                    sample_orig = df_original.iloc[row_idx]
+                if track_id is not None:
+                    sample = store.features_of(track_id)
+                    sample_orig = store.metadata_of(track_id)
 
                     st.markdown(f"""
                     **Judul:** {sample_orig['track_name']}  
@@ -528,10 +914,10 @@ with tabs[4]:
                     """)
 
                     st.markdown("#### Nilai Fitur (Top 5)")
-                    st.table(pd.DataFrame([sample[top_features].round(4)], index=["value"]).T)
+                    st.table(pd.DataFrame([sample[model_cols].round(4)], index=["value"]).T)
 
-                    X = sample[top_features].values.reshape(1, -1)
-                    y_pred = model.predict(X)[0]
+                    with perf.timer("predict:lookup"):
+                        y_pred = scores.at[track_id, 'predicted']
                     y_true = sample['track_popularity']
                     # Konversi prediksi dan actual ke skala 0-100
                     y_pred_scaled = y_pred * 100
@@ -551,5 +937,201 @@ with tabs[4]:
                     st.caption(f"_Kriteria: skor popularitas ≥ {pop_threshold}/100 dianggap populer berdasarkan distribusi dataset._")
                     st.caption("_Semakin kecil selisih, semakin akurat model._")
 
+                    similar_songs(track_id)
 
 
+def similar_songs(track_id):
+    # Panel "lagu serupa": tetangga terdekat di ruang fitur audio (opsional difilter genre)
+    index = get_similar_index()
+    if track_id not in index:
+        return
+    store, scores = get_feature_store(), get_scores(MODEL_PATH, MODEL_INFERENCE_PATH)
+    st.markdown("### Lagu Serupa")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        genre = st.selectbox("Filter genre:", ["Semua genre"] + sorted(index.genre_slices), key="similar_genre")
+    with col2:
+        k = st.number_input("Jumlah lagu:", min_value=1, max_value=50, value=10, key="similar_k")
+    with perf.timer("similar:query"):
+        neighbours = index.query(track_id, int(k), None if genre == "Semua genre" else genre)
+    table = pd.DataFrame({
+        "Judul": store.meta["track_name"].reindex(neighbours.index).to_numpy(),
+        "Artis": store.meta["track_artist"].reindex(neighbours.index).to_numpy(),
+        "Genre": neighbours["playlist_genre"].to_numpy(),
+        "Jarak": neighbours["distance"].round(4).to_numpy(),
+        "Prediksi Popularitas": (scores["predicted"].reindex(neighbours.index) * 100).round(2).to_numpy(),
+    })
+    st.dataframe(table, hide_index=True, width="stretch")
+    st.caption(f"_Jarak Euclidean pada {len(index.columns)} fitur audio yang sudah dinormalisasi (0–1)._")
+
+
+# ---------------------------
+# Tab: Evaluasi Model (predicted vs actual)
+# ---------------------------
+def view_evaluation():
+    st.header("Evaluasi Prediksi Model")
+    st.markdown("""
+    Seluruh katalog diskor sekali oleh model. Residual = popularitas aktual − prediksi
+    (skala 0–100): residual positif berarti model **under-predict**, negatif berarti **over-predict**.
+    """)
+    residual_leaderboards()
+    residual_by_genre()
+
+
+def filtered_scores():
+    # Skor katalog yang lolos filter sidebar (urutan baris sama dengan feature store)
+    scores, allowed = get_scores(MODEL_PATH, MODEL_INFERENCE_PATH), filtered_tracks()
+    return scores if allowed is None else scores[allowed]
+
+
+@st.fragment
+def residual_leaderboards():
+    scores = filtered_scores()
+    n_top = st.slider("Jumlah lagu ditampilkan:", 5, 50, 10)
+    leaderboard_cols = ["track_name", "track_artist", "playlist_genre", "actual", "predicted", "residual"]
+
+    def _leaderboard(under):
+        board = residual_leaderboard(scores, n_top, under=under)[leaderboard_cols].copy()
+        board[["actual", "predicted", "residual"]] = (board[["actual", "predicted", "residual"]] * 100).round(2)
+        board = board.reset_index(drop=True)
+        board.index += 1
+        return board
+
+    cole1, cole2 = st.columns(2)
+    with cole1:
+        st.subheader("Paling Under-predicted")
+        st.dataframe(_leaderboard(under=True), width="stretch")
+    with cole2:
+        st.subheader("Paling Over-predicted")
+        st.dataframe(_leaderboard(under=False), width="stretch")
+
+
+def residual_by_genre():
+    # Distribusi residual per genre
+    scores = filtered_scores()
+    st.subheader("Distribusi Residual per Genre")
+    residual_pct = scores["residual"] * 100
+    genre_order = residual_pct.groupby(scores["playlist_genre"], observed=True).median().sort_values().index
+    def _plot_residuals(plt, sns):
+        fige, axe = plt.subplots(figsize=(10, 4))
+        sns.boxplot(x=residual_pct, y=scores["playlist_genre"].astype(str), order=genre_order.astype(str),
+                    palette="plasma", ax=axe)
+        axe.axvline(0, color="white", linestyle="--", linewidth=1)
+        axe.set_xlabel("Residual (aktual − prediksi)")
+        axe.set_ylabel("Genre")
+        return fige
+    show_chart("residual_by_genre", {"figsize": (10, 4), "filter": filter_key}, _plot_residuals)
+
+    mae_pct = residual_pct.abs().mean()
+    message = (f"Rata-rata selisih absolut (MAE) {'lagu terfilter' if filters else 'seluruh katalog'}: "
+               f"**{mae_pct:.2f}** poin popularitas.")
+    if len(genre_order):
+        message += (f" Genre dengan median residual tertinggi: **{genre_order[-1]}** (cenderung under-predict), "
+                    f"terendah: **{genre_order[0]}** (cenderung over-predict).")
+    st.info(message)
+
+
+VIEWS = {
+    "Overview": view_overview,
+    "Popularitas": view_popularity,
+    "Genre Insight": view_genre,
+    "Korelasi": view_correlation,
+    "Tren Rilis": view_trends,
+    "Cari & Prediksi Lagu": view_predict,
+    "Evaluasi Model": view_evaluation,
+}
+# Halaman ini memakai feature store (satu baris per track, metadata dari baris pertamanya):
+# mask track bisa kosong walau cube masih berisi baris yang cocok
+TRACK_VIEWS = {"Cari & Prediksi Lagu", "Evaluasi Model"}
+
+def filter_is_empty(page):
+    if summary["n_rows"] == 0:
+        return True
+    if page in TRACK_VIEWS and filters:
+        return not filtered_tracks().any()
+    return False
+
+with perf.timer(f"view:{page}"):
+    if filter_is_empty(page):
+        st.warning("Tidak ada lagu yang cocok dengan filter. Ubah atau kosongkan filter di sidebar.")
+    else:
+        VIEWS[page]()
+
+
+# ---------------------------
+# Panel Performance (tersembunyi)
+# ---------------------------
+def perf_extra_cache():
+    return {"figure_cache": {"hit": fig_cache.hits, "miss": fig_cache.misses}}
+
+def perf_panel():
+    with st.sidebar.expander("Performance", expanded=True):
+        snap = perf.snapshot()
+        st.metric("RSS proses", f"{snap['rss_bytes'] / 1e6:,.1f} MB",
+                  f"{snap['rss_delta_bytes'] / 1e6:+,.1f} MB (rerun terakhir)", delta_color="off")
+
+        timers = pd.DataFrame(snap["timers"]).T
+        if len(timers):
+            timers = timers[["count", "mean_s", "p50_s", "p95_s", "max_s", "last_s"]]
+            timers[["mean_s", "p50_s", "p95_s", "max_s", "last_s"]] *= 1000
+            timers.columns = ["n", "mean ms", "p50 ms", "p95 ms", "max ms", "last ms"]
+            st.dataframe(timers.round(2), width="stretch")
+
+        cache = pd.DataFrame({**snap["cache"], **perf_extra_cache()}).T
+        st.dataframe(cache, width="stretch")
+
+        st.download_button("Export JSON", perf.to_json({"cache_extra": perf_extra_cache()}),
+                           file_name="dashboard_perf.json", mime="application/json")
+        st.download_button("Export Prometheus", perf.to_prometheus(extra_cache=perf_extra_cache()),
+                           file_name="dashboard_perf.prom", mime="text/plain")
+
+perf.end_run(perf_run)
+if st.query_params.get("perf") == "1" or os.environ.get("SPOTIFY_DASHBOARD_PERF") == "1":
+    perf_panel()
+if os.environ.get("SPOTIFY_DASHBOARD_METRICS_FILE"):
+    perf.write_textfile(os.environ["SPOTIFY_DASHBOARD_METRICS_FILE"], extra_cache=perf_extra_cache())
+
+
+# ---------------------------
+# Panel Admin Model (tersembunyi)
+# ---------------------------
+# Hanya tampil jika SPOTIFY_DASHBOARD_ADMIN=1: memulai retraining di proses
+# terpisah (src/retrain.py), memantau statusnya, dan rollback ke versi lama.
+@st.fragment(run_every=5)
+def admin_panel():
+    with st.expander("Admin Model", expanded=True):
+        rerun_if_model_changed()
+        st.caption(f"Versi aktif: **{model_version or 'belum ada (src/models/popularity_model.pkl)'}**")
+        status = job_status()
+        running = status is not None and status["state"] == "running"
+        if st.button("Latih ulang model", disabled=running, width="stretch"):
+            try:
+                pid = start_background("dashboard")
+                st.toast(f"Retraining dimulai di background (PID {pid})")
+            except RetrainBusy as e:
+                st.warning(str(e))
+            status = job_status()
+
+        if status:
+            label = {"running": "⏳ berjalan", "done": "✅ selesai", "failed": "❌ gagal"}[status["state"]]
+            st.markdown(f"Job terakhir ({status.get('trigger')}): **{label}** sejak {status['started_at']}"
+                        + (f", {status['seconds']}s" if "seconds" in status else ""))
+            if status.get("error"):
+                st.error(status["error"])
+            if os.path.exists(RETRAIN_LOG_PATH):
+                with open(RETRAIN_LOG_PATH, encoding="utf-8", errors="replace") as f:
+                    st.code("".join(f.readlines()[-15:]) or "(log kosong)", language=None)
+
+        versions = list_versions()
+        if versions:
+            table = pd.DataFrame(versions).set_index("version")
+            st.dataframe(table[[c for c in ("created_at", "model", "r2", "mae") if c in table]],
+                         width="stretch")
+            choice = st.selectbox("Versi", table.index, key="admin_version")
+            if st.button("Aktifkan versi ini", disabled=choice == model_version, width="stretch"):
+                set_current(choice)
+                st.rerun(scope="app")
+
+if os.environ.get("SPOTIFY_DASHBOARD_ADMIN") == "1":
+    with st.sidebar:
+        admin_panel()
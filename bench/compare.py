@@ -0,0 +1,57 @@
+# ============================================
+# Bandingkan Dua Hasil Benchmark
+# ============================================
+# Membandingkan JSON hasil bench/run.py (mis. dari dua commit) per skala & tahap.
+#
+#   python bench/compare.py data/bench/results/base.json data/bench/results/new.json
+#   python bench/compare.py base.json new.json --fail-above 1.25   # exit 1 jika ada regresi >25%
+
+import sys
+import json
+import argparse
+
+
+def load_runs(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    runs = {run["rows"]: {s["stage"]: s for s in run["stages"]} for run in report["runs"]}
+    return report["meta"], runs
+
+
+def compare(base_path, new_path, min_seconds=0.005):
+    base_meta, base_runs = load_runs(base_path)
+    new_meta, new_runs = load_runs(new_path)
+    print(f"base: {base_meta.get('commit')} ({base_meta.get('created_at')})")
+    print(f"new:  {new_meta.get('commit')} ({new_meta.get('created_at')})")
+
+    rows = []
+    for n_rows in sorted(set(base_runs) & set(new_runs)):
+        print(f"\n📊 {n_rows:,} baris")
+        print(f"{'stage':<14}{'base s':>10}{'new s':>10}{'rasio':>8}{'base MB':>10}{'new MB':>10}")
+        for stage, new in new_runs[n_rows].items():
+            base = base_runs[n_rows].get(stage)
+            if base is None:
+                continue
+            # Tahap yang sangat cepat terlalu bising untuk dijadikan rasio
+            ratio = new["seconds"] / base["seconds"] if base["seconds"] >= min_seconds else None
+            rows.append({"rows": n_rows, "stage": stage, "ratio": ratio})
+            ratio_text = f"{ratio:8.2f}" if ratio is not None else f"{'-':>8}"
+            base_mb = f"{base['peak_alloc_mb']:10.1f}" if "peak_alloc_mb" in base else f"{'-':>10}"
+            new_mb = f"{new['peak_alloc_mb']:10.1f}" if "peak_alloc_mb" in new else f"{'-':>10}"
+            print(f"{stage:<14}{base['seconds']:10.3f}{new['seconds']:10.3f}{ratio_text}{base_mb}{new_mb}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bandingkan dua hasil bench/run.py")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--fail-above", type=float, help="Exit 1 jika rasio waktu tahap mana pun melebihi nilai ini")
+    args = parser.parse_args()
+
+    rows = compare(args.base, args.new)
+    if args.fail_above:
+        regressions = [r for r in rows if r["ratio"] is not None and r["ratio"] > args.fail_above]
+        for r in regressions:
+            print(f"⚠️ regresi: {r['stage']} ({r['rows']:,} baris) x{r['ratio']:.2f}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,160 @@
+# ============================================
+# Parity & Latensi Filter Cube (Filter Sidebar Dashboard)
+# ============================================
+# Membandingkan ringkasan hasil filter dari src/cube.py dengan groupby pandas
+# langsung di atas seluruh baris, untuk kombinasi filter acak
+# (genre / subgenre / tahun rilis / artis):
+#   parity  : jumlah baris & jumlah per genre harus identik; rata-rata, korelasi &
+#             rata-rata popularitas per genre dalam --tol; median dari histogram
+#             cube di antara dua nilai tengah (lower/higher) ± satu lebar bin
+#   latensi : p50/p95 satu query (KPI + agregat genre/subgenre + korelasi + top/bottom 5)
+#
+#   python bench/filters.py
+#   python bench/filters.py --queries 200 --json data/bench/filters.json
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from src.cube import LABEL_DIMS, TARGET, build_cube
+from src.stats import load_stats
+from src.storage import load_table
+
+
+def random_filters(cube, rng):
+    filters = {}
+    if rng.random() < 0.6:
+        genres = cube.options("playlist_genre")
+        filters["playlist_genre"] = list(rng.choice(genres, rng.integers(1, 3), replace=False))
+    if rng.random() < 0.3:
+        subgenres = cube.options("playlist_subgenre", filters.get("playlist_genre"))
+        filters["playlist_subgenre"] = list(rng.choice(subgenres, min(len(subgenres), 2), replace=False))
+    if rng.random() < 0.5:
+        lo, hi = cube.year_range
+        a, b = sorted(rng.integers(lo, hi + 1, 2))
+        filters["year"] = (int(a), int(b))
+    if rng.random() < 0.3:
+        artists = cube.options("track_artist")
+        filters["track_artist"] = list(rng.choice(artists, rng.integers(1, 6), replace=False))
+    return filters
+
+
+def summarize(sl):
+    return {
+        "n": sl.count,
+        "popularity": sl.popularity(),
+        "corr": sl.corr(),
+        "genre_counts": sl.counts("playlist_genre", n=None),
+        "subgenre_counts": sl.counts("playlist_subgenre", n=None),
+        "genre_popularity": sl.mean_popularity("playlist_genre"),
+        "top5": sl.songs(5, True),
+        "bottom5": sl.songs(5, False),
+    }
+
+
+def baseline(frame, filters, measures):
+    mask = np.ones(len(frame), dtype=bool)
+    for dim in LABEL_DIMS:
+        if filters.get(dim):
+            mask &= frame[f"label_{dim}"].isin(filters[dim]).to_numpy()
+    if filters.get("year"):
+        mask &= frame["year"].between(*filters["year"]).to_numpy()
+    sub = frame[mask]
+    return {
+        "n": len(sub),
+        "mean": sub[TARGET].mean(),
+        "median": (sub[TARGET].quantile(0.5, interpolation="lower"),
+                   sub[TARGET].quantile(0.5, interpolation="higher")),
+        "corr": sub[measures].corr(),
+        "genre_counts": sub["label_playlist_genre"].value_counts(),
+        "genre_popularity": sub.groupby("label_playlist_genre")["raw_popularity"].mean(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parity & latensi filter cube dashboard")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--tol", type=float, default=1e-6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    stats = load_stats()
+    start = time.perf_counter()
+    cube = build_cube(stats["top_features"])
+    build_s = time.perf_counter() - start
+    measures = cube.measures
+
+    # Frame pembanding: label asli (prefix label_, karena genre/subgenre ter-encode bisa jadi
+    # fitur ukuran) + fitur ukuran + popularitas mentah, sebaris dengan cube
+    original = load_table("data/spotify_cleaned_original.csv", LABEL_DIMS + ["release_year"])
+    frame = load_table("data/spotify_cleaned.csv", measures)
+    for dim in LABEL_DIMS:
+        frame[f"label_{dim}"] = original[dim].astype("string").fillna("").to_numpy()
+    frame["year"] = original["release_year"].to_numpy()
+    frame["raw_popularity"] = cube.popularity
+
+    rng = np.random.default_rng(args.seed)
+    bin_width = float(np.diff(cube.hist_edges)[0])
+    cube_ms, pandas_ms, failures, checked = [], [], [], 0
+    for _ in range(args.queries):
+        filters = random_filters(cube, rng)
+        t = time.perf_counter()
+        got = summarize(cube.aggregate(filters))
+        cube_ms.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        want = baseline(frame, filters, measures)
+        pandas_ms.append((time.perf_counter() - t) * 1000)
+
+        problems = []
+        if got["n"] != want["n"]:
+            problems.append(f"n {got['n']} != {want['n']}")
+        elif want["n"] > 1:
+            checked += 1
+            if abs(got["popularity"]["mean"] - want["mean"]) > args.tol:
+                problems.append("mean")
+            lo, hi = want["median"]
+            if not lo - bin_width <= got["popularity"]["median"] <= hi + bin_width:
+                problems.append("median")
+            if not got["genre_counts"].sort_index().equals(want["genre_counts"].sort_index().astype(np.int64)):
+                problems.append("genre_counts")
+            gp = got["genre_popularity"].sort_index() - want["genre_popularity"].sort_index()
+            if np.nanmax(np.abs(gp.to_numpy())) > args.tol:
+                problems.append("genre_popularity")
+            diff = (got["corr"] - want["corr"]).abs().to_numpy()
+            if np.nanmax(diff, initial=0) > 1e-4:
+                problems.append(f"corr {np.nanmax(diff):.2e}")
+        if problems:
+            failures.append({"filters": filters, "problems": problems})
+
+    report = {
+        "rows": len(frame), "cells": int(len(cube.cell_n)), "queries": args.queries, "checked": checked,
+        "build_s": build_s,
+        "cube_ms": {"p50": float(np.percentile(cube_ms, 50)), "p95": float(np.percentile(cube_ms, 95)),
+                    "max": float(np.max(cube_ms))},
+        "pandas_ms": {"p50": float(np.percentile(pandas_ms, 50)), "p95": float(np.percentile(pandas_ms, 95)),
+                      "max": float(np.max(pandas_ms))},
+        "failures": failures,
+    }
+    print(f"Dataset: {report['rows']:,} baris | {report['cells']:,} cell | build cube {build_s:.2f}s")
+    print(f"{'':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name in ("cube", "pandas"):
+        r = report[f"{name}_ms"]
+        print(f"{name:>8}{r['p50']:10.2f}{r['p95']:10.2f}{r['max']:10.2f}")
+    print(f"Parity: {args.queries - len(failures)}/{args.queries} query cocok ({checked} dengan >1 baris)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"✅ Hasil disimpan di: {args.json}")
+    if failures:
+        for f in failures[:5]:
+            print(f"  {f['filters']}: {', '.join(f['problems'])}")
+        sys.exit(f"❌ Parity gagal untuk {len(failures)} query")
@@ -0,0 +1,200 @@
+# ============================================
+# Generator Data Sintetis spotify_songs.csv
+# ============================================
+# Menghasilkan CSV dengan skema yang sama persis seperti dataset asli
+# (23 kolom, urutan sama) untuk benchmark di skala 30k / 1M / 10M baris:
+#   - 6 genre x 4 subgenre (kardinalitas sama dengan dataset asli)
+#   - ~1 artis per 3 lagu, ~1 album per 1.5 lagu, ~1 playlist per 70 lagu
+#   - track_id berulang lintas playlist (lagu sama di beberapa playlist)
+#   - tanggal rilis berantakan: "YYYY-MM-DD", "YYYY-MM", dan "YYYY" saja
+#   - beberapa judul/artis/album kosong dan baris duplikat persis
+#   - fitur audio dengan distribusi & rentang mirip dataset asli
+# Data ditulis per chunk sehingga 10M baris tidak perlu muat di RAM.
+#
+#   python bench/generate.py --rows 1m --out data/bench/spotify_songs_1m.csv
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "track_id", "track_name", "track_artist", "track_popularity", "track_album_id",
+    "track_album_name", "track_album_release_date", "playlist_name", "playlist_id",
+    "playlist_genre", "playlist_subgenre", "danceability", "energy", "key", "loudness",
+    "mode", "speechiness", "acousticness", "instrumentalness", "liveness", "valence",
+    "tempo", "duration_ms",
+]
+
+GENRES = {
+    "edm": ["electro house", "big room", "pop edm", "progressive electro house"],
+    "rap": ["southern hip hop", "gangster rap", "trap", "hip hop"],
+    "pop": ["dance pop", "post-teen pop", "electropop", "indie poptimism"],
+    "r&b": ["urban contemporary", "hip pop", "new jack swing", "neo soul"],
+    "latin": ["tropical", "latin pop", "reggaeton", "latin hip hop"],
+    "rock": ["album rock", "classic rock", "permanent wave", "hard rock"],
+}
+# Proporsi & rata-rata popularitas per genre (mendekati dataset asli)
+GENRE_SHARE = [0.185, 0.175, 0.168, 0.165, 0.157, 0.150]
+GENRE_POPULARITY = [34.8, 43.2, 47.7, 41.2, 47.0, 41.7]
+
+WORDS = np.array([
+    "Love", "Night", "Dance", "Heart", "Fire", "Dream", "Baby", "Girl", "Summer", "Tonight",
+    "Forever", "Crazy", "Light", "Money", "Party", "Rain", "Gold", "Sky", "Wild", "Home",
+    "Corazón", "Fiesta", "Beyoncé", "Señorita", "Bailando", "Mañana", "Ciel", "Étoile",
+])
+SUFFIXES = np.array(["", "", "", "", " - Remix", " - Radio Edit", " (feat. Guest)", " - Remastered"])
+
+BASE62 = np.array(list("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"))
+
+SIZES = {"30k": 30_000, "1m": 1_000_000, "10m": 10_000_000}
+
+
+def parse_rows(text):
+    text = text.lower().replace("_", "")
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def _ids(prefix, values, width):
+    return prefix + pd.Series(values).astype(str).str.zfill(width)
+
+
+def _spotify_ids(values, salt):
+    # ID base62 22 karakter seperti ID Spotify, deterministik dari nilai integer
+    values = np.asarray(values, dtype=np.uint64)
+    parts = []
+    for mult in (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F)):
+        h = (values + np.uint64(salt)) * mult
+        h ^= h >> np.uint64(29)
+        digits = np.empty((len(values), 11), dtype=np.int64)
+        for i in range(11):
+            digits[:, i] = (h % np.uint64(62)).astype(np.int64)
+            h //= np.uint64(62)
+        parts.append(digits)
+    chars = np.ascontiguousarray(BASE62[np.hstack(parts)])
+    return pd.Series(chars.view("<U22")[:, 0])
+
+
+def _release_dates(rng, n):
+    year = rng.choice(np.arange(1957, 2021), n, p=_year_weights())
+    month = rng.integers(1, 13, n)
+    day = rng.integers(1, 29, n)
+    full = pd.Series(year).astype(str) + "-" + pd.Series(month).astype(str).str.zfill(2) + "-" + pd.Series(day).astype(str).str.zfill(2)
+    # Album lama lebih sering hanya punya tahun; sebagian kecil "YYYY-MM"
+    r = rng.random(n)
+    year_only = r < np.where(year < 2000, 0.35, 0.03)
+    month_only = (~year_only) & (r > 0.995)
+    dates = full.where(~year_only, pd.Series(year).astype(str))
+    return dates.where(~month_only, full.str[:7])
+
+
+def _year_weights():
+    years = np.arange(1957, 2021)
+    w = np.exp((years - 2020) / 8.0)
+    return w / w.sum()
+
+
+def generate_chunk(rng, n, n_total):
+    n_tracks = max(int(n_total * 0.86), 1)
+    n_artists = max(n_total // 3, 1)
+    n_albums = max(int(n_total / 1.5), 1)
+    n_playlists = max(n_total // 70, 1)
+
+    genre_idx = rng.choice(len(GENRES), n, p=GENRE_SHARE)
+    genre_names = np.array(list(GENRES))
+    sub_idx = rng.integers(0, 4, n)
+    subgenres = np.array([GENRES[g][i] for g in GENRES for i in range(4)])
+
+    track = rng.integers(0, n_tracks, n)
+    # Artis & album diturunkan dari track supaya konsisten saat track_id berulang
+    artist = (track * 2654435761) % n_artists
+    album = (track * 40503) % n_albums
+    playlist = rng.integers(0, n_playlists, n)
+
+    name = (pd.Series(WORDS[track % len(WORDS)]) + " " + pd.Series(WORDS[(track // 7) % len(WORDS)])
+            + pd.Series(SUFFIXES[track % len(SUFFIXES)]))
+
+    # Popularitas: ~8% bernilai 0 (belum di-rate), sisanya normal per genre
+    popularity = rng.normal(np.array(GENRE_POPULARITY)[genre_idx], 22)
+    popularity[rng.random(n) < 0.08] = 0
+    popularity = np.clip(np.round(popularity), 0, 100).astype(np.int64)
+
+    instrumental = np.where(rng.random(n) < 0.7, rng.random(n) * 1e-4, rng.beta(0.3, 1.5, n))
+    df = pd.DataFrame({
+        "track_id": _spotify_ids(track, 1),
+        "track_name": name,
+        "track_artist": _ids("Artist ", artist, 1),
+        "track_popularity": popularity,
+        "track_album_id": _spotify_ids(album, 2),
+        "track_album_name": _ids("Album ", album, 1),
+        "track_album_release_date": _release_dates(rng, n),
+        "playlist_name": _ids("Playlist ", playlist, 1),
+        "playlist_id": _spotify_ids(playlist, 3),
+        "playlist_genre": genre_names[genre_idx],
+        "playlist_subgenre": subgenres[genre_idx * 4 + sub_idx],
+        "danceability": np.round(rng.beta(5.5, 3, n), 3),
+        "energy": np.round(rng.beta(4, 2, n), 3),
+        "key": rng.integers(0, 12, n),
+        "loudness": np.round(np.minimum(rng.normal(-6.7, 2.9, n), 1.27), 3),
+        "mode": (rng.random(n) < 0.57).astype(np.int64),
+        "speechiness": np.round(rng.beta(1.2, 9, n), 4),
+        "acousticness": np.round(rng.beta(0.6, 2.5, n), 5),
+        "instrumentalness": np.round(instrumental, 6),
+        "liveness": np.round(rng.beta(1.6, 7, n), 4),
+        "valence": np.round(rng.beta(2.6, 2.5, n), 3),
+        "tempo": np.round(np.clip(rng.normal(121, 27, n), 40, 240), 3),
+        "duration_ms": np.clip(rng.normal(225_000, 60_000, n), 4_000, 517_000).astype(np.int64),
+    })
+
+    # Nilai kosong di kolom teks (dataset asli: beberapa judul/artis/album kosong)
+    for col in ("track_name", "track_artist", "track_album_name"):
+        df.loc[rng.random(n) < 0.0002, col] = np.nan
+    return df[COLUMNS]
+
+
+def generate_songs(path, n_rows, seed=42, chunk_rows=500_000, dup_rate=0.005):
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    written = 0
+    header = True
+    while written < n_rows:
+        n = min(chunk_rows, n_rows - written)
+        # Sebagian baris adalah duplikat persis dari baris lain di chunk yang sama
+        n_dup = int(n * dup_rate)
+        chunk = generate_chunk(rng, n - n_dup, n_rows)
+        if n_dup:
+            dups = chunk.iloc[rng.integers(0, len(chunk), n_dup)]
+            chunk = pd.concat([chunk, dups]).iloc[rng.permutation(n)]
+        chunk.to_csv(tmp_path, index=False, mode="w" if header else "a", header=header)
+        written += n
+        header = False
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure_dataset(n_rows, directory="data/bench", seed=42):
+    path = os.path.join(directory, f"spotify_songs_{n_rows}.csv")
+    if not os.path.exists(path):
+        generate_songs(path, n_rows, seed)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generator spotify_songs.csv sintetis")
+    parser.add_argument("--rows", default="30k", help="Jumlah baris: 30k, 1m, 10m, atau angka")
+    parser.add_argument("--out", help="Path output (default: data/bench/spotify_songs_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    n_rows = parse_rows(args.rows)
+    out = args.out or os.path.join("data/bench", f"spotify_songs_{n_rows}.csv")
+    generate_songs(out, n_rows, args.seed)
+    print(f"✅ {n_rows:,} baris ditulis ke {out}")
+    sys.exit(0)
@@ -0,0 +1,112 @@
+# ============================================
+# Parity & Benchmark Artefak Inferensi NumPy-only
+# ============================================
+# Membandingkan model sklearn (.pkl) dengan LinearPredictor (.npz, src/inference.py):
+#   parity      : selisih absolut maksimum prediksi pada dataset bersih (gagal jika > --tol)
+#   load        : waktu muat di proses Python baru (termasuk import library)
+#   throughput  : baris/detik untuk beberapa ukuran batch
+#
+#   python bench/inference.py
+#   python bench/inference.py --rows 1000000 --json data/bench/inference.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+import statistics
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from src.inference import INFERENCE_PATH, PARITY_TOL, load_predictor
+from src.storage import file_digest, load_table
+
+MODEL_PATH = os.path.join(ROOT, "src", "models", "popularity_model.pkl")
+BATCH_SIZES = [1, 256, 65_536]
+
+LOAD_SNIPPETS = {
+    "sklearn": "from joblib import load; load({path!r})",
+    "numpy": "import sys; sys.path.insert(0, {root!r}); "
+             "from src.inference import load_predictor; load_predictor({path!r})",
+}
+
+
+def load_time(kind, path, repeat):
+    # Proses baru per percobaan: import library ikut terhitung (cold load)
+    code = "import time; t = time.perf_counter(); " + LOAD_SNIPPETS[kind].format(path=path, root=ROOT) + \
+           "; print(time.perf_counter() - t)"
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def throughput(predict, X, batch_size, min_seconds=0.5):
+    batches = [X[i:i + batch_size] for i in range(0, min(len(X), batch_size * 64), batch_size)]
+    rows = calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        batch = batches[calls % len(batches)]
+        predict(batch)
+        rows += len(batch)
+        calls += 1
+    return rows / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parity & benchmark artefak inferensi NumPy-only")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--inference", default=os.path.join(ROOT, INFERENCE_PATH))
+    parser.add_argument("--data", default=os.path.join(ROOT, "data", "spotify_cleaned.csv"))
+    parser.add_argument("--rows", type=int, default=None, help="Perbesar dataset (diulang) sampai N baris")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah percobaan load time")
+    parser.add_argument("--tol", type=float, default=PARITY_TOL)
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    # sklearn memperingatkan setiap predict() dengan ndarray pada model yang di-fit dengan DataFrame
+    warnings.filterwarnings("ignore", category=UserWarning)
+    from joblib import load
+    model = load(args.model)
+    predictor = load_predictor(args.inference, file_digest(args.model))
+    features = list(predictor.feature_names_in_)
+
+    df = load_table(args.data, features)
+    if args.rows:
+        df = df.iloc[np.resize(np.arange(len(df)), args.rows)]
+    frame = df[features].astype(np.float64)
+    X = frame.to_numpy()
+
+    expected = np.asarray(model.predict(frame), dtype=np.float64)
+    max_abs = float(np.max(np.abs(predictor.predict(X) - expected)))
+    report = {"rows": len(X), "features": features, "parity_max_abs": max_abs, "tol": args.tol,
+              "load_s": {kind: load_time(kind, path, args.repeat)
+                         for kind, path in (("sklearn", args.model), ("numpy", args.inference))},
+              "rows_per_s": {}}
+
+    # sklearn diberi DataFrame (seperti di dashboard) & ndarray (tanpa validasi nama kolom)
+    for batch_size in BATCH_SIZES:
+        report["rows_per_s"][str(batch_size)] = {
+            "sklearn_frame": throughput(model.predict, frame, batch_size),
+            "sklearn_array": throughput(model.predict, X, batch_size),
+            "numpy": throughput(predictor.predict, X, batch_size),
+        }
+
+    print(f"Parity ({len(X):,} baris): max |Δ| = {max_abs:.3e} (tol {args.tol:g})")
+    print(f"Load (proses baru): sklearn {report['load_s']['sklearn'] * 1000:.1f} ms | "
+          f"numpy {report['load_s']['numpy'] * 1000:.1f} ms")
+    print(f"{'batch':>8}{'sklearn df':>16}{'sklearn arr':>16}{'numpy':>16}   baris/detik")
+    for batch_size, r in report["rows_per_s"].items():
+        print(f"{batch_size:>8}{r['sklearn_frame']:16,.0f}{r['sklearn_array']:16,.0f}{r['numpy']:16,.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Hasil disimpan di: {args.json}")
+    if max_abs > args.tol:
+        sys.exit(f"❌ Parity gagal: selisih {max_abs:.3e} > {args.tol:g}")
@@ -0,0 +1,245 @@
+# ============================================
+# Benchmark Suite Pipeline (Cleaning, Model, Dashboard)
+# ============================================
+# Mengukur waktu & memori setiap tahap pipeline pada data sintetis
+# (bench/generate.py) di beberapa skala:
+#   load, dedup, fill, outliers, scaling, encoding   -> langkah src/cleaning.py
+#   correlation, fit                                  -> langkah src/model.py
+#   predict, search_index, search_query               -> persiapan data di app.py
+# Tahap cleaning & training mengikuti urutan operasi di script aslinya
+# (keduanya script top-level sehingga tidak bisa diimpor langsung);
+# fill & outliers memakai src.cleaner, predict & search memakai modul src.*
+# yang sama dengan dashboard.
+#
+# Hasil ditulis sebagai JSON (default: data/bench/results/<waktu>-<commit>.json)
+# dan bisa dibandingkan antar commit dengan bench/compare.py.
+#
+#   python bench/run.py                         # 30k baris
+#   python bench/run.py --rows 30k,1m,10m --repeat 3
+#   python bench/run.py --rows 1m --no-memory --out data/bench/base.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from bench.generate import ensure_dataset, parse_rows
+from src.cleaner import STRATEGIES, fill_missing, remove_outliers
+from src.perf import rss_bytes
+from src.scoring import score_catalog
+from src.search import build_index
+
+TARGET = "track_popularity"
+QUERIES = ["love", "night dance", "beyonce", "corazon", "remix", "artist 12", "summer", "señorita", "gold sky", "xyzzy"]
+
+
+# ============================================
+# Tahap-tahap pipeline
+# ============================================
+# Setiap tahap menerima dict state, mengubahnya, dan mengembalikan jumlah baris output.
+
+def stage_load(state):
+    state["df"] = pd.read_csv(state["csv_path"])
+    return len(state["df"])
+
+
+def stage_dedup(state):
+    state["df"] = state["df"].drop_duplicates()
+    state["raw"] = state["df"]
+    return len(state["df"])
+
+
+def stage_fill(state):
+    df = state["df"]
+    num_cols = df.select_dtypes(include=np.number).columns
+    cat_cols = df.select_dtypes(exclude=np.number).columns
+    state["df"], _ = fill_missing(df, num_cols, cat_cols)
+    state["num_cols"], state["cat_cols"] = num_cols, cat_cols
+    return len(state["df"])
+
+
+def stage_outliers(state):
+    state["df"], _ = remove_outliers(state["df"], state["num_cols"], state["outlier_strategy"])
+    return len(state["df"])
+
+
+def stage_scaling(state):
+    from sklearn.preprocessing import MinMaxScaler
+    df = state["df"].copy()
+    df[state["num_cols"]] = MinMaxScaler().fit_transform(df[state["num_cols"]])
+    state["df"] = df
+    return len(df)
+
+
+def stage_encoding(state):
+    from sklearn.preprocessing import LabelEncoder
+    df = state["df"].copy()
+    le = LabelEncoder()
+    for col in state["cat_cols"]:
+        df[col] = le.fit_transform(df[col])
+    state["df"] = df
+    return len(df)
+
+
+def stage_correlation(state):
+    corr_target = state["df"].corr()[TARGET]
+    state["top_features"] = corr_target.abs().sort_values(ascending=False).index[1:6].tolist()
+    return len(state["df"])
+
+
+def stage_fit(state):
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    df = state["df"]
+    X_train, _, y_train, _ = train_test_split(df[state["top_features"]], df[TARGET], test_size=0.2, random_state=42)
+    state["model"] = LinearRegression().fit(X_train, y_train)
+    return len(X_train)
+
+
+def stage_predict(state):
+    scores = score_catalog(state["model"], state["df"], state["top_features"])
+    return len(scores)
+
+
+def stage_search_index(state):
+    raw = state["raw"][["track_name", "track_artist"]].reset_index(drop=True)
+    state["index"] = build_index(raw)
+    return len(raw)
+
+
+def stage_search_query(state):
+    hits = 0
+    for query in QUERIES:
+        hits += len(state["index"].search(query, limit=100))
+        hits += len(state["index"].search(query, limit=100, typo_tolerance=True))
+    return hits
+
+
+STAGES = [
+    ("load", stage_load),
+    ("dedup", stage_dedup),
+    ("fill", stage_fill),
+    ("outliers", stage_outliers),
+    ("scaling", stage_scaling),
+    ("encoding", stage_encoding),
+    ("correlation", stage_correlation),
+    ("fit", stage_fit),
+    ("predict", stage_predict),
+    ("search_index", stage_search_index),
+    ("search_query", stage_search_query),
+]
+
+
+# ============================================
+# Pengukuran
+# ============================================
+def run_pipeline(csv_path, track_memory=False, outlier_strategy="iqr"):
+    state = {"csv_path": csv_path, "outlier_strategy": outlier_strategy}
+    results = []
+    rows_in = None
+    for name, stage in STAGES:
+        if track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows_out = stage(state)
+        seconds = time.perf_counter() - start
+        result = {"stage": name, "seconds": seconds, "rows_in": rows_in, "rows_out": rows_out}
+        if track_memory:
+            result["peak_alloc_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            result["rss_mb"] = rss_bytes() / 1e6
+        results.append(result)
+        if name != "search_query":
+            rows_in = rows_out
+    return results
+
+
+def bench_size(n_rows, repeat, track_memory, data_dir, outlier_strategy="iqr"):
+    csv_path = ensure_dataset(n_rows, data_dir)
+    runs = [run_pipeline(csv_path, outlier_strategy=outlier_strategy) for _ in range(repeat)]
+    stages = []
+    for i, (name, _) in enumerate(STAGES):
+        times = [run[i]["seconds"] for run in runs]
+        stages.append({
+            "stage": name,
+            "seconds": statistics.median(times),
+            "seconds_all": times,
+            "rows_in": runs[0][i]["rows_in"],
+            "rows_out": runs[0][i]["rows_out"],
+        })
+    if track_memory:
+        # Pass terpisah: tracemalloc menambah overhead sehingga tidak dipakai untuk timing
+        for stage, mem in zip(stages, run_pipeline(csv_path, True, outlier_strategy)):
+            stage["peak_alloc_mb"] = mem["peak_alloc_mb"]
+            stage["rss_mb"] = mem["rss_mb"]
+    return {"rows": n_rows, "csv_path": csv_path, "repeat": repeat,
+            "outlier_strategy": outlier_strategy, "stages": stages}
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip() != ""
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def metadata():
+    import sklearn
+    commit, dirty = git_commit()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite pipeline Spotify")
+    parser.add_argument("--rows", default="30k", help="Daftar skala dipisah koma, mis. 30k,1m,10m")
+    parser.add_argument("--repeat", type=int, default=1, help="Jumlah pengulangan timing per skala (median)")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pass profiling memori")
+    parser.add_argument("--outlier-strategy", choices=list(STRATEGIES), default="iqr")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data", "bench"))
+    parser.add_argument("--out", help="File JSON hasil (default: <data-dir>/results/<waktu>-<commit>.json)")
+    args = parser.parse_args()
+
+    report = {"meta": metadata(), "runs": []}
+    for n_rows in [parse_rows(r) for r in args.rows.split(",")]:
+        run = bench_size(n_rows, args.repeat, not args.no_memory, args.data_dir, args.outlier_strategy)
+        report["runs"].append(run)
+
+        print(f"\n📊 {n_rows:,} baris")
+        print(f"{'stage':<14}{'detik':>10}{'rows out':>12}{'peak MB':>10}{'RSS MB':>10}")
+        for s in run["stages"]:
+            peak = f"{s['peak_alloc_mb']:10.1f}" if "peak_alloc_mb" in s else f"{'-':>10}"
+            rss = f"{s['rss_mb']:10.1f}" if "rss_mb" in s else f"{'-':>10}"
+            print(f"{s['stage']:<14}{s['seconds']:10.3f}{s['rows_out']:12,}{peak}{rss}")
+
+    out = args.out
+    if out is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        out = os.path.join(args.data_dir, "results", f"{stamp}-{report['meta']['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Hasil disimpan di: {out}")
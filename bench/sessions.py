@@ -0,0 +1,127 @@
+# ============================================
+# Load Test Sesi Dashboard Bersamaan (Memori & Latensi Rerun)
+# ============================================
+# Mensimulasikan N analis yang terhubung ke satu server dashboard: N sesi
+# AppTest di satu proses (cache Streamlit dibagi seperti di server sungguhan),
+# semuanya melakukan rerun bersamaan di thread masing-masing. Setiap skala
+# dijalankan di proses Python baru. Yang diukur:
+#   rss_base_mb   : RSS setelah satu sesi pemanasan (dataset sudah di cache)
+#   rss_peak_mb   : RSS puncak selama rerun bersamaan (disampling tiap 5 ms)
+#   rss_end_mb    : RSS setelah semua sesi selesai (sesi tetap hidup)
+#   per_session_mb: (rss_peak - rss_base) / N
+#   rerun_p50_ms  : median durasi satu rerun
+#
+#   python bench/sessions.py --sessions 1,10,25,50
+#   python bench/sessions.py --app /path/ke/checkout-lama/app.py    # pembanding
+#   python bench/sessions.py --page Korelasi --reruns 5 --json data/bench/sessions.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS = ["rss_base_mb", "rss_peak_mb", "rss_end_mb", "per_session_mb", "rerun_p50_ms"]
+
+
+def child(app_path, n_sessions, page, reruns):
+    import warnings
+    warnings.filterwarnings("ignore")
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    os.chdir(app_dir)
+    sys.path.insert(0, app_dir)
+    sys.path.insert(1, ROOT)
+    from streamlit.testing.v1 import AppTest
+    from src.perf import rss_bytes
+
+    def session():
+        at = AppTest.from_file(app_path, default_timeout=600)
+        at.run()
+        if page:
+            at.radio(key="page").set_value(page)
+            at.run()
+        return at
+
+    # Pemanasan: dataset & artefak masuk cache proses
+    session()
+    rss_base = rss_bytes()
+
+    peak = [rss_base]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], rss_bytes())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    durations = []
+    lock = threading.Lock()
+
+    def user(_):
+        at = session()
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            with lock:
+                durations.append(time.perf_counter() - start)
+        return at
+
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        sessions = list(pool.map(user, range(n_sessions)))
+    done.set()
+    sampler.join()
+    rss_end = rss_bytes()
+    errors = sum(len(at.exception) for at in sessions)
+    return {
+        "sessions": n_sessions,
+        "rss_base_mb": rss_base / 1e6,
+        "rss_peak_mb": peak[0] / 1e6,
+        "rss_end_mb": rss_end / 1e6,
+        "per_session_mb": (peak[0] - rss_base) / 1e6 / n_sessions,
+        "rerun_p50_ms": statistics.median(durations) * 1000,
+        "errors": errors,
+    }
+
+
+def measure(app_path, n_sessions, page, reruns):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--app", app_path, "--sessions", str(n_sessions),
+         "--page", page or "", "--reruns", str(reruns)],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"child gagal ({n_sessions} sesi):\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test memori & latensi untuk sesi dashboard bersamaan")
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--sessions", default="1,10,25", help="Daftar jumlah sesi dipisah koma")
+    parser.add_argument("--page", default="", help="Halaman yang dibuka setiap sesi (default: halaman awal)")
+    parser.add_argument("--reruns", type=int, default=3, help="Jumlah rerun per sesi")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.app, int(args.sessions), args.page or None, args.reruns)))
+        sys.exit(0)
+
+    results = [measure(args.app, int(n), args.page, args.reruns) for n in args.sessions.split(",")]
+    print(f"App: {args.app} | halaman: {args.page or '(awal)'} | {args.reruns} rerun/sesi")
+    print(f"{'sesi':>6}" + "".join(f"{m:>16}" for m in METRICS) + f"{'error':>8}")
+    for r in results:
+        print(f"{r['sessions']:>6}" + "".join(f"{r[m]:16.1f}" for m in METRICS) + f"{r['errors']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"app": args.app, "page": args.page, "reruns": args.reruns, "runs": results}, f, indent=2)
+        print(f"✅ Hasil disimpan di: {args.json}")
@@ -0,0 +1,127 @@
+# ============================================
+# Benchmark Cold Start Dashboard
+# ============================================
+# Setiap percobaan dijalankan di proses Python baru (cache Streamlit kosong,
+# artefak di disk sudah ada). Yang diukur:
+#   interpreter_s  : proses dibuat s/d kode benchmark mulai jalan
+#   import_s       : import modul top-level app.py (streamlit, pandas, src.*, ...)
+#   first_paint_s  : run pertama halaman default (AppTest) sampai selesai render
+#   total_s        : interpreter + import + first paint
+# Modul berat yang ikut termuat setelah first paint juga dicatat.
+#
+#   python bench/startup.py                       # 5 percobaan, ringkasan median
+#   python bench/startup.py --repeat 10 --json data/bench_startup.json
+#   python bench/startup.py --app /path/ke/checkout-lama/app.py   # pembanding
+
+import os
+import sys
+import ast
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import importlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["matplotlib", "seaborn", "sklearn", "joblib", "scipy"]
+METRICS = ["interpreter_s", "import_s", "first_paint_s", "total_s"]
+
+
+def top_level_imports(app_path):
+    with open(app_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+
+def child(app_path, spawned_at):
+    started = time.time()
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    os.chdir(app_dir)
+    sys.path.insert(0, app_dir)
+
+    t = time.perf_counter()
+    for module in top_level_imports(app_path):
+        importlib.import_module(module)
+    import_s = time.perf_counter() - t
+
+    # Harness AppTest tidak dihitung sebagai bagian startup
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(app_path, default_timeout=600)
+    t = time.perf_counter()
+    at.run()
+    first_paint_s = time.perf_counter() - t
+
+    result = {
+        "interpreter_s": started - spawned_at,
+        "import_s": import_s,
+        "first_paint_s": first_paint_s,
+        "exceptions": [str(e.value) for e in at.exception],
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+    result["total_s"] = result["interpreter_s"] + import_s + first_paint_s
+    print(json.dumps(result))
+
+
+def run_trial(app_path):
+    spawned_at = time.time()
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--app", app_path, "--spawned-at", repr(spawned_at)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(trials):
+    return {
+        m: {
+            "median": statistics.median(t[m] for t in trials),
+            "min": min(t[m] for t in trials),
+            "max": max(t[m] for t in trials),
+        }
+        for m in METRICS
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold start dashboard")
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Simpan hasil (machine-readable) ke file ini")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.app, args.spawned_at)
+        sys.exit(0)
+
+    app_path = os.path.abspath(args.app)
+    trials = [run_trial(app_path) for _ in range(args.repeat)]
+    summary = summarize(trials)
+
+    print(f"Cold start {app_path} ({args.repeat} percobaan)")
+    for m in METRICS:
+        s = summary[m]
+        print(f"  {m:<14} median {s['median']:.3f}s  (min {s['min']:.3f}s, max {s['max']:.3f}s)")
+    print("  modul berat setelah first paint:", ", ".join(trials[-1]["heavy_loaded"]) or "-")
+    if trials[-1]["exceptions"]:
+        print("  ⚠️ exception:", trials[-1]["exceptions"])
+
+    if args.json:
+        report = {
+            "app": app_path,
+            "python": sys.version.split()[0],
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "summary": summary,
+            "trials": trials,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Hasil disimpan di: {args.json}")
@@ -0,0 +1,217 @@
+# ============================================
+# Cleaning Engine (Vectorized, Satu Mask Gabungan)
+# ============================================
+# Semua kolom numerik diproses sebagai satu blok NumPy:
+#   - fill: median semua kolom dalam satu panggilan nanmedian, modus per kolom kategori
+#   - statistik outlier (kuartil / mean-std / median-MAD) dalam satu pass untuk semua kolom
+#   - satu mask boolean gabungan, DataFrame difilter sekali
+# Batas outlier dihitung dari seluruh data (bukan dari frame yang sudah
+# menyusut kolom demi kolom), sama seperti mode streaming.
+#
+# Strategi outlier:
+#   iqr    : [Q1 - k*IQR, Q3 + k*IQR]               (default k=1.5)
+#   zscore : |x - mean| / std <= threshold           (default 3.0)
+#   mad    : 0.6745 * |x - median| / MAD <= threshold (default 3.5, modified z-score)
+
+import numpy as np
+import pandas as pd
+
+STRATEGIES = {
+    "iqr": {"k": 1.5},
+    "zscore": {"threshold": 3.0},
+    "mad": {"threshold": 3.5},
+}
+
+
+def _mode(series):
+    # Sama seperti Series.mode()[0]: frekuensi tertinggi, nilai terkecil jika seri
+    counts = series.value_counts()
+    if len(counts) == 0:
+        return np.nan
+    return min(counts.index[counts.to_numpy() == counts.max()])
+
+
+def fill_values(df, num_cols, cat_cols):
+    # Nilai pengganti untuk semua kolom (disimpan di artefak preprocessing)
+    num_cols = list(num_cols)
+    medians = np.nanmedian(df[num_cols].to_numpy(dtype=np.float64), axis=0) if num_cols else []
+    fills = {col: float(medians[i]) for i, col in enumerate(num_cols)}
+    fills.update({col: _mode(df[col]) for col in cat_cols})
+    return fills
+
+
+def fill_missing(df, num_cols=None, cat_cols=None, fills=None):
+    # fills opsional (dari fill_values); jika tidak ada, hanya kolom yang kosong yang dihitung
+    if num_cols is None:
+        num_cols = df.select_dtypes(include=np.number).columns
+    if cat_cols is None:
+        cat_cols = df.select_dtypes(exclude=np.number).columns
+    num_cols, cat_cols = list(num_cols), list(cat_cols)
+
+    X = df[num_cols].to_numpy(dtype=np.float64)
+    missing = np.isnan(X).sum(axis=0)
+    used = {}
+    if missing.any():
+        medians = None if fills is not None else np.nanmedian(X, axis=0)
+        for i, col in enumerate(num_cols):
+            if missing[i]:
+                used[col] = fills[col] if fills is not None else medians[i]
+    filled = {col: int(n) for col, n in zip(num_cols, missing) if n}
+
+    for col in cat_cols:
+        n = int(df[col].isna().sum())
+        if n:
+            used[col] = fills[col] if fills is not None else _mode(df[col])
+            filled[col] = n
+    return (df.fillna(used) if used else df), filled
+
+
+def outlier_bounds(X, strategy="iqr", **params):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategi outlier tidak dikenal: {strategy} (pilihan: {', '.join(STRATEGIES)})")
+    params = {**STRATEGIES[strategy], **params}
+
+    if strategy == "iqr":
+        q1, q3 = np.quantile(X, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        return q1 - params["k"] * iqr, q3 + params["k"] * iqr
+    if strategy == "zscore":
+        mean = X.mean(axis=0)
+        spread = params["threshold"] * X.std(axis=0, ddof=1)
+        return mean - spread, mean + spread
+    median = np.median(X, axis=0)
+    mad = np.median(np.abs(X - median), axis=0)
+    spread = params["threshold"] * mad / 0.6745
+    return median - spread, median + spread
+
+
+def outlier_mask(X, lower, upper):
+    # violations[i, j] = baris i di luar batas kolom j
+    violations = (X < lower) | (X > upper)
+    return ~violations.any(axis=1), violations
+
+
+class CleaningReport:
+    def __init__(self, strategy, params, columns, lower, upper, violations, rows_in, filled=None):
+        per_row = violations.sum(axis=1)
+        self.strategy = strategy
+        self.params = params
+        self.rows_in = rows_in
+        self.filled = filled or {}
+        self.rules = pd.DataFrame({
+            "lower": lower,
+            "upper": upper,
+            # baris yang melanggar aturan kolom ini
+            "violations": violations.sum(axis=0),
+            # baris yang terhapus hanya karena aturan kolom ini
+            "only_rule": (violations & (per_row == 1)[:, None]).sum(axis=0),
+        }, index=pd.Index(columns, name="column"))
+        self.rows_removed = int((per_row > 0).sum())
+        self.rows_out = rows_in - self.rows_removed
+
+    def to_dict(self):
+        return {
+            "strategy": self.strategy,
+            "params": self.params,
+            "rows_in": self.rows_in,
+            "rows_removed": self.rows_removed,
+            "rows_out": self.rows_out,
+            "filled": self.filled,
+            "rules": {
+                col: {k: (float(v) if k in ("lower", "upper") else int(v)) for k, v in row.items()}
+                for col, row in self.rules.iterrows()
+            },
+        }
+
+    def __str__(self):
+        lines = [
+            f"Strategi outlier: {self.strategy} {self.params}",
+            f"Baris masuk: {self.rows_in:,} | dihapus: {self.rows_removed:,} | tersisa: {self.rows_out:,}",
+        ]
+        if self.filled:
+            lines.append("Nilai kosong diisi: " + ", ".join(f"{c}={n}" for c, n in self.filled.items()))
+        lines.append(self.rules.to_string(float_format=lambda v: f"{v:.4g}"))
+        return "\n".join(lines)
+
+
+def remove_outliers(df, columns, strategy="iqr", **params):
+    columns = list(columns)
+    X = df[columns].to_numpy(dtype=np.float64)
+    lower, upper = outlier_bounds(X, strategy, **params)
+    keep, violations = outlier_mask(X, lower, upper)
+    report = CleaningReport(strategy, {**STRATEGIES[strategy], **params}, columns, lower, upper, violations, len(df))
+    return df[keep], report
+
+
+def clean_frame(df, strategy="iqr", **params):
+    # Fill missing values lalu hapus outlier dengan satu mask gabungan
+    num_cols = df.select_dtypes(include=np.number).columns
+    cat_cols = df.select_dtypes(exclude=np.number).columns
+    df, filled = fill_missing(df, num_cols, cat_cols)
+    df, report = remove_outliers(df, num_cols, strategy, **params)
+    report.filled = filled
+    return df, report
+
+
+# ============================================
+# Tanggal Rilis (tahun / tahun-bulan / tanggal lengkap)
+# ============================================
+# track_album_release_date berisi campuran "YYYY-MM-DD", "YYYY-MM" dan "YYYY".
+# Diurai sekali (operasi string vektor, tanpa to_datetime per baris) menjadi:
+#   release_year      : tahun (-1 jika tidak valid)
+#   release_month     : bulan 1-12 (0 jika tidak ada / tidak valid)
+#   release_precision : 0 = tidak valid, 1 = tahun saja, 2 = tahun-bulan, 3 = tanggal lengkap
+RELEASE_COL = "track_album_release_date"
+RELEASE_COLUMNS = ["release_year", "release_month", "release_precision"]
+RELEASE_PRECISION = {0: "tidak diketahui", 1: "tahun", 2: "bulan", 3: "tanggal"}
+YEAR_RANGE = (1900, 2100)
+
+
+def parse_release_dates(values):
+    # Hanya nilai unik yang diurai (tanggal rilis sangat berulang antar lagu), lalu dipetakan balik
+    index = values.index if isinstance(values, pd.Series) else None
+    codes, uniques = pd.factorize(pd.Series(values).fillna(""))
+    parsed = _parse_unique_dates(np.asarray(uniques, dtype=object))
+    return pd.DataFrame({col: parsed[col][codes] for col in RELEASE_COLUMNS}, index=index)
+
+
+def _parse_unique_dates(values):
+    # String -> matriks kode karakter (n x 11, fixed width); validasi & angka dihitung per kolom karakter
+    text = np.char.strip(np.asarray(values, dtype="U11"))
+    chars = text.view(np.uint32).reshape(len(text), 11)
+    length = np.char.str_len(text)
+    # Nilai digit per posisi; karakter non-digit (termasuk padding 0) menjadi >= 10 lewat wraparound uint32
+    num = {i: chars[:, i] - np.uint32(48) for i in (0, 1, 2, 3, 5, 6, 8, 9)}
+
+    def digits(*pos):
+        ok = num[pos[0]] < 10
+        for i in pos[1:]:
+            ok &= num[i] < 10
+        return ok
+
+    def number(*pos):
+        value = np.zeros(len(text), dtype=np.int32)
+        for i in pos:
+            value = value * 10 + num[i].astype(np.int32)
+        return value
+
+    year, month, day = number(0, 1, 2, 3), number(5, 6), number(8, 9)
+    valid = digits(0, 1, 2, 3) & (year >= YEAR_RANGE[0]) & (year <= YEAR_RANGE[1])
+    month_ok = (chars[:, 4] == 45) & digits(5, 6)
+    day_ok = (chars[:, 7] == 45) & digits(8, 9)
+    valid &= (length == 4) | ((length == 7) & month_ok) | ((length == 10) & month_ok & day_ok)
+    has_month = valid & (length >= 7) & (month >= 1) & (month <= 12)
+    has_day = has_month & (length == 10) & (day >= 1) & (day <= 31)
+    precision = np.select([has_day, has_month, valid], [3, 2, 1], 0)
+    return {
+        "release_year": np.where(valid, year, -1).astype(np.int16),
+        "release_month": np.where(has_month, month, 0).astype(np.int8),
+        "release_precision": precision.astype(np.int8),
+    }
+
+
+def add_release_columns(df, col=RELEASE_COL):
+    # Salinan df dengan kolom RELEASE_COLUMNS (df tanpa kolom tanggal dikembalikan apa adanya)
+    if col not in df.columns:
+        return df
+    return df.assign(**parse_release_dates(df[col]))
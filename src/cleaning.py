@@ -1,16 +1,41 @@
 # ============================================
 # 1. Import Library
 # ============================================
+import os
+import sys
+import argparse
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler, LabelEncoder
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import arrow_path, write_columnar, dataset_fingerprint
+from src.streaming import clean_streaming
+from src.cleaner import STRATEGIES, fill_values, fill_missing, remove_outliers, add_release_columns
+from src.preprocess import Preprocessor, PREPROCESS_PATH
+
+parser = argparse.ArgumentParser(description="Cleaning dataset spotify_songs.csv")
+parser.add_argument("--chunksize", type=int, default=None,
+                    help="Aktifkan mode streaming (out-of-core) dengan jumlah baris per chunk")
+parser.add_argument("--outlier-strategy", choices=list(STRATEGIES), default="iqr",
+                    help="Strategi deteksi outlier (mode in-memory)")
+args = parser.parse_args()
+
 # ============================================
 # 2. Load Dataset
 # ============================================
 csv_path = "data/spotify_songs.csv"  # Relative path sesuai struktur folder
+
+# Mode streaming: proses per chunk tanpa memuat data utuh (lihat batas memori di src/streaming.py)
+if args.chunksize:
+    clean_streaming(csv_path, chunksize=args.chunksize)
+    sys.exit(0)
+
 df = pd.read_csv(csv_path)
 
+# Simpan juga versi kolumnar dari data mentah (dipakai dashboard)
+write_columnar(df, arrow_path(csv_path))
+
 # ============================================
 # 3. Cek Informasi Awal Dataset
 # ============================================
@@ -38,28 +63,20 @@ df = df.drop_duplicates()
 # ============================================
 # 5. Tangani Missing Values
 # ============================================
+# Median semua kolom numerik dihitung sekali (satu blok NumPy), modus per kolom kategori
 num_cols = df.select_dtypes(include=np.number).columns
-for col in num_cols:
-    df[col].fillna(df[col].median(), inplace=True)
-
 cat_cols = df.select_dtypes(exclude=np.number).columns
-for col in cat_cols:
-    df[col].fillna(df[col].mode()[0], inplace=True)
+fills = fill_values(df, num_cols, cat_cols)
+df, filled = fill_missing(df, num_cols, cat_cols, fills)
 
 # ============================================
-# 6. Deteksi Outlier (IQR Method)
+# 6. Deteksi Outlier (IQR / z-score / MAD)
 # ============================================
-def remove_outliers_iqr(data, columns):
-    for col in columns:
-        Q1 = data[col].quantile(0.25)
-        Q3 = data[col].quantile(0.75)
-        IQR = Q3 - Q1
-        lower = Q1 - 1.5 * IQR
-        upper = Q3 + 1.5 * IQR
-        data = data[(data[col] >= lower) & (data[col] <= upper)]
-    return data
-
-df = remove_outliers_iqr(df, num_cols)
+# Batas semua kolom dihitung dari data lengkap, lalu difilter sekali dengan satu mask gabungan
+df, outlier_report = remove_outliers(df, num_cols, args.outlier_strategy)
+outlier_report.filled = filled
+print("\n=== Laporan Outlier ===")
+print(outlier_report)
 
 # ============================================
 # 7. Normalisasi Data Numerik
@@ -70,15 +87,32 @@ df[num_cols] = scaler.fit_transform(df[num_cols])
 # ============================================
 # 7A. Simpan dataset versi sebelum encoding (untuk tampilan dashboard)
 # ============================================
-original_df = df.copy()
+# + tanggal rilis yang sudah diurai (release_year / release_month / release_precision);
+# kolom tanggal aslinya tetap di-encode sebagai kategori di dataset bersih (fitur model)
+original_df = add_release_columns(df)
 original_df.to_csv("data/spotify_cleaned_original.csv", index=False)
+write_columnar(original_df, arrow_path("data/spotify_cleaned_original.csv"))
 
 # ============================================
 # 8. Encoding Kolom Kategorikal
 # ============================================
 le = LabelEncoder()
+vocab = {}
 for col in cat_cols:
     df[col] = le.fit_transform(df[col])
+    vocab[col] = le.classes_
+
+# ============================================
+# 8A. Simpan Artefak Preprocessing (untuk skor lagu baru tanpa cleaning ulang)
+# ============================================
+preprocessor = Preprocessor(
+    df.columns, num_cols, cat_cols, fills,
+    outlier_report.rules["lower"], outlier_report.rules["upper"],
+    scaler.data_min_, scaler.data_max_, vocab,
+    strategy=args.outlier_strategy, source_fingerprint=dataset_fingerprint(csv_path),
+)
+preprocessor.save(PREPROCESS_PATH)
+print(f"\n✅ Artefak preprocessing disimpan di: {PREPROCESS_PATH}")
 
 # ============================================
 # 9. Cek Hasil Akhir
@@ -92,4 +126,5 @@ print(df.head())
 # ============================================
 output_path = "data/spotify_cleaned.csv"
 df.to_csv(output_path, index=False)
-print(f"\n✅ Dataset bersih telah disimpan di: {output_path}")
+write_columnar(df, arrow_path(output_path))
+print(f"\n✅ Dataset bersih telah disimpan di: {output_path} (+ {arrow_path(output_path)})")
@@ -0,0 +1,384 @@
+# ============================================
+# Filter Cube (Agregat Pra-hitung untuk Filter Dashboard)
+# ============================================
+# Filter sidebar (genre, subgenre, artis, tahun rilis) dijawab dari agregat yang
+# dihitung sekali, bukan groupby ulang atas seluruh dataset per klik.
+#
+#   cell  : satu kombinasi (playlist_genre, playlist_subgenre, tahun rilis) yang ada di data.
+#           Per cell disimpan: jumlah baris, Σx & Σxxᵀ fitur ukuran (top fitur + target,
+#           skala dataset bersih), Σ popularitas asli (0-100), histogram & maksimum
+#           target, serta kandidat top/bottom 5 lagu (unik judul+artis per cell).
+#   artis : dimensi dengan kardinalitas tinggi; tidak dijadikan sumbu cell tapi diindeks
+#           (artis -> posisi baris). Filter artis hanya mengagregasi baris artis terpilih.
+#
+# Filter apa pun menghasilkan CubeSlice: subset cell (atau cell virtual dari baris
+# artis) yang dijumlahkan. KPI, histogram, korelasi, agregat per genre/subgenre dan
+# top/bottom 5 dihitung dari slice itu dalam O(cell), bukan O(baris).
+# Baris = baris dataset bersih (sebaris dengan spotify_cleaned_original); tahun rilis dari
+# kolom release_year hasil cleaning (src/cleaner.py). Ringkasan dashboard tanpa filter
+# juga memakai slice penuh cube, jadi angka dengan & tanpa filter selalu sebanding.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.storage import load_table
+
+CUBE_VERSION = 1
+CUBE_PATH = "data/filter_cube.npz"
+CLEANED_PATH = "data/spotify_cleaned.csv"
+ORIGINAL_PATH = "data/spotify_cleaned_original.csv"
+RAW_PATH = "data/spotify_songs.csv"
+TARGET = "track_popularity"
+
+LABEL_DIMS = ["playlist_genre", "playlist_subgenre", "track_artist"]
+HIST_BINS = 100
+N_CANDIDATES = 5
+# Top 5 hanya lagu ber-popularitas > 0, bottom 5 minimal 10 (tanpa duplikat judul+artis)
+TOP_MIN, BOTTOM_MIN = 0, 10
+
+
+def _factorize(values):
+    codes, labels = pd.factorize(pd.Series(values, dtype="string").fillna(""), sort=True)
+    return codes.astype(np.int32), np.asarray(labels, dtype=str)
+
+
+def _group_sums(groups, n_groups, X):
+    return np.stack([np.bincount(groups, weights=X[:, k], minlength=n_groups) for k in range(X.shape[1])], axis=1)
+
+
+def _group_cross(groups, n_groups, X):
+    K = X.shape[1]
+    cross = np.empty((n_groups, K, K))
+    for i in range(K):
+        for j in range(i, K):
+            cross[:, i, j] = cross[:, j, i] = np.bincount(groups, weights=X[:, i] * X[:, j], minlength=n_groups)
+    return cross
+
+
+def _candidates(cell, rows, popularity, name_codes, artist_codes, largest):
+    # Maksimal N_CANDIDATES lagu unik (judul+artis, kemunculan pertama) per cell,
+    # diurutkan per cell lalu popularitas; hasil: posisi baris berurutan per cell
+    order = np.lexsort((rows, name_codes[rows], artist_codes[rows], cell))
+    rows, cell = rows[order], cell[order]
+    key = np.stack([cell, artist_codes[rows], name_codes[rows]], axis=1)
+    first = np.r_[True, (np.diff(key, axis=0) != 0).any(axis=1)]
+    rows, cell = rows[first], cell[first]
+    pop = popularity[rows]
+    order = np.lexsort((rows, -pop if largest else pop, cell))
+    rows, cell = rows[order], cell[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(cell)) + 1]
+    rank = np.arange(len(cell)) - np.repeat(starts, np.diff(np.r_[starts, len(cell)]))
+    keep = rank < N_CANDIDATES
+    return rows[keep], cell[keep]
+
+
+class CubeSlice:
+    def __init__(self, cube, cells, n, sums, cross, pop_sum, hist, maxs, candidates, values=None):
+        # values: nilai target per baris jika slice dibangun dari baris (filter artis) -> kuantil eksak
+        self.cube = cube
+        self.values = values
+        self.cells = cells
+        self.n = n
+        self.sums = sums
+        self.cross = cross
+        self.pop_sum = pop_sum
+        self.hist = hist
+        self.maxs = maxs
+        self.candidates = candidates
+
+    @property
+    def count(self):
+        return int(self.n.sum())
+
+    def histogram(self, bins=None):
+        # Histogram target (skala dataset bersih); bins harus pembagi HIST_BINS
+        counts = self.hist.sum(axis=0)
+        edges = self.cube.hist_edges
+        if bins is not None and bins != HIST_BINS:
+            step = HIST_BINS // bins
+            counts, edges = counts.reshape(bins, step).sum(axis=1), edges[::step]
+        return counts, edges
+
+    def quantile(self, q):
+        if self.values is not None:
+            return float(np.quantile(self.values, q)) if len(self.values) else float("nan")
+        counts, edges = self.histogram()
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        cum = np.cumsum(counts)
+        target = q * total
+        i = int(np.searchsorted(cum, target))
+        i = min(i, len(counts) - 1)
+        before = cum[i - 1] if i else 0
+        frac = (target - before) / counts[i] if counts[i] else 0.0
+        return float(edges[i] + frac * (edges[i + 1] - edges[i]))
+
+    def popularity(self):
+        # Ringkasan target: mean, max, median & kuartil (dari histogram)
+        n = self.count
+        t = self.cube.measures.index(TARGET)
+        return {
+            "mean": float(self.sums[:, t].sum() / n) if n else float("nan"),
+            "median": self.quantile(0.5),
+            "max": float(self.maxs.max()) if n else float("nan"),
+            "q25": self.quantile(0.25),
+            "q75": self.quantile(0.75),
+        }
+
+    def box_stats(self):
+        # Statistik boxplot (untuk Axes.bxp) dari histogram: kuartil & whisker 1.5 IQR, tanpa outlier
+        counts, edges = self.histogram()
+        filled = np.flatnonzero(counts)
+        q1, med, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        if self.values is not None:
+            lo = float(self.values.min()) if len(self.values) else q1
+        else:
+            lo = float(edges[filled[0]]) if len(filled) else q1
+        hi = float(self.maxs.max()) if len(filled) else q3
+        iqr = q3 - q1
+        return {"q1": q1, "med": med, "q3": q3, "whislo": max(lo, q1 - 1.5 * iqr),
+                "whishi": min(hi, q3 + 1.5 * iqr), "fliers": []}
+
+    def corr(self):
+        n = self.count
+        columns = self.cube.measures
+        if n < 2:
+            return pd.DataFrame(np.nan, index=columns, columns=columns)
+        mean = self.sums.sum(axis=0) / n
+        cov = (self.cross.sum(axis=0) - n * np.outer(mean, mean)) / (n - 1)
+        std = np.sqrt(np.maximum(np.diag(cov), 0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def _by(self, dim):
+        codes = self.cube.cell_codes[dim][self.cells]
+        size = len(self.cube.labels[dim])
+        counts = np.bincount(codes, weights=self.n, minlength=size)
+        pop = np.bincount(codes, weights=self.pop_sum, minlength=size)
+        return counts, pop
+
+    def counts(self, dim, n=10):
+        counts, _ = self._by(dim)
+        series = pd.Series(counts.astype(np.int64), index=self.cube.labels[dim])
+        return series[series > 0].sort_values(ascending=False, kind="stable").head(n)
+
+    def mean_popularity(self, dim):
+        # Rata-rata popularitas asli (0-100) per genre/subgenre
+        counts, pop = self._by(dim)
+        series = pd.Series(pop[counts > 0] / counts[counts > 0], index=self.cube.labels[dim][counts > 0])
+        return series.sort_values(ascending=False, kind="stable")
+
+    def songs(self, n=5, largest=True):
+        cube = self.cube
+        rows = self.candidates
+        pop = cube.popularity[rows]
+        keep = cube.listed[rows] & ((pop > TOP_MIN) if largest else (pop >= BOTTOM_MIN))
+        rows = rows[keep]
+        order = np.lexsort((rows, -cube.popularity[rows] if largest else cube.popularity[rows]))
+        rows = rows[order]
+        key = cube.name_codes[rows].astype(np.int64) * len(cube.labels["track_artist"]) + cube.artist_codes[rows]
+        _, first = np.unique(key, return_index=True)
+        rows = rows[np.sort(first)][:n]
+        return pd.DataFrame({
+            "track_name": cube.name_labels[cube.name_codes[rows]],
+            "track_artist": cube.labels["track_artist"][cube.artist_codes[rows]],
+            TARGET: cube.popularity[rows],
+        })
+
+
+class FilterCube:
+    def __init__(self, arrays, fingerprint=""):
+        self.__dict__.update(arrays)
+        self.measures = [str(m) for m in self.measures]
+        self.labels = {dim: self.__dict__.pop(f"labels_{dim}") for dim in LABEL_DIMS}
+        self.cell_codes = {dim: self.__dict__.pop(f"cell_{dim}") for dim in LABEL_DIMS[:2]}
+        self.fingerprint = fingerprint
+        self._label_pos = {dim: pd.Index(labels) for dim, labels in self.labels.items()}
+        self.artist_offsets = np.searchsorted(self.artist_codes[self.artist_order],
+                                              np.arange(len(self.labels["track_artist"]) + 1))
+
+    # ---------------------------
+    # Pilihan filter (untuk widget)
+    # ---------------------------
+    def options(self, dim, genres=None):
+        if dim == "playlist_subgenre" and genres:
+            cells = np.isin(self.cell_codes["playlist_genre"], self._codes("playlist_genre", genres))
+            return self.labels[dim][np.unique(self.cell_codes[dim][cells])].tolist()
+        return self.labels[dim].tolist()
+
+    @property
+    def year_range(self):
+        years = self.cell_year[self.cell_year >= 0]
+        return (int(years.min()), int(years.max())) if len(years) else (0, 0)
+
+    # ---------------------------
+    # Query
+    # ---------------------------
+    def _codes(self, dim, values):
+        codes = self._label_pos[dim].get_indexer(list(values))
+        return codes[codes >= 0]
+
+    def cell_mask(self, filters):
+        mask = np.ones(len(self.cell_n), dtype=bool)
+        for dim in ("playlist_genre", "playlist_subgenre"):
+            if filters.get(dim):
+                mask &= np.isin(self.cell_codes[dim], self._codes(dim, filters[dim]))
+        if filters.get("year"):
+            lo, hi = filters["year"]
+            mask &= (self.cell_year >= lo) & (self.cell_year <= hi)
+        return mask
+
+    def artist_rows(self, artists):
+        codes = self._codes("track_artist", artists)
+        rows = [self.artist_order[self.artist_offsets[c]:self.artist_offsets[c + 1]] for c in codes]
+        return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def row_mask(self, filters):
+        # Mask baris dataset bersih (untuk chart yang butuh data per baris, mis. scatter)
+        mask = self.cell_mask(filters)[self.cell_of_row]
+        if filters.get("track_artist"):
+            selected = np.zeros(len(mask), dtype=bool)
+            selected[self.artist_rows(filters["track_artist"])] = True
+            mask &= selected
+        return mask
+
+    def aggregate(self, filters):
+        cmask = self.cell_mask(filters)
+        if not filters.get("track_artist"):
+            cells = np.flatnonzero(cmask)
+            candidates = np.concatenate([self.top_rows[np.isin(self.top_cell, cells)],
+                                         self.bottom_rows[np.isin(self.bottom_cell, cells)]])
+            return CubeSlice(self, cells, self.cell_n[cells], self.cell_sums[cells], self.cell_cross[cells],
+                             self.cell_pop_sum[cells], self.cell_hist[cells], self.cell_max[cells], candidates)
+
+        # Filter artis: agregasi langsung dari baris artis terpilih (sedikit), dikelompokkan per cell
+        rows = self.artist_rows(filters["track_artist"])
+        rows = rows[cmask[self.cell_of_row[rows]]]
+        cells, local = np.unique(self.cell_of_row[rows], return_inverse=True)
+        k = len(cells)
+        X = self.values[rows].astype(np.float64)
+        target = X[:, self.measures.index(TARGET)]
+        hist = np.bincount(local * HIST_BINS + self._bins(target), minlength=k * HIST_BINS).reshape(k, HIST_BINS)
+        maxs = np.full(k, -np.inf)
+        np.maximum.at(maxs, local, target)
+        return CubeSlice(self, cells, np.bincount(local, minlength=k), _group_sums(local, k, X),
+                         _group_cross(local, k, X), np.bincount(local, weights=self.popularity[rows], minlength=k),
+                         hist, maxs, rows, target)
+
+    def _bins(self, values):
+        lo, hi = self.hist_edges[0], self.hist_edges[-1]
+        return np.clip(((values - lo) / ((hi - lo) or 1.0) * HIST_BINS).astype(np.int64), 0, HIST_BINS - 1)
+
+    def save(self, path=CUBE_PATH):
+        arrays = {k: v for k, v in self.__dict__.items()
+                  if isinstance(v, np.ndarray) and not k.startswith("_") and k != "artist_offsets"}
+        arrays.update({f"labels_{dim}": labels for dim, labels in self.labels.items()})
+        arrays.update({f"cell_{dim}": codes for dim, codes in self.cell_codes.items()})
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, version=np.int64(CUBE_VERSION), fingerprint=np.str_(self.fingerprint),
+                 measures=np.asarray(self.measures, dtype=str), **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=CUBE_PATH):
+        with np.load(path, allow_pickle=False) as f:
+            if int(f["version"]) != CUBE_VERSION:
+                raise ValueError(f"versi filter cube {path} tidak didukung")
+            arrays = {k: f[k] for k in f.files if k not in ("version", "fingerprint")}
+            return cls(arrays, str(f["fingerprint"]))
+
+
+def track_mask(meta, filters):
+    # Filter yang sama untuk tabel per-track (metadata feature store / skor katalog)
+    mask = np.ones(len(meta), dtype=bool)
+    for dim in LABEL_DIMS:
+        if filters.get(dim):
+            mask &= meta[dim].astype("string").isin(filters[dim]).fillna(False).to_numpy(dtype=bool)
+    if filters.get("year"):
+        lo, hi = filters["year"]
+        year = meta["release_year"].to_numpy()
+        mask &= (year >= lo) & (year <= hi)
+    return mask
+
+
+def build_cube(measures, cleaned_path=CLEANED_PATH, original_path=ORIGINAL_PATH, raw_path=RAW_PATH):
+    measures = [m for m in measures if m != TARGET] + [TARGET]
+    original = load_table(original_path, ["track_id", "track_name", "release_year"] + LABEL_DIMS)
+    cleaned = load_table(cleaned_path, measures)
+    if len(cleaned) != len(original):
+        raise ValueError(f"{cleaned_path} dan {original_path} tidak sebaris ({len(cleaned)} vs {len(original)})")
+    values = cleaned[measures].to_numpy(dtype=np.float64)
+    target = values[:, -1]
+
+    # Popularitas asli (0-100) di-join dari data mentah lewat track_id
+    raw = load_table(raw_path, ["track_id", TARGET]).drop_duplicates("track_id").set_index("track_id")[TARGET]
+    popularity = raw.reindex(original["track_id"]).to_numpy(dtype=np.float64)
+
+    arrays = {"measures": np.asarray(measures, dtype=str)}
+    codes = {}
+    for dim in LABEL_DIMS:
+        codes[dim], arrays[f"labels_{dim}"] = _factorize(original[dim])
+    name_codes, arrays["name_labels"] = _factorize(original["track_name"])
+    year = original["release_year"].to_numpy(dtype=np.int16)
+
+    # Cell = kombinasi (genre, subgenre, tahun) yang muncul di data
+    n_sub = len(arrays["labels_playlist_subgenre"])
+    key = (codes["playlist_genre"].astype(np.int64) * n_sub + codes["playlist_subgenre"]) * 4096 + (year + 1)
+    cell_keys, cell_of_row = np.unique(key, return_inverse=True)
+    n_cells = len(cell_keys)
+    arrays["cell_playlist_genre"] = (cell_keys // 4096 // n_sub).astype(np.int32)
+    arrays["cell_playlist_subgenre"] = (cell_keys // 4096 % n_sub).astype(np.int32)
+    arrays["cell_year"] = (cell_keys % 4096 - 1).astype(np.int16)
+
+    lo, hi = np.nanmin(target), np.nanmax(target)
+    arrays["hist_edges"] = np.linspace(lo, hi if hi > lo else lo + 1, HIST_BINS + 1)
+    bins = np.clip(((target - lo) / ((hi - lo) or 1.0) * HIST_BINS).astype(np.int64), 0, HIST_BINS - 1)
+    arrays["cell_n"] = np.bincount(cell_of_row, minlength=n_cells)
+    arrays["cell_sums"] = _group_sums(cell_of_row, n_cells, values)
+    arrays["cell_cross"] = _group_cross(cell_of_row, n_cells, values)
+    arrays["cell_pop_sum"] = np.bincount(cell_of_row, weights=popularity, minlength=n_cells)
+    arrays["cell_hist"] = np.bincount(cell_of_row * HIST_BINS + bins,
+                                      minlength=n_cells * HIST_BINS).reshape(n_cells, HIST_BINS).astype(np.int32)
+    cell_max = np.full(n_cells, -np.inf)
+    np.maximum.at(cell_max, cell_of_row, target)
+    arrays["cell_max"] = cell_max
+
+    # Kandidat top/bottom 5 per cell (aturan TOP_MIN/BOTTOM_MIN)
+    listed = (pd.Series(original["track_name"], dtype="string").fillna("").str.len().to_numpy() > 0) & \
+             (pd.Series(original["track_artist"], dtype="string").fillna("").str.len().to_numpy() > 0)
+    rows = np.arange(len(original))
+    for name, keep, largest in (("top", popularity > TOP_MIN, True), ("bottom", popularity >= BOTTOM_MIN, False)):
+        sel = rows[listed & keep]
+        arrays[f"{name}_rows"], arrays[f"{name}_cell"] = _candidates(
+            cell_of_row[sel], sel, popularity, name_codes, codes["track_artist"], largest)
+
+    # Data per baris untuk filter artis & mask baris
+    arrays["cell_of_row"] = cell_of_row.astype(np.int32)
+    arrays["artist_codes"] = codes["track_artist"]
+    arrays["artist_order"] = np.argsort(codes["track_artist"], kind="stable")
+    arrays["name_codes"] = name_codes
+    arrays["listed"] = listed
+    arrays["popularity"] = popularity
+    arrays["values"] = values.astype(np.float32)
+    return FilterCube(arrays)
+
+
+def load_or_build_cube(measures, path, fingerprint, **paths):
+    # Pakai cube tersimpan jika versi, fingerprint dataset & fitur ukuran masih cocok
+    measures = [m for m in measures if m != TARGET] + [TARGET]
+    if os.path.exists(path):
+        try:
+            cube = FilterCube.load(path)
+            if cube.fingerprint == fingerprint and cube.measures == measures:
+                return cube
+        except (OSError, ValueError, KeyError):
+            pass
+    cube = build_cube(measures, **paths)
+    cube.fingerprint = fingerprint
+    cube.save(path)
+    return cube
@@ -2,15 +2,41 @@
 # Exploratory Data Analysis (EDA)
 # ============================================
 
-import pandas as pd
-import numpy as np
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description="Exploratory Data Analysis dataset bersih")
+parser.add_argument("--report", metavar="DIR",
+                    help="Mode laporan headless: render semua figure ke DIR (HTML + PNG) tanpa plt.show()")
+parser.add_argument("--workers", type=int, default=None, help="Jumlah proses render (default: semua core)")
+parser.add_argument("--force", action="store_true", help="Render ulang semua figure walau tidak berubah")
+args = parser.parse_args()
+
+# ============================================
+# 0. Mode Laporan Headless (opsional)
+# ============================================
+if args.report:
+    from src.report import build_report
+    report = build_report(args.report, workers=args.workers, force=args.force)
+    for fig in report["figures"]:
+        status = "cache" if fig["cached"] else f"{fig['seconds']:.2f}s"
+        print(f"{status:>8}  {fig['file']}")
+    print(f"\n✅ Laporan EDA ({report['rendered']} figure di-render, {report['workers']} worker, "
+          f"{report['wall_seconds']:.2f}s) disimpan di: {os.path.join(args.report, 'index.html')}")
+    sys.exit(0)
+
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.storage import load_table
+from src.suffstats import load_suffstats
 
 # ============================================
 # 1. Load Data
 # ============================================
-df = pd.read_csv("data/spotify_cleaned.csv")
+df = load_table("data/spotify_cleaned.csv")
 
 print("✅ Data loaded successfully!")
 print(df.head())
@@ -31,7 +57,7 @@ plt.show()
 # 3. Heatmap Korelasi Antar Fitur Numerik
 # ============================================
 plt.figure(figsize=(12, 8))
-corr_matrix = df.corr()
+corr_matrix = load_suffstats(df=df).corr()  # dari sufficient statistics
 sns.heatmap(corr_matrix, annot=False, cmap="viridis")
 plt.title("Heatmap Korelasi Antar Fitur")
 plt.show()
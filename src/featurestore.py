@@ -0,0 +1,85 @@
+# ============================================
+# Feature Store per track_id
+# ============================================
+# Satu tempat untuk fitur & metadata lagu, dikunci dengan track_id:
+#   - matriks fitur float32 (kolom dataset bersih yang diminta, default semua), satu baris per track
+#   - tabel metadata tampilan (judul, artis, genre, tanggal rilis, durasi asli)
+#   - hash index track_id -> posisi baris (lookup O(1))
+# Track yang muncul di beberapa playlist disimpan sekali (kemunculan pertama
+# di dataset bersih). Dataset bersih & versi sebelum encoding memiliki urutan
+# baris yang sama, sehingga track_id asli diambil dari versi sebelum encoding;
+# durasi asli (belum di-scale) di-join dari data mentah lewat track_id.
+
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.storage import load_table
+
+CLEANED_PATH = "data/spotify_cleaned.csv"
+ORIGINAL_PATH = "data/spotify_cleaned_original.csv"
+RAW_PATH = "data/spotify_songs.csv"
+
+# Kolom metadata dari dataset bersih sebelum encoding (sebaris dengan fitur)
+META_COLS = ["track_name", "track_artist", "track_album_release_date", "release_year", "release_precision",
+             "playlist_genre", "playlist_subgenre"]
+# Kolom metadata dari data mentah (nilai asli, bukan hasil scaling)
+RAW_META_COLS = ["duration_ms"]
+
+
+class FeatureStore:
+    def __init__(self, track_ids, features, columns, metadata):
+        self.index = pd.Index(track_ids, name="track_id")
+        if not self.index.is_unique:
+            raise ValueError("track_id di feature store harus unik")
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.columns = list(columns)
+        self.col_pos = {c: i for i, c in enumerate(self.columns)}
+        self.meta = metadata.set_axis(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, track_id):
+        return track_id in self.index
+
+    def position(self, track_id):
+        return self.index.get_loc(track_id)
+
+    def _col_idx(self, columns):
+        return list(range(len(self.columns))) if columns is None else [self.col_pos[c] for c in columns]
+
+    def features_of(self, track_id, columns=None):
+        idx = self._col_idx(columns)
+        row = self.features[self.position(track_id), idx]
+        return pd.Series(row, index=[self.columns[i] for i in idx], name=track_id)
+
+    def metadata_of(self, track_id):
+        return self.meta.iloc[self.position(track_id)]
+
+    def frame(self, columns=None):
+        idx = self._col_idx(columns)
+        values = self.features if columns is None else self.features[:, idx]
+        return pd.DataFrame(values, index=self.index, columns=[self.columns[i] for i in idx], copy=False)
+
+    def random_id(self, rng=random):
+        return self.index[rng.randrange(len(self))]
+
+
+def build_feature_store(cleaned_path=CLEANED_PATH, original_path=ORIGINAL_PATH, raw_path=RAW_PATH, columns=None):
+    cleaned = load_table(cleaned_path, columns)
+    original = load_table(original_path, ["track_id"] + META_COLS)
+    if len(cleaned) != len(original):
+        raise ValueError(f"{cleaned_path} dan {original_path} tidak sebaris ({len(cleaned)} vs {len(original)})")
+
+    first = ~original["track_id"].duplicated().to_numpy()
+    track_ids = original["track_id"].to_numpy()[first]
+    features = cleaned[first].to_numpy(dtype=np.float32)
+    meta = original.loc[first, META_COLS].reset_index(drop=True)
+
+    raw = load_table(raw_path, ["track_id"] + RAW_META_COLS)
+    raw = raw.drop_duplicates("track_id").set_index("track_id")
+    for col in RAW_META_COLS:
+        meta[col] = raw[col].reindex(track_ids).to_numpy()
+    return FeatureStore(track_ids, features, cleaned.columns, meta)
@@ -0,0 +1,63 @@
+# ============================================
+# Cache Gambar Chart (PNG bytes, LRU dengan batas ukuran)
+# ============================================
+# Chart matplotlib/seaborn di-render sekali menjadi PNG lalu disimpan dengan
+# key = (fingerprint dataset, nama chart, parameter chart, tema). Tampilan
+# berikutnya langsung memakai bytes tersimpan tanpa menyentuh matplotlib.
+
+import io
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def figure_key(*parts):
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def render_png(fig, dpi=100):
+    import matplotlib.pyplot as plt
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buf.getvalue()
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.items.get(key)
+            if data is not None:
+                self.items.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self.lock:
+            if key in self.items:
+                self.size -= len(self.items.pop(key))
+            self.items[key] = data
+            self.size += len(data)
+            # Buang entri yang paling lama tidak dipakai sampai muat
+            while self.size > self.max_bytes and len(self.items) > 1:
+                _, old = self.items.popitem(last=False)
+                self.size -= len(old)
+
+    def get_or_render(self, key, render):
+        data = self.get(key)
+        if data is None:
+            with self.lock:
+                self.misses += 1
+            data = render()
+            self.put(key, data)
+        return data
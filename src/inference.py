@@ -0,0 +1,124 @@
+# ============================================
+# Artefak Inferensi Ringan (NumPy-only)
+# ============================================
+# Model linier (LinearRegression / Ridge / Lasso / ElasticNet) pada dasarnya
+# hanya dot product: prediksi = X @ coef + intercept. Artefak ini menyimpan
+# nama fitur, koefisien, intercept & metadata scaling ke satu file .npz
+# (tanpa pickle), sehingga dashboard & scoring service tidak perlu memuat
+# scikit-learn/joblib hanya untuk memprediksi.
+#
+#   feature_names       : urutan fitur saat training
+#   coef, intercept     : parameter model (float64)
+#   feature_min/max     : parameter MinMaxScaler fitur (untuk input mentah)
+#   target_min/max      : parameter MinMaxScaler target (prediksi -> skala asli)
+#   source_digest       : hash file .pkl asal (artefak basi terdeteksi)
+#
+# Dibuat oleh src/model.py; model non-linier (mis. random forest) tidak diekspor.
+# Sebelum disimpan, prediksinya dicek sama dengan model .pkl asal (check_parity).
+
+import os
+
+import numpy as np
+
+INFERENCE_VERSION = 1
+INFERENCE_PATH = "src/models/popularity_model.npz"
+PARITY_TOL = 1e-9
+
+
+class LinearPredictor:
+    def __init__(self, feature_names, coef, intercept, feature_min=None, feature_max=None,
+                 target_min=0.0, target_max=1.0, source_digest=""):
+        self.feature_names_in_ = np.asarray(feature_names, dtype=str)
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        n = len(self.feature_names_in_)
+        self.feature_min = np.zeros(n) if feature_min is None else np.asarray(feature_min, dtype=np.float64)
+        self.feature_max = np.ones(n) if feature_max is None else np.asarray(feature_max, dtype=np.float64)
+        self.target_min = float(target_min)
+        self.target_max = float(target_max)
+        self.source_digest = str(source_digest)
+        if self.coef_.shape != (n,):
+            raise ValueError(f"jumlah koefisien ({self.coef_.size}) tidak sama dengan jumlah fitur ({n})")
+
+    def _matrix(self, X):
+        # DataFrame: kolom diambil sesuai urutan training; array: dianggap sudah berurutan
+        if hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def predict(self, X):
+        # Satu matmul untuk seluruh batch (skala fitur & target sama dengan data bersih)
+        return self._matrix(X) @ self.coef_ + self.intercept_
+
+    def predict_raw(self, X):
+        # Input fitur mentah -> scaling -> prediksi dalam skala target asli
+        X = self._matrix(X)
+        span = self.feature_max - self.feature_min
+        span[span == 0] = 1.0
+        y = ((X - self.feature_min) / span) @ self.coef_ + self.intercept_
+        return y * ((self.target_max - self.target_min) or 1.0) + self.target_min
+
+    def save(self, path=INFERENCE_PATH):
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.int64(INFERENCE_VERSION),
+            feature_names=self.feature_names_in_,
+            coef=self.coef_,
+            intercept=np.float64(self.intercept_),
+            feature_min=self.feature_min,
+            feature_max=self.feature_max,
+            target_range=np.array([self.target_min, self.target_max]),
+            source_digest=np.str_(self.source_digest),
+        )
+        os.replace(tmp_path, path)
+        return path
+
+
+def export_linear(model, feature_names=None, preprocessor=None, target="track_popularity", source_digest=""):
+    # Konversi model linier sklearn -> LinearPredictor (ValueError jika bukan model linier)
+    coef = getattr(model, "coef_", None)
+    if coef is None or np.ndim(coef) != 1:
+        raise ValueError(f"{type(model).__name__} bukan model linier satu target, tidak bisa diekspor")
+    names = getattr(model, "feature_names_in_", None)
+    names = list(names) if names is not None else list(feature_names)
+
+    feature_min = feature_max = None
+    target_min, target_max = 0.0, 1.0
+    if preprocessor is not None:
+        pos = {col: i for i, col in enumerate(preprocessor.num_cols)}
+        if all(col in pos for col in names):
+            feature_min = preprocessor.data_min[[pos[col] for col in names]]
+            feature_max = preprocessor.data_max[[pos[col] for col in names]]
+        if target in pos:
+            target_min, target_max = preprocessor.data_min[pos[target]], preprocessor.data_max[pos[target]]
+    return LinearPredictor(names, coef, model.intercept_, feature_min, feature_max,
+                           target_min, target_max, source_digest)
+
+
+def check_parity(model, predictor, X=None, tol=PARITY_TOL, rows=1000, seed=0):
+    # Prediksi LinearPredictor vs model sklearn asal pada sampel X (skala data bersih);
+    # tanpa X dipakai sampel acak [0, 1]. ValueError jika max |selisih| > tol.
+    names = list(predictor.feature_names_in_)
+    if X is None:
+        import pandas as pd
+        X = pd.DataFrame(np.random.default_rng(seed).random((rows, len(names))), columns=names)
+    frame = X[names].iloc[:rows].astype(np.float64)
+    expected = np.asarray(model.predict(frame), dtype=np.float64)
+    max_abs = float(np.max(np.abs(predictor.predict(frame.to_numpy()) - expected)))
+    if not max_abs <= tol:
+        raise ValueError(f"prediksi artefak inferensi berbeda dari model .pkl (max |Δ| = {max_abs:.3e} > {tol:g})")
+    return max_abs
+
+
+def load_predictor(path=INFERENCE_PATH, source_digest=None):
+    # source_digest: jika diberikan, artefak harus berasal dari file model yang sama
+    with np.load(path, allow_pickle=False) as f:
+        if int(f["version"]) != INFERENCE_VERSION:
+            raise ValueError(f"versi artefak inferensi {path} tidak didukung, jalankan ulang src/model.py")
+        if source_digest is not None and str(f["source_digest"]) != source_digest:
+            raise ValueError(f"artefak inferensi {path} tidak sesuai dengan model .pkl saat ini")
+        target_min, target_max = f["target_range"]
+        return LinearPredictor(f["feature_names"], f["coef"], f["intercept"], f["feature_min"],
+                               f["feature_max"], target_min, target_max, str(f["source_digest"]))
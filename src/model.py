@@ -1,32 +1,82 @@
 # ============================================
 #  Model Training - Linear Regression (Top 5 Features)
 # ============================================
+# Top fitur & koefisien diambil dari sufficient statistics (XᵀX, src/suffstats.py).
+# Evaluasi memakai statistik 80% data (train) terhadap 20% sisanya (test);
+# model yang disimpan memakai statistik seluruh dataset.
 
-import pandas as pd
 import os
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-from joblib import dump
 import numpy as np
+import sys
+import json
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import load_table
+from src.suffstats import SufficientStats, load_suffstats
+from src.model_search import run_search, fit_winner, load_grid
+from src.registry import LEGACY_MODEL_PATH, save_model
+
+parser = argparse.ArgumentParser(description="Training model popularitas lagu")
+parser.add_argument("--search", action="store_true",
+                    help="Evaluasi grid model dengan k-fold CV paralel lalu simpan pemenangnya")
+parser.add_argument("--grid", help="File JSON berisi grid kandidat (default: DEFAULT_GRID)")
+parser.add_argument("--folds", type=int, default=5)
+parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: semua core)")
+parser.add_argument("--keep", type=int, default=5, help="Jumlah versi model yang disimpan di registry")
+args = parser.parse_args()
 
 # ============================================
 # 1. Load Dataset
 # ============================================
-df = pd.read_csv("data/spotify_cleaned.csv")
+df = load_table("data/spotify_cleaned.csv")
 
 # ============================================
 # 2. Tentukan Target
 # ============================================
 target = "track_popularity"
 
-# Hitung korelasi dan ambil 5 fitur paling berkorelasi (selain target)
-corr_matrix = df.corr()
-top_features = corr_matrix[target].abs().sort_values(ascending=False).index[1:6]  # Skip target itself
+# Korelasi & 5 fitur paling berkorelasi (selain target) diambil dari
+# sufficient statistics (data/suffstats.npz), tidak perlu scan ulang df.corr()
+suffstats = load_suffstats(df=df)
+if suffstats.appended:
+    # Statistik berisi batch --append yang tidak ada di df: fitur & koefisien akan
+    # berasal dari data yang berbeda dengan data evaluasi/search
+    sys.exit(f"❌ data/suffstats.npz berisi {suffstats.appended:,} baris hasil --append yang tidak ada di "
+             "data/spotify_cleaned.csv. Gunakan `python src/suffstats.py --refit` untuk model dari statistik, "
+             "atau bangun ulang statistik dengan `python src/suffstats.py`.")
+top_features = suffstats.top_features(target, k=5)
 
 print("\n✅ Top 5 fitur yang digunakan untuk model:")
 print(list(top_features))
 
+# ============================================
+# 2A. Mode Model Search (opsional)
+# ============================================
+if args.search:
+    ranked_features = suffstats.top_features(target, k=len(df.columns) - 1)
+    grid = load_grid(args.grid) if args.grid else None
+    report, wall_time = run_search(df, target, ranked_features, grid, args.folds, args.workers)
+
+    print(f"\n📊 Hasil {args.folds}-fold CV ({len(report)} kandidat, wall time {wall_time:.2f}s):")
+    for r in report:
+        print(f"{r['r2']:8.4f} ±{r['r2_std']:.4f}  MAE {r['mae']:.4f}  RMSE {r['rmse']:.4f}  "
+              f"wall {r['wall_seconds']:6.2f}s  cpu {r['cpu_seconds']:6.2f}s  {r['name']}")
+
+    best = report[0]
+    model = fit_winner(df, target, best)
+    model_path = LEGACY_MODEL_PATH
+    save_model(model, top_features, target,
+               {"model": best["name"], "r2": best["r2"], "mae": best["mae"], "rmse": best["rmse"]},
+               keep=args.keep, sample=df)
+    with open("src/models/model_search_report.json", "w", encoding="utf-8") as f:
+        json.dump({"folds": args.folds, "wall_seconds": wall_time, "candidates": report}, f, indent=2)
+
+    print(f"\n✅ Model terbaik ({best['name']}) disimpan di: {model_path}")
+    sys.exit(0)
+
 # ============================================
 # 3. Pisahkan Fitur & Target
 # ============================================
@@ -41,15 +91,17 @@ X_train, X_test, y_train, y_test = train_test_split(
 )
 
 # ============================================
-# 5. Train Model Linear Regression
+# 5. Least Squares dari Sufficient Statistics
 # ============================================
-model = LinearRegression()
-model.fit(X_train, y_train)
+# Model evaluasi: statistik baris train saja; model final: statistik seluruh dataset
+train_stats = SufficientStats.from_frame(df.loc[X_train.index], top_features + [target])
+holdout_model = train_stats.to_model(top_features, target)
+model = suffstats.to_model(top_features, target)
 
 # ============================================
 # 6. Evaluasi Model
 # ============================================
-y_pred = model.predict(X_test)
+y_pred = holdout_model.predict(X_test)
 
 r2 = r2_score(y_test, y_pred)
 mae = mean_absolute_error(y_test, y_pred)
@@ -65,7 +117,6 @@ print(f"RMSE     : {rmse:.4f}")
 # ============================================
 # 7. Simpan Model ke Folder src/models/
 # ============================================
-model_path = "src/models/popularity_model.pkl"
-dump(model, model_path)
-
-print(f"\n✅ Model berhasil disimpan di: {model_path}")
+save_model(model, top_features, target,
+           {"model": "LinearRegression", "r2": float(r2), "mae": float(mae), "rmse": float(rmse)},
+           keep=args.keep, sample=df)
@@ -0,0 +1,177 @@
+# ============================================
+# Model Search Paralel + K-Fold Cross Validation
+# ============================================
+# Mengevaluasi grid kandidat (model x hyperparameter x subset fitur) dengan
+# k-fold CV di process pool. Matriks fitur ditaruh sekali di shared memory;
+# worker hanya memetakan buffer yang sama (read-only), tanpa menyalin data.
+#
+# Dipanggil dari:  python src/model.py --search [--grid grid.json] [--folds 5] [--workers N]
+
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.model_selection import KFold
+from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+
+from src.storage import IDENTIFIER_COLS
+
+# Grid default. "features": "topK" (K fitur dengan korelasi tertinggi), "all" (keduanya tanpa
+# IDENTIFIER_COLS), atau list nama kolom (dipakai apa adanya)
+DEFAULT_GRID = [
+    {"model": "linear", "params": {}, "features": "top5"},
+    {"model": "linear", "params": {}, "features": "top10"},
+    {"model": "ridge", "params": {"alpha": 0.1}, "features": "top10"},
+    {"model": "ridge", "params": {"alpha": 1.0}, "features": "all"},
+    {"model": "lasso", "params": {"alpha": 0.0005}, "features": "all"},
+    {"model": "elasticnet", "params": {"alpha": 0.001, "l1_ratio": 0.5}, "features": "all"},
+    {"model": "random_forest", "params": {"n_estimators": 200, "max_depth": 12, "min_samples_leaf": 5}, "features": "top10"},
+    {"model": "random_forest", "params": {"n_estimators": 200, "max_depth": 16, "min_samples_leaf": 3}, "features": "all"},
+    {"model": "hist_gradient_boosting", "params": {"max_iter": 300, "learning_rate": 0.05}, "features": "top10"},
+    {"model": "hist_gradient_boosting", "params": {"max_iter": 300, "learning_rate": 0.05}, "features": "all"},
+]
+
+
+def make_model(name, params):
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+    from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor, GradientBoostingRegressor
+    models = {
+        "linear": LinearRegression,
+        "ridge": Ridge,
+        "lasso": Lasso,
+        "elasticnet": ElasticNet,
+        "random_forest": RandomForestRegressor,
+        "gradient_boosting": GradientBoostingRegressor,
+        "hist_gradient_boosting": HistGradientBoostingRegressor,
+    }
+    if name not in models:
+        raise ValueError(f"model tidak dikenal: {name}")
+    params = dict(params)
+    # Paralelisme sudah di level proses; tiap model cukup 1 core
+    if name == "random_forest":
+        params.setdefault("n_jobs", 1)
+    if name in ("random_forest", "gradient_boosting", "hist_gradient_boosting"):
+        params.setdefault("random_state", 42)
+    return models[name](**params)
+
+
+def resolve_features(spec, ranked_features, all_features):
+    if spec == "all":
+        return [f for f in all_features if f not in IDENTIFIER_COLS]
+    if isinstance(spec, str) and spec.startswith("top"):
+        return [f for f in ranked_features if f not in IDENTIFIER_COLS][:int(spec[3:])]
+    return list(spec)
+
+
+# ---------------------------
+# Shared memory (sisi worker)
+# ---------------------------
+_shared = {}
+
+
+def _attach(x_name, x_shape, y_name, y_len):
+    x_shm = shared_memory.SharedMemory(name=x_name)
+    y_shm = shared_memory.SharedMemory(name=y_name)
+    X = np.ndarray(x_shape, dtype=np.float64, buffer=x_shm.buf)
+    y = np.ndarray((y_len,), dtype=np.float64, buffer=y_shm.buf)
+    X.flags.writeable = False
+    y.flags.writeable = False
+    _shared.update(x_shm=x_shm, y_shm=y_shm, X=X, y=y)
+
+
+def _run_fold(candidate, col_idx, fold, n_folds, seed):
+    X, y = _shared["X"], _shared["y"]
+    train_idx, test_idx = list(KFold(n_folds, shuffle=True, random_state=seed).split(X))[fold]
+    started = time.time()
+    start = time.perf_counter()
+    model = make_model(candidate["model"], candidate["params"])
+    model.fit(X[np.ix_(train_idx, col_idx)], y[train_idx])
+    y_pred = model.predict(X[np.ix_(test_idx, col_idx)])
+    elapsed = time.perf_counter() - start
+    return {
+        "r2": r2_score(y[test_idx], y_pred),
+        "mae": mean_absolute_error(y[test_idx], y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y[test_idx], y_pred))),
+        "seconds": elapsed,
+        "started": started,
+        "finished": started + elapsed,
+    }
+
+
+def _shared_array(values):
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    return shm
+
+
+def run_search(df, target, ranked_features, grid=None, n_folds=5, workers=None, seed=42):
+    grid = DEFAULT_GRID if grid is None else grid
+    all_features = [c for c in df.columns if c != target]
+    X = np.ascontiguousarray(df[all_features].to_numpy(dtype=np.float64))
+    y = np.ascontiguousarray(df[target].to_numpy(dtype=np.float64))
+
+    candidates = []
+    for spec in grid:
+        features = resolve_features(spec.get("features", "top5"), ranked_features, all_features)
+        name = spec.get("name") or f"{spec['model']}{json.dumps(spec.get('params', {}), sort_keys=True)}[{spec.get('features', 'top5')}]"
+        candidates.append({
+            "name": name, "model": spec["model"], "params": spec.get("params", {}),
+            "features": features, "col_idx": [all_features.index(f) for f in features],
+        })
+
+    x_shm, y_shm = _shared_array(X), _shared_array(y)
+    results = {c["name"]: [] for c in candidates}
+    wall_start = time.perf_counter()
+    try:
+        # model.py adalah script top-level: pakai fork jika tersedia supaya worker
+        # tidak menjalankan ulang script saat import __main__
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context,
+                                 initializer=_attach,
+                                 initargs=(x_shm.name, X.shape, y_shm.name, len(y))) as pool:
+            futures = {
+                pool.submit(_run_fold, c, c["col_idx"], fold, n_folds, seed): c["name"]
+                for c in candidates for fold in range(n_folds)
+            }
+            for future in as_completed(futures):
+                results[futures[future]].append(future.result())
+    finally:
+        x_shm.close()
+        x_shm.unlink()
+        y_shm.close()
+        y_shm.unlink()
+    wall_time = time.perf_counter() - wall_start
+
+    report = []
+    for c in candidates:
+        folds = results[c["name"]]
+        report.append({
+            "name": c["name"], "model": c["model"], "params": c["params"], "features": c["features"],
+            "r2": float(np.mean([f["r2"] for f in folds])),
+            "r2_std": float(np.std([f["r2"] for f in folds])),
+            "mae": float(np.mean([f["mae"] for f in folds])),
+            "rmse": float(np.mean([f["rmse"] for f in folds])),
+            # cpu_seconds: jumlah waktu fit semua fold; wall_seconds: fold pertama mulai
+            # s.d. fold terakhir selesai (lebih kecil dari cpu_seconds jika fold berjalan paralel)
+            "cpu_seconds": float(sum(f["seconds"] for f in folds)),
+            "wall_seconds": float(max(f["finished"] for f in folds) - min(f["started"] for f in folds)),
+        })
+    report.sort(key=lambda r: r["r2"], reverse=True)
+    return report, wall_time
+
+
+def fit_winner(df, target, best):
+    # Fit ulang pemenang di seluruh data (DataFrame -> feature_names_in_ tersimpan di model)
+    model = make_model(best["model"], best["params"])
+    model.fit(df[best["features"]], df[target])
+    return model
+
+
+def load_grid(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
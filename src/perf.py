@@ -0,0 +1,156 @@
+# ============================================
+# Instrumentasi Performa (Timer, Counter Cache, RSS)
+# ============================================
+# Recorder ringan yang dipakai bersama oleh semua sesi dashboard dalam satu
+# proses: timer per blok hot-path, counter hit/miss cache, dan RSS proses.
+# Snapshot bisa diekspor sebagai JSON atau teks Prometheus (format textfile
+# collector), jadi bisa di-scrape oleh monitoring tanpa endpoint tambahan.
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def rss_bytes():
+    # RSS proses saat ini (Linux); fallback ke puncak RSS dari getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _TimerStats:
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = np.fromiter(self.recent, dtype=np.float64)
+        p50, p95 = np.percentile(recent, [50, 95]) if len(recent) else (0.0, 0.0)
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "p50_s": float(p50),
+            "p95_s": float(p95),
+            "max_s": self.max,
+            "last_s": self.last,
+        }
+
+
+class PerfRecorder:
+    def __init__(self, window=256):
+        self.window = window
+        self.timers = {}
+        self.cache = {}
+        self.rss_last = rss_bytes()
+        self.rss_delta = 0
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self.lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = _TimerStats(self.window)
+            stats.add(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def cache_event(self, name, hit):
+        with self.lock:
+            counts = self.cache.setdefault(name, {"hit": 0, "miss": 0})
+            counts["hit" if hit else "miss"] += 1
+
+    def begin_run(self):
+        return time.perf_counter(), rss_bytes()
+
+    def end_run(self, token, name="rerun"):
+        # Durasi & delta RSS satu rerun (token dari begin_run)
+        start, rss_start = token
+        self.record(name, time.perf_counter() - start)
+        rss = rss_bytes()
+        with self.lock:
+            self.rss_delta = rss - rss_start
+            self.rss_last = rss
+        return self.rss_delta
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "uptime_s": time.time() - self.started_at,
+                "rss_bytes": self.rss_last,
+                "rss_delta_bytes": self.rss_delta,
+                "timers": {name: stats.summary() for name, stats in sorted(self.timers.items())},
+                "cache": {name: dict(counts) for name, counts in sorted(self.cache.items())},
+            }
+
+    def to_json(self, extra=None):
+        snap = self.snapshot()
+        if extra:
+            snap.update(extra)
+        return json.dumps(snap, indent=2)
+
+    def to_prometheus(self, prefix="spotify_dashboard", extra_cache=None):
+        snap = self.snapshot()
+        cache = dict(snap["cache"])
+        cache.update(extra_cache or {})
+        lines = [
+            f"# HELP {prefix}_rss_bytes Resident set size proses.",
+            f"# TYPE {prefix}_rss_bytes gauge",
+            f"{prefix}_rss_bytes {snap['rss_bytes']}",
+            f"# HELP {prefix}_rss_delta_bytes Perubahan RSS pada rerun terakhir.",
+            f"# TYPE {prefix}_rss_delta_bytes gauge",
+            f"{prefix}_rss_delta_bytes {snap['rss_delta_bytes']}",
+            f"# HELP {prefix}_timer_seconds Durasi blok hot-path (jendela terakhir).",
+            f"# TYPE {prefix}_timer_seconds summary",
+        ]
+        for name, t in snap["timers"].items():
+            label = _label(name)
+            lines.append(f'{prefix}_timer_seconds{{name="{label}",quantile="0.5"}} {t["p50_s"]:.6f}')
+            lines.append(f'{prefix}_timer_seconds{{name="{label}",quantile="0.95"}} {t["p95_s"]:.6f}')
+            lines.append(f'{prefix}_timer_seconds_sum{{name="{label}"}} {t["total_s"]:.6f}')
+            lines.append(f'{prefix}_timer_seconds_count{{name="{label}"}} {t["count"]}')
+        lines.append(f"# HELP {prefix}_cache_requests_total Request cache per hasil (hit/miss).")
+        lines.append(f"# TYPE {prefix}_cache_requests_total counter")
+        for name, counts in sorted(cache.items()):
+            for result in ("hit", "miss"):
+                lines.append(f'{prefix}_cache_requests_total{{cache="{_label(name)}",result="{result}"}} {counts[result]}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, **kwargs):
+        # Tulis atomik supaya collector tidak membaca file setengah jadi
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(**kwargs))
+        os.replace(tmp_path, path)
+        return path
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
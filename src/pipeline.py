@@ -0,0 +1,283 @@
+# ============================================
+# Pipeline Runner Inkremental (DAG + Content Hash)
+# ============================================
+# Menjalankan script pipeline (cleaning -> statistik -> model / laporan EDA)
+# sebagai DAG. Setiap stage mendeklarasikan file input & output; urutan
+# eksekusi diturunkan dari file yang dihasilkan stage lain.
+#
+# Stage dilewati jika hash isi semua input (termasuk kode script-nya),
+# perintahnya, dan hash output-nya sama dengan run terakhir yang berhasil.
+# Hash disimpan di data/.pipeline_state.json bersama ukuran & mtime file:
+# file yang ukuran & mtime-nya tidak berubah tidak di-hash ulang, jadi
+# rebuild tanpa perubahan hanya butuh stat() per file.
+# Stage yang tidak saling bergantung (mis. model & laporan EDA) berjalan
+# bersamaan di proses terpisah.
+#
+#   python src/pipeline.py                  # jalankan semua stage yang kedaluwarsa
+#   python src/pipeline.py model            # hanya stage model (+ upstream-nya)
+#   python src/pipeline.py --dry-run        # tampilkan stage yang akan dijalankan
+#   python src/pipeline.py --force clean    # paksa jalankan ulang (+ downstream)
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+STATE_PATH = "data/.pipeline_state.json"
+LOG_DIR = "data/pipeline_logs"
+CLEANED = ["data/spotify_cleaned.csv", "data/spotify_cleaned.arrow"]
+ORIGINAL = ["data/spotify_cleaned_original.csv", "data/spotify_cleaned_original.arrow"]
+
+
+class Stage:
+    def __init__(self, name, args, inputs, outputs):
+        self.name = name
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def command(self):
+        return [sys.executable] + self.args
+
+
+STAGES = [
+    Stage("clean", ["src/cleaning.py"],
+          ["data/spotify_songs.csv", "src/cleaning.py", "src/cleaner.py", "src/streaming.py",
+           "src/preprocess.py", "src/storage.py"],
+          CLEANED + ORIGINAL + ["data/spotify_songs.arrow", "src/models/preprocessing.joblib"]),
+    Stage("suffstats", ["src/suffstats.py"],
+          CLEANED + ["src/suffstats.py", "src/storage.py"],
+          ["data/suffstats.npz"]),
+    Stage("stats", ["src/stats.py"],
+          CLEANED + ["data/spotify_songs.csv", "data/spotify_songs.arrow", "src/stats.py", "src/storage.py"],
+          ["data/spotify_stats.json"]),
+    Stage("trends", ["src/trends.py"],
+          ORIGINAL + ["data/spotify_songs.csv", "data/spotify_songs.arrow", "src/trends.py", "src/storage.py"],
+          ["data/spotify_trends.npz"]),
+    Stage("model", ["src/model.py"],
+          CLEANED + ["data/suffstats.npz", "src/models/preprocessing.joblib", "src/model.py",
+                     "src/model_search.py", "src/suffstats.py", "src/inference.py", "src/preprocess.py",
+                     "src/registry.py", "src/storage.py"],
+          ["src/models/popularity_model.pkl", "src/models/popularity_model.npz"]),
+    Stage("eda_report", ["src/eda.py", "--report", "data/reports/eda"],
+          CLEANED + ORIGINAL + ["data/suffstats.npz", "src/eda.py", "src/report.py", "src/binning.py",
+                                "src/figcache.py"],
+          ["data/reports/eda/index.html", "data/reports/eda/report.json"]),
+]
+
+
+# ============================================
+# Fingerprint file (content hash + cache stat)
+# ============================================
+class Hasher:
+    def __init__(self, cache=None):
+        self.cache = dict(cache or {})
+        self.lock = threading.Lock()
+
+    def digest(self, path):
+        # None jika file tidak ada; hash ulang hanya jika ukuran/mtime berubah
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            cached = self.cache.get(path)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["digest"]
+        # src.storage (pandas/pyarrow) baru diimpor jika ada file yang perlu di-hash
+        from src.storage import file_digest
+        digest = file_digest(path)
+        with self.lock:
+            self.cache[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}
+        return digest
+
+    def digests(self, paths):
+        return {path: self.digest(path) for path in paths}
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"stages": {}, "files": {}}
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# ============================================
+# DAG
+# ============================================
+def build_graph(stages):
+    producer = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producer:
+                raise ValueError(f"{path} dihasilkan oleh dua stage: {producer[path]} & {stage.name}")
+            producer[path] = stage.name
+    upstream = {stage.name: {producer[p] for p in stage.inputs if p in producer} - {stage.name} for stage in stages}
+    # Validasi siklus (DFS)
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"siklus di pipeline melibatkan stage {name}")
+        visiting.add(name)
+        for dep in upstream[name]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in upstream:
+        visit(name)
+    return upstream
+
+
+def select(stages, upstream, targets):
+    # Target + semua upstream-nya (urutan deklarasi dipertahankan)
+    if not targets:
+        return [s.name for s in stages]
+    unknown = set(targets) - set(upstream)
+    if unknown:
+        raise ValueError(f"stage tidak dikenal: {', '.join(sorted(unknown))} (pilihan: {', '.join(upstream)})")
+    wanted, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(upstream[name])
+    return [s.name for s in stages if s.name in wanted]
+
+
+def is_fresh(stage, record, hasher):
+    if record is None or record.get("command") != stage.args:
+        return False
+    if hasher.digests(stage.inputs) != record["inputs"]:
+        return False
+    outputs = hasher.digests(stage.outputs)
+    return None not in outputs.values() and outputs == record["outputs"]
+
+
+# ============================================
+# Eksekusi
+# ============================================
+def run_stage(stage, log_dir=LOG_DIR):
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{stage.name}.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(stage.command(), cwd=ROOT, stdout=log, stderr=subprocess.STDOUT,
+                              env={**os.environ, "PYTHONIOENCODING": "utf-8"})
+    return proc.returncode, time.perf_counter() - start, log_path
+
+
+def run_pipeline(stages=STAGES, targets=None, force=(), workers=None, dry_run=False, state_path=STATE_PATH):
+    by_name = {s.name: s for s in stages}
+    upstream = build_graph(stages)
+    names = select(stages, upstream, targets)
+    state = load_state(state_path)
+    hasher = Hasher(state.get("files"))
+
+    status = {}      # name -> "skipped" | "ran" | "failed" | "blocked"
+    seconds = {}
+    # Stage yang dipaksa ikut memaksa semua downstream-nya
+    forced = set(force)
+    grew = True
+    while grew:
+        downstream = {name for name, deps in upstream.items() if deps & forced}
+        grew = not downstream <= forced
+        forced |= downstream
+    pending = list(names)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = upstream[name] & set(names)
+                if any(status.get(d) in ("failed", "blocked") for d in deps):
+                    status[name] = "blocked"
+                    pending.remove(name)
+                    continue
+                if not all(d in status for d in deps):
+                    continue
+                pending.remove(name)
+                stage = by_name[name]
+                # Stage dijalankan jika dipaksa atau fingerprint berubah. Upstream yang dijalankan ulang
+                # tapi menghasilkan output identik tidak memicu stage ini (hash isi, bukan mtime).
+                # Saat dry run output upstream belum berubah, jadi downstream-nya dianggap ikut jalan.
+                stale = (name in forced or (dry_run and any(status[d] == "ran" for d in deps))
+                         or not is_fresh(stage, state["stages"].get(name), hasher))
+                if not stale:
+                    status[name] = "skipped"
+                    continue
+                if dry_run:
+                    status[name] = "ran"
+                    continue
+                inputs = hasher.digests(stage.inputs)
+                print(f"▶ {name}: {' '.join(stage.args)}", flush=True)
+                running[pool.submit(run_stage, stage)] = (name, inputs)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, inputs = running.pop(future)
+                code, elapsed, log_path = future.result()
+                seconds[name] = elapsed
+                if code == 0:
+                    status[name] = "ran"
+                    state["stages"][name] = {
+                        "command": by_name[name].args,
+                        "inputs": inputs,
+                        "outputs": hasher.digests(by_name[name].outputs),
+                        "seconds": elapsed,
+                        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    }
+                    print(f"✅ {name} selesai dalam {elapsed:.2f}s (log: {log_path})", flush=True)
+                else:
+                    status[name] = "failed"
+                    state["stages"].pop(name, None)
+                    print(f"❌ {name} gagal (exit {code}), lihat {log_path}", flush=True)
+                # Simpan setelah setiap stage supaya run yang terputus tidak mengulang stage yang sudah selesai
+                state["files"] = hasher.cache
+                save_state(state, state_path)
+
+    if not dry_run:
+        state["files"] = hasher.cache
+        save_state(state, state_path)
+    return {name: status[name] for name in names}, seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline runner inkremental: cleaning -> statistik -> model & EDA")
+    parser.add_argument("stages", nargs="*", help=f"Stage target (default: semua): {', '.join(s.name for s in STAGES)}")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="Paksa jalankan ulang stage ini (+ downstream); bisa diulang")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah stage bersamaan (default: semua core)")
+    parser.add_argument("--dry-run", action="store_true", help="Tampilkan stage yang akan dijalankan saja")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    status, seconds = run_pipeline(targets=args.stages, force=args.force, workers=args.workers, dry_run=args.dry_run)
+    label = {"ran": "akan dijalankan" if args.dry_run else "dijalankan",
+             "skipped": "terbaru (dilewati)", "failed": "GAGAL", "blocked": "tidak dijalankan (upstream gagal)"}
+    print()
+    for name, result in status.items():
+        extra = f" {seconds[name]:.2f}s" if name in seconds else ""
+        print(f"{name:<12} {label[result]}{extra}")
+    print(f"\nTotal {time.perf_counter() - start:.2f}s")
+    sys.exit(1 if "failed" in status.values() else 0)
@@ -0,0 +1,152 @@
+# ============================================
+# Artefak Preprocessing (Fill, Outlier, Scaling, Encoding)
+# ============================================
+# Parameter yang di-fit saat cleaning disimpan di samping model
+# (src/models/preprocessing.joblib) supaya lagu baru bisa ditransformasi ke
+# skala yang sama dengan data training tanpa meng-clean ulang seluruh dataset:
+#   fills       : median (numerik) & modus (kategori)
+#   lower/upper : batas outlier per kolom numerik
+#   data_min/max: parameter MinMaxScaler
+#   vocab       : kosakata terurut per kolom kategori (sama dengan LabelEncoder.classes_)
+# Transformasi berjalan per kolom secara vectorized, O(rows).
+#
+#   python src/preprocess.py lagu_baru.csv [--out prediksi.csv]   # skor lagu mentah dengan model
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PREPROCESS_VERSION = 1
+PREPROCESS_PATH = "src/models/preprocessing.joblib"
+
+
+class Preprocessor:
+    def __init__(self, columns, num_cols, cat_cols, fills, lower, upper, data_min, data_max, vocab,
+                 strategy="iqr", source_fingerprint=None):
+        self.version = PREPROCESS_VERSION
+        self.columns = list(columns)
+        self.num_cols = list(num_cols)
+        self.cat_cols = list(cat_cols)
+        self.fills = dict(fills)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_max = np.asarray(data_max, dtype=np.float64)
+        self.vocab = {col: np.asarray(values, dtype=object) for col, values in vocab.items()}
+        self.strategy = strategy
+        self.source_fingerprint = source_fingerprint
+        self._lookup = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lookup"] = {}
+        return state
+
+    def _num_idx(self, df):
+        return [i for i, col in enumerate(self.num_cols) if col in df.columns]
+
+    def fill(self, df):
+        fills = {col: value for col, value in self.fills.items() if col in df.columns}
+        return df.fillna(fills)
+
+    def inlier_mask(self, df):
+        idx = self._num_idx(df)
+        X = df[[self.num_cols[i] for i in idx]].to_numpy(dtype=np.float64)
+        return ((X >= self.lower[idx]) & (X <= self.upper[idx])).all(axis=1)
+
+    def scale(self, df):
+        idx = self._num_idx(df)
+        cols = [self.num_cols[i] for i in idx]
+        span = self.data_max[idx] - self.data_min[idx]
+        # Sama seperti MinMaxScaler: rentang nol diperlakukan sebagai 1
+        span[span == 0] = 1.0
+        df = df.copy()
+        df[cols] = (df[cols].to_numpy(dtype=np.float64) - self.data_min[idx]) / span
+        return df
+
+    def encode(self, df, unknown="position"):
+        # unknown="position": kategori baru diberi posisi sisipnya di kosakata terurut
+        # (dekat dengan nilai tetangga, mis. tanggal rilis baru), "error": raise ValueError
+        df = df.copy()
+        for col in self.cat_cols:
+            if col not in df.columns:
+                continue
+            vocab = self.vocab[col]
+            if col not in self._lookup:
+                self._lookup[col] = pd.Index(vocab)
+            values = df[col].astype(str).to_numpy(dtype=object)
+            codes = self._lookup[col].get_indexer(values)
+            missing = codes < 0
+            if missing.any():
+                if unknown == "error":
+                    raise ValueError(f"kategori tidak dikenal di kolom {col}: {values[missing][:5].tolist()}")
+                codes[missing] = np.minimum(np.searchsorted(vocab, values[missing]), len(vocab) - 1)
+            df[col] = codes.astype(np.int64)
+        return df
+
+    def transform(self, df, drop_outliers=False, encode=True, unknown="position"):
+        df = self.fill(df)
+        if drop_outliers:
+            df = df[self.inlier_mask(df)]
+        df = self.scale(df)
+        if encode:
+            df = self.encode(df, unknown)
+        return df[[c for c in self.columns if c in df.columns]]
+
+    def transform_one(self, row, **kwargs):
+        return self.transform(pd.DataFrame([row]), **kwargs).iloc[0]
+
+    def save(self, path=PREPROCESS_PATH):
+        from joblib import dump
+        tmp_path = path + ".tmp"
+        dump(self, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=PREPROCESS_PATH):
+        from joblib import load
+        pre = load(path)
+        if getattr(pre, "version", None) != PREPROCESS_VERSION:
+            raise ValueError(f"versi artefak preprocessing {path} tidak didukung, jalankan ulang src/cleaning.py")
+        return pre
+
+
+if __name__ == "__main__":
+    from joblib import load
+    from src.registry import active_paths
+
+    parser = argparse.ArgumentParser(description="Skor lagu mentah (skema spotify_songs.csv) tanpa cleaning ulang")
+    parser.add_argument("csv", help="CSV lagu baru")
+    parser.add_argument("--model-path", help="Path .pkl (default: versi aktif di registry, src/registry.py)")
+    parser.add_argument("--preprocess-path", default=PREPROCESS_PATH)
+    parser.add_argument("--out", help="Simpan hasil prediksi ke CSV")
+    args = parser.parse_args()
+
+    pre = Preprocessor.load(args.preprocess_path)
+    model_path = args.model_path or active_paths()[0]
+    model = load(model_path)
+    # Tanpa nama fitur urutan input model tidak diketahui: jangan menebak dari semua kolom numerik
+    if getattr(model, "feature_names_in_", None) is None:
+        sys.exit(f"❌ Model {model_path} tidak menyimpan nama fitur (feature_names_in_); "
+                 "latih ulang dengan src/model.py")
+    cols = [str(c) for c in model.feature_names_in_]
+    raw = pd.read_csv(args.csv)
+    features = pre.transform(raw)
+    missing = [c for c in cols if c not in features.columns]
+    if missing:
+        sys.exit(f"❌ Fitur model tidak dihasilkan preprocessing: {', '.join(missing)}")
+    X = features[cols]
+    result = raw[[c for c in ("track_id", "track_name", "track_artist") if c in raw.columns]].copy()
+    result["predicted_popularity"] = np.asarray(model.predict(X)) * 100
+    result["outlier"] = ~pre.inlier_mask(pre.fill(raw))
+
+    if args.out:
+        result.to_csv(args.out, index=False)
+        print(f"✅ {len(result):,} prediksi disimpan di: {args.out}")
+    else:
+        print(result.to_string(index=False))
@@ -0,0 +1,178 @@
+# ============================================
+# Registry Versi Model (Publish Atomik + Pointer)
+# ============================================
+# Setiap model hasil training dipublikasikan sebagai versi immutable:
+#   src/models/versions/<versi>/popularity_model.pkl   model sklearn (joblib)
+#   src/models/versions/<versi>/popularity_model.npz   artefak NumPy-only (jika ada)
+#   src/models/versions/<versi>/meta.json              metrik, fitur, digest, waktu
+#   src/models/current.json                            pointer ke versi yang dilayani
+#
+# Versi ditulis lengkap di folder sementara lalu di-rename (os.replace) ke
+# namanya; pointer ditulis ke file sementara lalu di-rename juga. Pembaca yang
+# mengikuti pointer selalu melihat versi yang utuh: file di folder versi tidak
+# pernah diubah setelah dipublikasikan.
+# Tanpa pointer (belum pernah publish) dipakai path lama src/models/popularity_model.pkl.
+# save_model() adalah satu-satunya jalur penyimpanan model (src/model.py & src/suffstats.py --refit).
+
+import os
+import json
+import time
+import shutil
+
+from src.storage import file_digest
+
+MODELS_DIR = "src/models"
+VERSIONS_DIR = os.path.join(MODELS_DIR, "versions")
+POINTER_PATH = os.path.join(MODELS_DIR, "current.json")
+MODEL_FILE = "popularity_model.pkl"
+INFERENCE_FILE = "popularity_model.npz"
+LEGACY_MODEL_PATH = os.path.join(MODELS_DIR, MODEL_FILE)
+LEGACY_INFERENCE_PATH = os.path.join(MODELS_DIR, INFERENCE_FILE)
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _copy_synced(src, dst):
+    shutil.copyfile(src, dst)
+    with open(dst, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def publish(model_path, inference_path=None, info=None, versions_dir=VERSIONS_DIR, pointer_path=POINTER_PATH,
+            activate=True):
+    # Salin artefak ke versi baru (folder sementara -> rename), lalu arahkan pointer ke versi itu
+    digest = file_digest(model_path)
+    pointer = current(pointer_path)
+    if activate and pointer and pointer["digest"] == digest \
+            and os.path.exists(os.path.join(versions_dir, pointer["version"], MODEL_FILE)):
+        # Model identik dengan versi aktif: tidak perlu versi baru
+        return pointer["version"]
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:8]}"
+    os.makedirs(versions_dir, exist_ok=True)
+    final_dir = os.path.join(versions_dir, version)
+    tmp_dir = os.path.join(versions_dir, f".tmp-{version}-{os.getpid()}")
+    os.makedirs(tmp_dir)
+    try:
+        _copy_synced(model_path, os.path.join(tmp_dir, MODEL_FILE))
+        if inference_path and os.path.exists(inference_path):
+            _copy_synced(inference_path, os.path.join(tmp_dir, INFERENCE_FILE))
+        meta = {"version": version, "digest": digest, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **(info or {})}
+        _write_json(os.path.join(tmp_dir, "meta.json"), meta)
+        if os.path.exists(final_dir):
+            # Model identik dipublikasikan ulang di detik yang sama: pakai versi yang sudah ada
+            shutil.rmtree(tmp_dir)
+        else:
+            os.replace(tmp_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    if activate:
+        set_current(version, versions_dir, pointer_path)
+    return version
+
+
+def save_model(model, features, target="track_popularity", info=None, model_path=LEGACY_MODEL_PATH,
+               inference_path=LEGACY_INFERENCE_PATH, keep=5, sample=None):
+    # Simpan model hasil training & publikasikan sebagai versi aktif:
+    # .pkl ditulis ke file sementara lalu di-rename (tidak pernah terbaca setengah jadi),
+    # artefak NumPy-only diekspor jika modelnya linier, lalu versi lama dipangkas.
+    # Artefak NumPy-only dicek parity-nya dengan model pada `sample` (DataFrame data bersih)
+    # sebelum apa pun ditulis: jika berbeda, ValueError dan tidak ada versi yang dipublikasikan.
+    # Dipakai src/model.py & src/suffstats.py --refit. Mengembalikan id versi.
+    from joblib import dump
+    from src.inference import check_parity, export_linear
+    from src.preprocess import PREPROCESS_PATH, Preprocessor
+
+    preprocessor = Preprocessor.load() if os.path.exists(PREPROCESS_PATH) else None
+    try:
+        predictor = export_linear(model, features, preprocessor, target)
+    except ValueError as e:
+        print(f"ℹ️ Artefak inferensi tidak dibuat: {e}")
+        predictor = None
+    else:
+        max_abs = check_parity(model, predictor, sample)
+
+    tmp_path = model_path + ".tmp"
+    dump(model, tmp_path)
+    os.replace(tmp_path, model_path)
+    print(f"\n✅ Model berhasil disimpan di: {model_path}")
+
+    if predictor is None:
+        if os.path.exists(inference_path):
+            os.remove(inference_path)
+        inference_path = None
+    else:
+        predictor.source_digest = file_digest(model_path)
+        predictor.save(inference_path)
+        print(f"✅ Artefak inferensi (NumPy-only) disimpan di: {inference_path} (parity max |Δ| = {max_abs:.1e})")
+
+    names = getattr(model, "feature_names_in_", None)
+    names = list(names) if names is not None else list(features)
+    version = publish(model_path, inference_path, {"features": [str(c) for c in names], **(info or {})})
+    removed = prune(keep)
+    print(f"✅ Versi model {version} dipublikasikan & aktif"
+          + (f" ({len(removed)} versi lama dihapus)" if removed else ""))
+    return version
+
+
+def set_current(version, versions_dir=VERSIONS_DIR, pointer_path=POINTER_PATH):
+    # Ganti versi yang dilayani (juga untuk rollback ke versi lama)
+    version_dir = os.path.join(versions_dir, version)
+    if not os.path.exists(os.path.join(version_dir, MODEL_FILE)):
+        raise ValueError(f"versi model tidak ditemukan: {version}")
+    with open(os.path.join(version_dir, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    _write_json(pointer_path, {"version": version, "digest": meta["digest"],
+                               "activated_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+    return version
+
+
+def current(pointer_path=POINTER_PATH):
+    try:
+        with open(pointer_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def active_paths(versions_dir=VERSIONS_DIR, pointer_path=POINTER_PATH):
+    # (path .pkl, path .npz, versi) yang sedang dilayani; versi None = path lama tanpa registry
+    pointer = current(pointer_path)
+    if pointer is None:
+        return LEGACY_MODEL_PATH, LEGACY_INFERENCE_PATH, None
+    version_dir = os.path.join(versions_dir, pointer["version"])
+    return os.path.join(version_dir, MODEL_FILE), os.path.join(version_dir, INFERENCE_FILE), pointer["version"]
+
+
+def list_versions(versions_dir=VERSIONS_DIR):
+    # Metadata semua versi, terbaru lebih dulu (folder sementara diabaikan)
+    versions = []
+    if not os.path.isdir(versions_dir):
+        return versions
+    for name in os.listdir(versions_dir):
+        meta_path = os.path.join(versions_dir, name, "meta.json")
+        if name.startswith(".") or not os.path.exists(meta_path):
+            continue
+        with open(meta_path, encoding="utf-8") as f:
+            versions.append(json.load(f))
+    return sorted(versions, key=lambda m: m["version"], reverse=True)
+
+
+def prune(keep=5, versions_dir=VERSIONS_DIR, pointer_path=POINTER_PATH):
+    # Hapus versi lama, kecuali `keep` versi terbaru & versi yang sedang aktif
+    pointer = current(pointer_path)
+    active = pointer["version"] if pointer else None
+    removed = []
+    for meta in list_versions(versions_dir)[keep:]:
+        if meta["version"] != active:
+            shutil.rmtree(os.path.join(versions_dir, meta["version"]), ignore_errors=True)
+            removed.append(meta["version"])
+    return removed
@@ -0,0 +1,274 @@
+# ============================================
+# Laporan EDA Headless (Render Paralel)
+# ============================================
+# Semua figure EDA (src/eda.py) di-render tanpa layar (backend Agg) menjadi PNG
+# di satu folder laporan:
+#   <out>/index.html   halaman laporan (tanpa aset eksternal, gambar relatif)
+#   <out>/*.png        satu file per figure
+#   <out>/report.json  fingerprint dataset, key & waktu render per figure
+#
+# Figure saling independen sehingga di-render di process pool (fork jika
+# tersedia: dataset dari proses utama ikut terwariskan tanpa disalin/dibaca
+# ulang). Figure yang key-nya (fingerprint dataset + parameter) sama dengan
+# laporan sebelumnya tidak di-render ulang.
+# Histogram/KDE & scatter dihitung dari data yang sudah di-bin (src/binning.py),
+# jadi biaya render tidak tumbuh bersama jumlah baris.
+#
+#   python src/eda.py --report reports/eda [--workers N] [--force]
+
+import os
+import json
+import html
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.binning import hist_counts, fft_kde, hist2d_counts, linear_fit, stratified_sample
+from src.figcache import figure_key, render_png
+from src.storage import arrow_path, load_table, dataset_fingerprint
+from src.suffstats import load_suffstats
+
+CLEANED_PATH = "data/spotify_cleaned.csv"
+ORIGINAL_PATH = "data/spotify_cleaned_original.csv"
+TARGET = "track_popularity"
+REPORT_VERSION = 1
+
+
+# ============================================
+# Figure (fungsi: df, plt, sns, **params -> Figure)
+# ============================================
+def fig_popularity(df, plt, sns):
+    values = df[TARGET].to_numpy(dtype=np.float64)
+    counts, edges = hist_counts(values, bins=50)
+    grid, kde = fft_kde(values)
+    color = sns.color_palette()[0]
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.stairs(counts, edges, fill=True, color=color, alpha=0.6)
+    # KDE diskalakan ke frekuensi agar sebanding dengan histogram
+    ax.plot(grid, kde * counts.sum() * np.diff(edges).mean(), color=color, linewidth=2)
+    ax.set_title("Distribusi Popularitas Lagu")
+    ax.set_xlabel("Popularitas")
+    ax.set_ylabel("Frekuensi")
+    return fig
+
+
+def fig_corr_heatmap(df, plt, sns, corr):
+    import pandas as pd
+    fig, ax = plt.subplots(figsize=(12, 8))
+    sns.heatmap(pd.DataFrame(corr), annot=False, cmap="viridis", ax=ax)
+    ax.set_title("Heatmap Korelasi Antar Fitur")
+    return fig
+
+
+def fig_feature_scatter(df, plt, sns, feature):
+    x, y = df[feature].to_numpy(dtype=np.float64), df[TARGET].to_numpy(dtype=np.float64)
+    counts, x_edges, y_edges = hist2d_counts(x, y, bins=60)
+    sample = stratified_sample(x, y, bins=30, per_bin=5)
+    slope, intercept = linear_fit(x, y)
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.pcolormesh(x_edges, y_edges, np.log1p(counts.T), cmap="Blues", shading="flat")
+    ax.scatter(x[sample], y[sample], s=4, alpha=0.5, linewidths=0)
+    ax.plot(x_edges[[0, -1]], intercept + slope * x_edges[[0, -1]], color="black", linewidth=2)
+    ax.set_title(f"{feature} vs {TARGET}")
+    ax.set_xlabel(feature)
+    ax.set_ylabel("Popularitas")
+    return fig
+
+
+def fig_counts(df, plt, sns, labels, values, title, xlabel):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(x=labels, y=values, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Jumlah Lagu")
+    ax.tick_params(axis="x", rotation=45)
+    return fig
+
+
+FIGURES = {
+    "popularity": fig_popularity,
+    "corr_heatmap": fig_corr_heatmap,
+    "feature_scatter": fig_feature_scatter,
+    "counts": fig_counts,
+}
+
+
+def figure_specs(df, corr, labels=None, target=TARGET):
+    # Urutan & isi sama dengan mode interaktif src/eda.py.
+    # labels: kolom genre/subgenre sebelum encoding (jika ada) untuk label sumbu
+    corr_with_target = corr[target].abs().sort_values(ascending=False)
+    top_features = list(corr_with_target.index[1:6])
+    specs = [
+        {"name": "popularity", "figure": "popularity", "params": {}},
+        {"name": "corr_heatmap", "figure": "corr_heatmap", "params": {"corr": corr.to_dict()}},
+    ]
+    for feature in top_features:
+        specs.append({"name": f"scatter_{feature}", "figure": "feature_scatter", "params": {"feature": feature}})
+    for col, title, xlabel in (("playlist_genre", "Top 10 Genre Terpopuler (Jumlah Lagu)", "Genre"),
+                               ("playlist_subgenre", "Top 10 Subgenre Terpopuler (Jumlah Lagu)", "Subgenre")):
+        source = labels if labels is not None and col in labels else df
+        counts = source[col].value_counts().head(10)
+        specs.append({"name": f"{col}_counts", "figure": "counts", "params": {
+            "labels": [str(v) for v in counts.index], "values": counts.to_numpy().tolist(),
+            "title": title, "xlabel": xlabel,
+        }})
+    return specs
+
+
+# ============================================
+# Render (sisi worker)
+# ============================================
+_worker = {}
+
+
+def _init_worker(cleaned_path):
+    # fork: dataset sudah terwariskan dari proses utama; spawn: baca ulang dari disk
+    if "df" not in _worker:
+        _worker["df"] = load_table(cleaned_path)
+
+
+def _plotting():
+    if "plt" not in _worker:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        _worker["plt"], _worker["sns"] = plt, sns
+    return _worker["plt"], _worker["sns"]
+
+
+def _render(spec, out_dir):
+    plt, sns = _plotting()
+    start = time.perf_counter()
+    fig = FIGURES[spec["figure"]](_worker["df"], plt, sns, **spec["params"])
+    data = render_png(fig)
+    path = os.path.join(out_dir, spec["name"] + ".png")
+    with open(path, "wb") as f:
+        f.write(data)
+    return {"name": spec["name"], "file": os.path.basename(path), "bytes": len(data),
+            "seconds": time.perf_counter() - start, "pid": os.getpid()}
+
+
+# ============================================
+# Laporan
+# ============================================
+def _previous(out_dir):
+    try:
+        with open(os.path.join(out_dir, "report.json"), encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if report.get("version") != REPORT_VERSION:
+        return {}
+    return {fig["name"]: fig for fig in report.get("figures", [])
+            if os.path.exists(os.path.join(out_dir, fig["file"]))}
+
+
+def build_report(out_dir, cleaned_path=CLEANED_PATH, original_path=ORIGINAL_PATH, workers=None, force=False):
+    wall_start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    df = load_table(cleaned_path)
+    labels = None
+    if os.path.exists(original_path) or os.path.exists(arrow_path(original_path)):
+        labels = load_table(original_path, ["playlist_genre", "playlist_subgenre"])
+    corr = load_suffstats(cleaned_path, df=df).corr()
+    fingerprint = dataset_fingerprint(cleaned_path)
+    specs = figure_specs(df, corr, labels)
+    for spec in specs:
+        spec["key"] = figure_key(fingerprint, spec["name"], spec["figure"], spec["params"])
+
+    previous = {} if force else _previous(out_dir)
+    results = {}
+    for spec in specs:
+        prev = previous.get(spec["name"])
+        if prev is not None and prev.get("key") == spec["key"]:
+            results[spec["name"]] = {**prev, "cached": True}
+    pending = [spec for spec in specs if spec["name"] not in results]
+
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    _worker["df"] = df
+    # matplotlib/seaborn diimpor sekali di proses utama; dengan fork worker mewarisinya
+    _plotting()
+    if workers == 1:
+        for spec in pending:
+            results[spec["name"]] = _render(spec, out_dir)
+    elif pending:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(cleaned_path,)) as pool:
+            futures = [pool.submit(_render, spec, out_dir) for spec in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["name"]] = result
+
+    figures = []
+    for spec in specs:
+        result = results[spec["name"]]
+        result.setdefault("cached", False)
+        figures.append({**result, "key": spec["key"], "title": _title(spec)})
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "dataset": cleaned_path,
+        "fingerprint": fingerprint,
+        "rows": len(df),
+        "workers": workers,
+        "rendered": len(pending),
+        "wall_seconds": time.perf_counter() - wall_start,
+        "figures": figures,
+    }
+    with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(render_html(report))
+    return report
+
+
+def _title(spec):
+    params = spec["params"]
+    if spec["figure"] == "feature_scatter":
+        return f"{params['feature']} vs {TARGET}"
+    if spec["figure"] == "counts":
+        return params["title"]
+    return {"popularity": "Distribusi Popularitas Lagu", "corr_heatmap": "Heatmap Korelasi Antar Fitur"}[spec["name"]]
+
+
+def render_html(report):
+    rows = "\n".join(
+        f"<tr><td>{html.escape(fig['title'])}</td><td>{fig['seconds']:.3f}</td>"
+        f"<td>{fig['bytes'] / 1024:.0f}</td><td>{'ya' if fig['cached'] else 'tidak'}</td></tr>"
+        for fig in report["figures"]
+    )
+    sections = "\n".join(
+        f"<section><h2>{html.escape(fig['title'])}</h2><img src=\"{html.escape(fig['file'])}\" "
+        f"alt=\"{html.escape(fig['title'])}\"></section>"
+        for fig in report["figures"]
+    )
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>Laporan EDA Spotify Songs</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; color: #222; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 10px; text-align: left; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>Laporan EDA Spotify Songs</h1>
+<p>Dataset: {html.escape(report['dataset'])} ({report['rows']:,} baris) &middot;
+fingerprint {report['fingerprint']} &middot; dibuat {report['created_at']} &middot;
+{report['rendered']} figure di-render oleh {report['workers']} worker dalam {report['wall_seconds']:.2f} detik</p>
+<table>
+<tr><th>Figure</th><th>Detik</th><th>KB</th><th>Cache</th></tr>
+{rows}
+</table>
+{sections}
+</body>
+</html>
+"""
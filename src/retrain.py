@@ -0,0 +1,243 @@
+# ============================================
+# Retraining di Background (Admin Dashboard / File Watch)
+# ============================================
+# Menjalankan stage "model" pipeline (src/pipeline.py, beserta upstream yang
+# kedaluwarsa) di proses terpisah, sehingga rerun dashboard tidak ikut terblokir.
+# src/model.py mempublikasikan hasilnya sebagai versi baru di registry
+# (src/registry.py) lalu memindah pointer; sesi dashboard yang sedang berjalan
+# memakai versi baru pada rerun berikutnya tanpa restart.
+#
+# Hanya satu job yang berjalan dalam satu waktu (lock file berisi PID; lock
+# dari proses yang sudah mati diabaikan). Status job terakhir ditulis ke
+# data/retrain_status.json, output-nya ke data/retrain.log.
+#
+#   python src/retrain.py                 # jalankan sekarang (foreground)
+#   python src/retrain.py --background    # jalankan di proses terpisah lalu kembali
+#   python src/retrain.py --watch         # latih ulang setiap data mentah berubah
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from src.pipeline import run_pipeline
+from src.registry import current
+
+STATUS_PATH = "data/retrain_status.json"
+LOCK_PATH = "data/retrain.lock"
+LOG_PATH = "data/retrain.log"
+WATCH_PATHS = ["data/spotify_songs.csv"]
+
+
+class RetrainBusy(RuntimeError):
+    pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _locked_pid(lock_path=LOCK_PATH):
+    try:
+        with open(lock_path, encoding="utf-8") as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return None
+    return pid if pid and _pid_alive(pid) else None
+
+
+def acquire_lock(lock_path=LOCK_PATH):
+    # O_EXCL: hanya satu proses yang berhasil membuat lock; lock basi (PID mati) dihapus dulu
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            pid = _locked_pid(lock_path)
+            if pid is not None:
+                raise RetrainBusy(f"retraining sedang berjalan (PID {pid})")
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return
+    raise RetrainBusy("lock retraining tidak bisa diambil")
+
+
+def _set_lock_owner(pid, lock_path=LOCK_PATH):
+    tmp_path = lock_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(pid))
+    os.replace(tmp_path, lock_path)
+
+
+def release_lock(lock_path=LOCK_PATH):
+    if _locked_pid(lock_path) in (None, os.getpid()):
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def write_status(status, path=STATUS_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def job_status(path=STATUS_PATH, lock_path=LOCK_PATH):
+    # Status job terakhir; job "running" yang prosesnya sudah mati dilaporkan "failed"
+    try:
+        with open(path, encoding="utf-8") as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if status.get("state") == "running" and _locked_pid(lock_path) is None:
+        status = {**status, "state": "failed", "error": "proses retraining berhenti tanpa menulis status"}
+    return status
+
+
+def run_job(trigger="manual", force=True, locked=False):
+    # Dijalankan di proses job: lock -> pipeline stage model -> status & pointer baru
+    if locked:
+        # Lock diambil oleh start_background (proses induk); klaim atas nama proses job
+        _set_lock_owner(os.getpid())
+    else:
+        acquire_lock()
+    before = (current() or {}).get("version")
+    status = {"state": "running", "trigger": trigger, "pid": os.getpid(),
+              "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "previous_version": before}
+    write_status(status)
+    start = time.perf_counter()
+    try:
+        result, _ = run_pipeline(targets=["model"], force=["model"] if force else ())
+        after = (current() or {}).get("version")
+        failed = [name for name, s in result.items() if s in ("failed", "blocked")]
+        status.update({
+            "state": "failed" if failed else "done",
+            "stages": result,
+            "version": after,
+            "changed": after != before,
+        })
+        if failed:
+            status["error"] = f"stage gagal: {', '.join(failed)} (lihat data/pipeline_logs/)"
+    except Exception as e:
+        status.update({"state": "failed", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        status.update({"finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "seconds": round(time.perf_counter() - start, 2)})
+        write_status(status)
+        release_lock()
+    return status
+
+
+def start_background(trigger="manual", force=True, log_path=LOG_PATH):
+    # Lepas job ke proses (session) baru & langsung kembali; output ke data/retrain.log.
+    # Lock diambil di sini (dua klik bersamaan tidak memulai dua job), lalu diklaim proses job.
+    # Status "running" ditulis sebelum proses job dimulai: job yang cepat selesai menimpanya
+    # dengan status akhir, tidak pernah sebaliknya.
+    acquire_lock()
+    args = [sys.executable, os.path.abspath(__file__), "--trigger", trigger, "--locked"]
+    if not force:
+        args.append("--no-force")
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    try:
+        write_status({"state": "running", "trigger": trigger, "started_at": started_at})
+        with open(log_path, "w", encoding="utf-8") as log:
+            proc = subprocess.Popen(args, cwd=ROOT, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                    start_new_session=True, env={**os.environ, "PYTHONIOENCODING": "utf-8"})
+    except BaseException as e:
+        write_status({"state": "failed", "trigger": trigger, "started_at": started_at,
+                      "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "error": f"{type(e).__name__}: {e}"})
+        release_lock()
+        raise
+    # Tunggu proses job di thread terpisah supaya tidak tersisa sebagai zombie di proses dashboard
+    threading.Thread(target=_reap, args=(proc,), daemon=True).start()
+    return proc.pid
+
+
+def _reap(proc):
+    proc.wait()
+    # Job mati sebelum sempat mengklaim lock: lock masih atas nama proses ini
+    if _locked_pid() == os.getpid():
+        release_lock()
+
+
+def _signature(paths):
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            sig.append((path, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            sig.append((path, None, None))
+    return sig
+
+
+def watch(paths=WATCH_PATHS, interval=5.0):
+    # Polling ukuran & mtime; setelah file berhenti berubah (1 interval), jalankan pipeline.
+    # Tanpa --force: stage yang input-nya tidak berubah tetap dilewati oleh pipeline.
+    last = _signature(paths)
+    print(f"👀 Memantau {', '.join(paths)} (setiap {interval:g}s)", flush=True)
+    while True:
+        time.sleep(interval)
+        sig = _signature(paths)
+        if sig == last:
+            continue
+        time.sleep(interval)
+        if _signature(paths) != sig:
+            continue
+        last = sig
+        print(f"🔁 Perubahan terdeteksi, retraining dimulai ({time.strftime('%H:%M:%S')})", flush=True)
+        try:
+            status = run_job("watch", force=False)
+        except RetrainBusy as e:
+            print(f"ℹ️ {e}; dilewati", flush=True)
+            last = None
+            continue
+        print(f"{'✅' if status['state'] == 'done' else '❌'} {status['state']}: versi {status.get('version')}"
+              + (f" ({status['error']})" if status.get("error") else ""), flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retraining model popularitas di background")
+    parser.add_argument("--background", action="store_true", help="Jalankan di proses terpisah lalu kembali")
+    parser.add_argument("--watch", action="store_true", help="Latih ulang setiap file data berubah")
+    parser.add_argument("--paths", nargs="+", default=WATCH_PATHS, help="File yang dipantau --watch")
+    parser.add_argument("--interval", type=float, default=5.0, help="Interval polling --watch (detik)")
+    parser.add_argument("--no-force", action="store_true",
+                        help="Jangan paksa stage model (hanya jalan jika input-nya berubah)")
+    parser.add_argument("--trigger", default="cli", help=argparse.SUPPRESS)
+    parser.add_argument("--locked", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    try:
+        if args.watch:
+            watch(args.paths, args.interval)
+        elif args.background:
+            pid = start_background(args.trigger, not args.no_force)
+            print(f"🚀 Retraining berjalan di background (PID {pid}), log: {LOG_PATH}")
+        else:
+            status = run_job(args.trigger, not args.no_force, args.locked)
+            print(json.dumps(status, indent=2))
+            sys.exit(0 if status["state"] == "done" else 1)
+    except RetrainBusy as e:
+        sys.exit(f"❌ {e}")
+    except KeyboardInterrupt:
+        print("\n🛑 Watch dihentikan.")
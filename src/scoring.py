@@ -0,0 +1,38 @@
+# ============================================
+# Skoring Seluruh Katalog (Batch Prediction)
+# ============================================
+# Model dijalankan sekali untuk seluruh katalog dalam satu operasi matriks.
+# Hasil prediksi & residual disimpan sebagai kolom sehingga dashboard cukup
+# membaca vektor ini tanpa memanggil model.predict per interaksi.
+
+import numpy as np
+import pandas as pd
+
+TARGET = "track_popularity"
+
+
+def model_features(model, default):
+    # Fitur sesuai urutan saat training (jika model menyimpannya)
+    names = getattr(model, "feature_names_in_", None)
+    return list(names) if names is not None else list(default)
+
+
+def score_catalog(model, df, features, target=TARGET):
+    if getattr(model, "feature_names_in_", None) is not None:
+        X = df[features]
+    else:
+        X = df[features].to_numpy(dtype=np.float64)
+    predicted = np.asarray(model.predict(X), dtype=np.float64)
+    actual = df[target].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        "actual": actual,
+        "predicted": predicted,
+        # residual > 0: model under-predict, residual < 0: model over-predict
+        "residual": actual - predicted,
+    }, index=df.index)
+
+
+def residual_leaderboard(scores, n=10, under=True):
+    col = scores["residual"]
+    idx = col.nlargest(n).index if under else col.nsmallest(n).index
+    return scores.loc[idx]
@@ -0,0 +1,138 @@
+# ============================================
+# Indeks Pencarian Judul & Artis (Trigram Inverted Index)
+# ============================================
+# Judul dan artis dinormalisasi (huruf kecil, tanpa aksen) lalu dipecah
+# menjadi trigram. Setiap trigram menyimpan daftar baris (posting list)
+# yang mengandungnya, sehingga query hanya memeriksa baris kandidat hasil
+# irisan posting list, bukan seluruh katalog.
+
+import os
+import re
+import unicodedata
+import numpy as np
+
+INDEX_VERSION = 1
+
+# Peringkat jenis kecocokan (semakin kecil semakin relevan)
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def normalize(text):
+    if not isinstance(text, str):
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", text.casefold()).strip()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, titles, artists, keys=None):
+        self.titles = [normalize(t) for t in titles]
+        self.artists = [normalize(a) for a in artists]
+        self.keys = np.arange(len(self.titles)) if keys is None else np.asarray(keys)
+        self.fingerprint = None
+
+        postings = {}
+        for row, (title, artist) in enumerate(zip(self.titles, self.artists)):
+            for gram in trigrams(title) | trigrams(artist):
+                postings.setdefault(gram, []).append(row)
+        self.postings = {g: np.array(rows, dtype=np.int32) for g, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _candidates(self, q):
+        if len(q) < 3:
+            # Query pendek: gabungkan posting list semua trigram yang memuat q
+            lists = [rows for gram, rows in self.postings.items() if q in gram]
+            return np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int32)
+
+        lists = sorted((self.postings.get(g) for g in trigrams(q)), key=lambda r: -1 if r is None else len(r))
+        if lists[0] is None:
+            return np.empty(0, dtype=np.int32)
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+            if len(rows) == 0:
+                break
+        return rows
+
+    @staticmethod
+    def _match_rank(q, text):
+        if text == q:
+            return EXACT
+        if text.startswith(q):
+            return PREFIX
+        pos = text.find(q)
+        if pos < 0:
+            return None
+        return WORD_PREFIX if text[pos - 1] == " " else SUBSTRING
+
+    def _fuzzy(self, q, exclude, limit):
+        # Toleransi typo: baris dengan porsi trigram query terbanyak
+        grams = [self.postings[g] for g in trigrams(q) if g in self.postings]
+        if not grams:
+            return []
+        hits = np.bincount(np.concatenate(grams), minlength=len(self))
+        min_hits = max(1, int(np.ceil(0.5 * len(trigrams(q)))))
+        rows = np.flatnonzero(hits >= min_hits)
+        rows = rows[~np.isin(rows, list(exclude))]
+        order = np.argsort(-hits[rows], kind="stable")[:limit]
+        return [int(r) for r in rows[order]]
+
+    def search_rows(self, query, limit=50, typo_tolerance=False):
+        q = normalize(query)
+        if not q:
+            return []
+
+        ranked = []
+        for row in self._candidates(q):
+            title_rank = self._match_rank(q, self.titles[row])
+            artist_rank = self._match_rank(q, self.artists[row])
+            if title_rank is None and artist_rank is None:
+                continue
+            # Kecocokan judul diutamakan di atas kecocokan artis pada peringkat yang sama
+            rank = min(
+                2 * title_rank if title_rank is not None else 99,
+                2 * artist_rank + 1 if artist_rank is not None else 99,
+            )
+            ranked.append((rank, len(self.titles[row]), int(row)))
+        ranked.sort()
+        rows = [row for _, _, row in ranked[:limit]]
+
+        if typo_tolerance and len(rows) < limit:
+            rows += self._fuzzy(q, set(rows), limit - len(rows))
+        return rows
+
+    def search(self, query, limit=50, typo_tolerance=False):
+        # Mengembalikan row key (index DataFrame sumber) hasil pencarian, terurut relevansi
+        return self.keys[self.search_rows(query, limit, typo_tolerance)]
+
+
+def build_index(df):
+    return SearchIndex(df["track_name"].tolist(), df["track_artist"].tolist(), df.index)
+
+
+def save_index(index, path):
+    from joblib import dump
+    tmp_path = path + ".tmp"
+    dump({"version": INDEX_VERSION, "index": index}, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_or_build_index(df, path, fingerprint):
+    # Pakai indeks tersimpan jika versi & fingerprint dataset masih cocok
+    if os.path.exists(path):
+        from joblib import load
+        saved = load(path)
+        if saved.get("version") == INDEX_VERSION and saved["index"].fingerprint == fingerprint:
+            return saved["index"]
+    index = build_index(df)
+    index.fingerprint = fingerprint
+    save_index(index, path)
+    return index
@@ -0,0 +1,262 @@
+# ============================================
+# Scoring Service (HTTP + Micro-batching)
+# ============================================
+# Server HTTP sederhana (stdlib asyncio) untuk menskor lagu tanpa Streamlit.
+# Model dimuat sekali saat start (default: versi aktif di registry, src/registry.py;
+# setelah retraining, restart service untuk memakai versi baru). Request yang datang bersamaan digabung
+# menjadi micro-batch sehingga model.predict dipanggil sekali per batch.
+#
+# Jalankan:  python src/serve.py --port 8765
+#
+#   POST /predict   {"features": {"danceability": 0.7, ...}}
+#                   {"instances": [{...}, {...}]}   atau   {"instances": [[...], [...]]}
+#   GET  /stats     throughput & persentil latensi
+#   GET  /health
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.inference import load_predictor
+from src.storage import file_digest
+from src.registry import active_paths
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class ServiceStats:
+    def __init__(self, window=10000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, n_rows, latency):
+        self.requests += 1
+        self.rows += n_rows
+        self.latencies.append(latency)
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        lat = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        return {
+            "uptime_s": round(elapsed, 3),
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "batches": self.batches,
+            "avg_batch_rows": round(self.batch_rows / self.batches, 2) if self.batches else 0.0,
+            "throughput_rows_per_s": round(self.rows / elapsed, 2) if elapsed > 0 else 0.0,
+            "throughput_requests_per_s": round(self.requests / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3)},
+        }
+
+
+class MicroBatcher:
+    def __init__(self, model, features, max_batch=256, max_wait_ms=5.0, stats=None):
+        self.model = model
+        self.features = list(features)
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.stats = stats or ServiceStats()
+        self.queue = asyncio.Queue()
+
+    def _predict(self, X):
+        return np.asarray(self.model.predict(pd.DataFrame(X, columns=self.features)), dtype=np.float64)
+
+    async def submit(self, X):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            n_rows = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            # Kumpulkan request lain sampai batch penuh atau waktu tunggu habis
+            while n_rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+
+            X = np.vstack([x for x, _ in items])
+            try:
+                y = await loop.run_in_executor(None, self._predict, X)
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.stats.batches += 1
+            self.stats.batch_rows += len(X)
+            start = 0
+            for x, future in items:
+                if not future.done():
+                    future.set_result(y[start:start + len(x)])
+                start += len(x)
+
+
+def parse_payload(payload, features):
+    # Terima satu lagu ("features") atau banyak lagu ("instances"), dict atau list
+    if not isinstance(payload, dict):
+        raise BadRequest("payload harus berupa objek JSON")
+    if "features" in payload:
+        rows = [payload["features"]]
+    elif "instances" in payload:
+        rows = payload["instances"]
+    else:
+        raise BadRequest("payload harus memiliki 'features' atau 'instances'")
+    if not isinstance(rows, list) or not rows:
+        raise BadRequest("'instances' harus berupa list yang tidak kosong")
+
+    X = np.empty((len(rows), len(features)), dtype=np.float64)
+    for i, row in enumerate(rows):
+        if isinstance(row, dict):
+            missing = [f for f in features if f not in row]
+            if missing:
+                raise BadRequest(f"instance {i}: fitur hilang {missing}")
+            values = [row[f] for f in features]
+        elif isinstance(row, list):
+            if len(row) != len(features):
+                raise BadRequest(f"instance {i}: butuh {len(features)} nilai, dapat {len(row)}")
+            values = row
+        else:
+            raise BadRequest(f"instance {i}: harus dict atau list")
+        try:
+            X[i] = [float(v) for v in values]
+        except (TypeError, ValueError):
+            raise BadRequest(f"instance {i}: nilai fitur harus numerik")
+    return X
+
+
+class ScoringServer:
+    def __init__(self, model, features, max_batch=256, max_wait_ms=5.0):
+        self.features = list(features)
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(model, features, max_batch, max_wait_ms, self.stats)
+
+    async def handle(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "features": self.features}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats.snapshot()
+        if method == "POST" and path == "/predict":
+            start = time.perf_counter()
+            try:
+                X = parse_payload(json.loads(body or b"null"), self.features)
+            except (BadRequest, json.JSONDecodeError) as exc:
+                self.stats.errors += 1
+                return 400, {"error": str(exc)}
+            try:
+                y = await self.batcher.submit(X)
+            except Exception as exc:
+                self.stats.errors += 1
+                return 500, {"error": f"prediksi gagal: {exc}"}
+            self.stats.record(len(X), time.perf_counter() - start)
+            return 200, {"predictions": y.tolist()}
+        return 404, {"error": f"tidak ada endpoint {method} {path}"}
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self._connection, host, port)
+        batch_task = asyncio.create_task(self.batcher.run())
+        print(f"✅ Scoring service berjalan di http://{host}:{port} (fitur: {self.features})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def load_scoring_model(path=None, inference_path=None):
+    # Default: versi aktif di registry (model yang sama dengan dashboard).
+    # Utamakan artefak NumPy-only; sklearn/joblib hanya dimuat jika artefak tidak ada/basi
+    active_model, active_inference, _ = active_paths()
+    if path is None:
+        path, inference_path = active_model, inference_path or active_inference
+    elif inference_path is None:
+        inference_path = os.path.splitext(path)[0] + ".npz"
+    try:
+        model = load_predictor(inference_path, file_digest(path))
+    except (OSError, ValueError, KeyError):
+        from joblib import load
+        model = load(path)
+    return model, [str(f) for f in model.feature_names_in_]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring service untuk popularity_model.pkl")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", help="Path .pkl (default: versi aktif di registry)")
+    parser.add_argument("--inference", help="Artefak NumPy-only dari src/model.py (default: versi aktif)")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.model:
+        model_path, inference_path, version = args.model, args.inference, None
+    else:
+        model_path, inference_path, version = active_paths()
+    model, features = load_scoring_model(model_path, args.inference or inference_path)
+    print(f"ℹ️ Model: {model_path}" + (f" (versi {version})" if version else ""))
+    server = ScoringServer(model, features, args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n🛑 Scoring service dihentikan.")
@@ -0,0 +1,184 @@
+# ============================================
+# Indeks "Lagu Serupa" (Nearest Neighbour Fitur Audio)
+# ============================================
+# Vektor fitur audio (kolom AUDIO_FEATURES hasil MinMaxScaler di src/cleaning.py)
+# untuk setiap track di feature store, disimpan sebagai matriks float32 yang
+# diurutkan per (playlist_genre, centroid IVF): filter genre cukup memotong satu
+# slice kontigu, tanpa menyalin atau memfilter seluruh katalog.
+#
+#   exact       : jarak Euclidean ke semua baris (per blok, ||x||² - 2x·q + ||q||²)
+#   approximate : IVF sederhana: baris dikelompokkan ke centroid k-means, query
+#                 hanya menghitung jarak ke baris di nprobe centroid terdekat
+#                 (tiap centroid = slice kontigu di dalam slice genre)
+#
+# Indeks dibangun sekali & disimpan ke data/similar_index.npz (tanpa pickle),
+# dibangun ulang otomatis jika fingerprint dataset berubah.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.storage import AUDIO_FEATURES
+
+SIMILAR_VERSION = 1
+SIMILAR_PATH = "data/similar_index.npz"
+BLOCK_ROWS = 65_536
+
+
+def _kmeans(X, n_clusters, iterations=10, seed=0, sample_rows=50):
+    # k-means (Lloyd) pada sampel baris; cukup untuk partisi kasar IVF
+    rng = np.random.default_rng(seed)
+    sample = X[rng.choice(len(X), min(len(X), n_clusters * sample_rows), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=n_clusters)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+def _nearest(X, centroids):
+    # Per blok supaya matriks jarak (baris x centroid) tidak dibuat sekaligus
+    c_norms = (centroids ** 2).sum(axis=1)
+    labels = np.empty(len(X), dtype=np.int32)
+    for b in range(0, len(X), BLOCK_ROWS):
+        labels[b:b + BLOCK_ROWS] = (c_norms - 2 * X[b:b + BLOCK_ROWS] @ centroids.T).argmin(axis=1)
+    return labels
+
+
+class SimilarityIndex:
+    def __init__(self, track_ids, vectors, genres, columns, centroids, list_ids, fingerprint=""):
+        # Baris diurutkan per (genre, centroid) -> slice kontigu per genre & per centroid
+        genres = np.asarray(genres, dtype=str)
+        order = np.lexsort((list_ids, genres))
+        self.track_ids = np.asarray(track_ids, dtype=str)[order]
+        self.vectors = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32)[order])
+        self.norms = (self.vectors.astype(np.float64) ** 2).sum(axis=1).astype(np.float32)
+        self.genres = genres[order]
+        self.columns = list(columns)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_ids = np.asarray(list_ids, dtype=np.int32)[order]
+        self.fingerprint = fingerprint
+        names, starts = np.unique(self.genres, return_index=True)
+        ends = np.append(starts[1:], len(self.genres))
+        self.genre_slices = {name: (int(s), int(e)) for name, s, e in zip(names, starts, ends)}
+        self.position = pd.Index(self.track_ids)
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def __contains__(self, track_id):
+        return track_id in self.position
+
+    def vector_of(self, track_id):
+        return self.vectors[self.position.get_loc(track_id)]
+
+    def _candidates(self, genre):
+        if genre is None:
+            return 0, len(self)
+        if genre not in self.genre_slices:
+            raise KeyError(f"genre tidak ada di indeks: {genre}")
+        return self.genre_slices[genre]
+
+    def query_vector(self, vector, k=10, genre=None, approximate=False, nprobe=8, exclude=None):
+        q = np.asarray(vector, dtype=np.float32)
+        start, end = self._candidates(genre)
+        rows = np.arange(start, end)
+        if approximate and len(self.centroids):
+            probes = np.sort(np.argsort(((self.centroids - q) ** 2).sum(axis=1))[:nprobe])
+            spans = [(start, end)] if genre is not None else self.genre_slices.values()
+            ranges = []
+            for s, e in spans:
+                lids = self.list_ids[s:e]
+                lo = s + np.searchsorted(lids, probes, "left")
+                hi = s + np.searchsorted(lids, probes, "right")
+                ranges.extend(np.arange(a, b) for a, b in zip(lo, hi) if b > a)
+            rows = np.concatenate(ranges) if ranges else rows[:0]
+        # Baris yang dikecualikan (track query) dibuang setelah top-(k+1)
+        n_best = k + (exclude is not None)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_d2 = np.empty(0, dtype=np.float32)
+        q_norm = np.float32(q @ q)
+        # Blok berurutan: memori sementara dibatasi BLOCK_ROWS, top-k digabung per blok
+        contiguous = not approximate
+        for b in range(0, len(rows), BLOCK_ROWS):
+            block = rows[b:b + BLOCK_ROWS]
+            X = self.vectors[block[0]:block[-1] + 1] if contiguous else self.vectors[block]
+            norms = self.norms[block[0]:block[-1] + 1] if contiguous else self.norms[block]
+            d2 = norms - 2 * (X @ q) + q_norm
+            if len(d2) > n_best:
+                top = np.argpartition(d2, n_best)[:n_best]
+                block, d2 = block[top], d2[top]
+            best_rows = np.concatenate([best_rows, block])
+            best_d2 = np.concatenate([best_d2, d2])
+            if len(best_d2) > n_best:
+                top = np.argpartition(best_d2, n_best)[:n_best]
+                best_rows, best_d2 = best_rows[top], best_d2[top]
+
+        order = np.argsort(best_d2, kind="stable")
+        best_rows, best_d2 = best_rows[order], best_d2[order]
+        keep = best_rows != exclude if exclude is not None else slice(None)
+        best_rows, best_d2 = best_rows[keep][:k], best_d2[keep][:k]
+        return pd.DataFrame({
+            "distance": np.sqrt(np.maximum(best_d2, 0)),
+            "playlist_genre": self.genres[best_rows],
+        }, index=pd.Index(self.track_ids[best_rows], name="track_id"))
+
+    def query(self, track_id, k=10, genre=None, approximate=False, nprobe=8):
+        # Lagu serupa untuk track_id (track itu sendiri tidak ikut dikembalikan)
+        pos = self.position.get_loc(track_id)
+        return self.query_vector(self.vectors[pos], k, genre, approximate, nprobe, exclude=pos)
+
+    def save(self, path=SIMILAR_PATH):
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.int64(SIMILAR_VERSION),
+            track_ids=self.track_ids,
+            vectors=self.vectors,
+            genres=self.genres,
+            columns=np.asarray(self.columns, dtype=str),
+            centroids=self.centroids,
+            list_ids=self.list_ids,
+            fingerprint=np.str_(self.fingerprint),
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=SIMILAR_PATH):
+        with np.load(path, allow_pickle=False) as f:
+            if int(f["version"]) != SIMILAR_VERSION:
+                raise ValueError(f"versi indeks lagu serupa {path} tidak didukung")
+            return cls(f["track_ids"], f["vectors"], f["genres"], f["columns"].tolist(),
+                       f["centroids"], f["list_ids"], str(f["fingerprint"]))
+
+
+def build_similar_index(store, columns=AUDIO_FEATURES, genre_col="playlist_genre", n_lists=None, seed=0):
+    columns = [c for c in columns if c in store.col_pos]
+    X = store.frame(columns).to_numpy(dtype=np.float32)
+    n_lists = n_lists or int(np.clip(np.sqrt(len(X)), 1, 1024))
+    centroids = _kmeans(X, min(n_lists, len(X)), seed=seed) if len(X) else np.empty((0, len(columns)), np.float32)
+    list_ids = _nearest(X, centroids) if len(X) else np.empty(0, np.int32)
+    return SimilarityIndex(store.index.to_numpy(), X, store.meta[genre_col].astype(str).to_numpy(),
+                           columns, centroids, list_ids)
+
+
+def load_or_build_similar(store, path, fingerprint):
+    # Pakai indeks tersimpan jika versi & fingerprint dataset masih cocok
+    if os.path.exists(path):
+        try:
+            index = SimilarityIndex.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    index = build_similar_index(store)
+    index.fingerprint = fingerprint
+    index.save(path)
+    return index
@@ -0,0 +1,80 @@
+# ============================================
+# Build Artefak Statistik Dashboard
+# ============================================
+# Menghitung sekali statistik global dataset bersih lalu menyimpannya ke
+# data/spotify_stats.json (versi 3):
+#   n_rows, n_cols      : ukuran dataset bersih
+#   corr, corr_pop      : matriks korelasi & korelasi tiap kolom dengan popularitas
+#   top_features        : 5 fitur dengan |korelasi| tertinggi (tanpa IDENTIFIER_COLS);
+#                         menjadi ukuran (measure) filter cube
+# Sejak versi 2, agregat yang bisa difilter TIDAK lagi disimpan di sini: jumlah lagu
+# per genre/subgenre, rata-rata popularitas per genre/subgenre, ringkasan popularitas
+# (mean, median, max, histogram) dan top/bottom 5 lagu dihitung dashboard dari
+# CubeSlice hasil FilterCube.aggregate (src/cube.py), juga tanpa filter (slice
+# penuh), supaya tampilan dengan dan tanpa filter berasal dari baris yang sama.
+# Artefak diberi versi dan fingerprint dataset; jika dataset berubah,
+# artefak dianggap kedaluwarsa dan dibangun ulang.
+#
+# Jalankan setelah cleaning:  python src/stats.py
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import IDENTIFIER_COLS, load_table, dataset_fingerprint
+
+STATS_VERSION = 3
+STATS_PATH = "data/spotify_stats.json"
+CLEANED_PATH = "data/spotify_cleaned.csv"
+RAW_PATH = "data/spotify_songs.csv"
+TARGET = "track_popularity"
+
+
+def build_stats(cleaned_path=CLEANED_PATH, raw_path=RAW_PATH):
+    df = load_table(cleaned_path)
+
+    # Korelasi (dihitung sekali untuk seluruh dashboard)
+    corr_matrix = df.corr()
+    corr_target = corr_matrix[TARGET]
+    # Kolom ID/nama tidak diranking (sama dengan SufficientStats.top_features)
+    ranked = corr_target.drop([TARGET] + IDENTIFIER_COLS, errors="ignore").abs().sort_values(ascending=False)
+    top_features = ranked.index[:5].tolist()
+
+    return {
+        "version": STATS_VERSION,
+        # Data mentah ikut fingerprint: popularitas asli di cube & chart dashboard berasal dari sana
+        "fingerprint": dataset_fingerprint(cleaned_path, raw_path),
+        "n_rows": int(df.shape[0]),
+        "n_cols": int(df.shape[1]),
+        "corr": {c: {k: float(v) for k, v in corr_matrix[c].items()} for c in corr_matrix.columns},
+        "top_features": top_features,
+        "corr_pop": {k: float(v) for k, v in corr_target.drop(TARGET).items()},
+    }
+
+
+def save_stats(stats, path=STATS_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_stats(path=STATS_PATH, cleaned_path=CLEANED_PATH, raw_path=RAW_PATH):
+    # Baca artefak; bangun ulang hanya jika belum ada, versi berbeda, atau dataset berubah
+    fingerprint = dataset_fingerprint(cleaned_path, raw_path)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            stats = json.load(f)
+        if stats.get("version") == STATS_VERSION and stats.get("fingerprint") == fingerprint:
+            return stats
+    stats = build_stats(cleaned_path, raw_path)
+    save_stats(stats, path)
+    return stats
+
+
+if __name__ == "__main__":
+    stats = build_stats()
+    save_stats(stats)
+    print(f"✅ Artefak statistik (v{STATS_VERSION}, fingerprint {stats['fingerprint'][:12]}) disimpan di: {STATS_PATH}")
@@ -0,0 +1,131 @@
+# ============================================
+# Penyimpanan Dataset Kolumnar (Arrow IPC)
+# ============================================
+# Dataset disimpan dalam format Arrow IPC tanpa kompresi supaya bisa
+# di-memory-map: hanya kolom yang dibaca yang benar-benar disentuh dari disk.
+# Jika file .arrow belum ada, loader otomatis jatuh kembali ke CSV.
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# Kolom teks berulang yang disimpan sebagai categorical
+CATEGORY_COLS = ["playlist_genre", "playlist_subgenre", "track_artist"]
+
+# Kolom ID/nama hasil LabelEncoder: kode integer sembarang, bukan fitur. Tidak ikut
+# ranking top fitur (src/suffstats.py, src/stats.py) maupun "topK"/"all" di model search
+IDENTIFIER_COLS = [
+    "track_id", "track_name", "track_artist", "track_album_id", "track_album_name",
+    "track_album_release_date", "playlist_name", "playlist_id",
+]
+
+# Fitur audio (disimpan sebagai float32)
+AUDIO_FEATURES = [
+    "danceability", "energy", "key", "loudness", "mode", "speechiness",
+    "acousticness", "instrumentalness", "liveness", "valence", "tempo",
+]
+
+
+def arrow_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+
+def compact_dtypes(df):
+    # categorical untuk genre/subgenre/artis, float32 untuk fitur audio & kolom
+    # float lain, integer di-downcast ke tipe terkecil yang muat
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if col in CATEGORY_COLS and not pd.api.types.is_numeric_dtype(s):
+            df[col] = s.astype("category")
+        elif pd.api.types.is_float_dtype(s) or (col in AUDIO_FEATURES and pd.api.types.is_numeric_dtype(s)):
+            df[col] = s.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+    return df
+
+
+def write_columnar(df, path):
+    table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=False)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_columnar(path, columns=None):
+    with pa.memory_map(path, "r") as source:
+        table = ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas(split_blocks=True)
+
+
+def load_table(csv_path, columns=None):
+    # Baca versi .arrow jika tersedia, jika tidak baca CSV (hanya kolom yang diminta)
+    path = arrow_path(csv_path)
+    if os.path.exists(path):
+        return read_columnar(path, columns)
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dataset_fingerprint(*csv_paths):
+    # Hash isi file yang benar-benar dibaca load_table (.arrow jika ada, jika tidak CSV)
+    h = hashlib.blake2b(digest_size=16)
+    for csv_path in csv_paths:
+        path = arrow_path(csv_path)
+        if not os.path.exists(path):
+            path = csv_path
+        h.update(os.path.basename(path).encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+class ColumnarWriter:
+    # Menulis file Arrow IPC secara bertahap (per chunk). Skema diambil dari
+    # chunk pertama; chunk berikutnya di-cast ke skema yang sama.
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.sink = None
+        self.writer = None
+        self.schema = None
+
+    def write(self, df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            self.sink = pa.OSFile(self.tmp_path, "wb")
+            self.writer = ipc.new_file(self.sink, self.schema)
+        else:
+            table = table.cast(self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.sink.close()
+            os.replace(self.tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self.sink is not None:
+            self.sink.close()
+            os.remove(self.tmp_path)
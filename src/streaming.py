@@ -0,0 +1,287 @@
+# ============================================
+# Cleaning Mode Streaming (Out-of-core, per Chunk)
+# ============================================
+# Versi chunked dari src/cleaning.py untuk katalog yang lebih besar dari RAM.
+#
+#   Pass 1: statistik numerik dengan sketch yang bisa di-merge
+#           (median & kuartil -> QuantileSketch) + jumlah nilai kosong per kolom
+#   Pass 2: modus kolom kategori yang punya nilai kosong, min/max baris yang lolos
+#           filter outlier + kosakata kategori (dibutuhkan MinMaxScaler & LabelEncoder)
+#   Pass 3: fill, filter outlier, scaling, encoding, tulis output per chunk
+#
+# Data mentah tidak pernah dimuat utuh, tetapi memori TIDAK sepenuhnya dibatasi
+# ukuran chunk. Yang tumbuh bersama dataset:
+#   - hash baris unik (8 byte/baris, untuk drop_duplicates)
+#   - kosakata kategori: satu entri per nilai unik per kolom, termasuk kolom
+#     berkardinalitas tinggi (track_id, track_name, album, playlist)
+#   - counter modus, hanya untuk kolom kategori yang punya nilai kosong
+# Modus kolom kategori lain tidak dihitung (seperti fill_missing di src/cleaner.py),
+# kecuali CATEGORY_COLS yang kosakatanya kecil; nilai kosong di kolom tanpa fill
+# di-encode lewat posisi sisip oleh Preprocessor.
+# Batas outlier dihitung sekali dari seluruh data (satu mask gabungan).
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from src.cleaner import add_release_columns
+from src.preprocess import Preprocessor, PREPROCESS_PATH
+from src.storage import AUDIO_FEATURES, CATEGORY_COLS, ColumnarWriter, arrow_path, dataset_fingerprint
+
+
+class QuantileSketch:
+    # Sketch kuantil bergaya KLL: buffer per level, level h berbobot 2**h.
+    # Buffer yang melebihi k diurutkan lalu setengah elemennya dipromosikan.
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        for h, buf in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) > self.k:
+                buf = np.sort(buf)
+                # Jika ganjil, satu elemen tetap di level ini
+                keep, buf = buf[:len(buf) % 2], buf[len(buf) % 2:]
+                promoted = buf[self.rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs, extra_value=None, extra_weight=0):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(b), 2.0 ** h) for h, b in enumerate(self.levels)])
+        if extra_weight:
+            values = np.append(values, extra_value)
+            weights = np.append(weights, float(extra_weight))
+        if len(values) == 0:
+            return [np.nan for _ in qs]
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        # Posisi rank tengah tiap item, lalu interpolasi linear (seperti pandas)
+        cum = np.cumsum(weights)
+        ranks = (cum - weights / 2) / cum[-1]
+        return [float(np.interp(q, ranks, values)) for q in qs]
+
+
+def _row_hashes(chunk):
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+class _Deduplicator:
+    # drop_duplicates lintas chunk: hash 64-bit baris unik disimpan sebagai blok-blok terurut.
+    # Blok baru digabung dengan blok terakhir selama blok itu tidak lebih besar (seperti
+    # counter biner), jadi tiap hash disalin O(log n) kali dan lookup memeriksa O(log n) blok,
+    # bukan menyalin & mengurutkan ulang semua hash di setiap chunk.
+    def __init__(self):
+        self.blocks = []
+
+    def _seen(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for block in self.blocks:
+            pos = np.minimum(np.searchsorted(block, hashes), len(block) - 1)
+            found |= block[pos] == hashes
+        return found
+
+    def __call__(self, chunk):
+        hashes = _row_hashes(chunk)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= ~self._seen(hashes)
+        block = np.sort(hashes[keep])
+        while self.blocks and len(self.blocks[-1]) <= len(block):
+            block = np.sort(np.concatenate([self.blocks.pop(), block]), kind="stable")
+        if len(block):
+            self.blocks.append(block)
+        return chunk[keep]
+
+
+def _read_chunks(csv_path, chunksize, num_cols=None):
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if num_cols is not None:
+            # Samakan tipe antar chunk supaya hash baris konsisten
+            for col in num_cols:
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype(np.float64)
+        yield chunk
+
+
+def _fill(chunk, fills):
+    return chunk.fillna(fills)
+
+
+def _inlier_mask(chunk, bounds):
+    mask = np.ones(len(chunk), dtype=bool)
+    for col, (lower, upper) in bounds.items():
+        values = chunk[col].to_numpy()
+        mask &= (values >= lower) & (values <= upper)
+    return mask
+
+
+def clean_streaming(csv_path, chunksize=100_000,
+                    output_path="data/spotify_cleaned.csv",
+                    original_path="data/spotify_cleaned_original.csv",
+                    sketch_k=4096, preprocess_path=PREPROCESS_PATH):
+    first = next(pd.read_csv(csv_path, nrows=1000, chunksize=1000))
+    columns = list(first.columns)
+    num_cols = list(first.select_dtypes(include=np.number).columns)
+    cat_cols = [c for c in columns if c not in num_cols]
+
+    # ============================================
+    # Pass 1: median, kuartil, jumlah nilai kosong (data tanpa duplikat)
+    # ============================================
+    sketches = {col: QuantileSketch(sketch_k) for col in num_cols}
+    nulls = dict.fromkeys(columns, 0)
+    is_int = dict.fromkeys(num_cols, True)
+    # Kosakata mentah kolom kategori kecil (tipe categorical di data/spotify_songs.arrow)
+    raw_values = {col: set() for col in CATEGORY_COLS if col in cat_cols}
+    dedup = _Deduplicator()
+    n_raw = n_unique = 0
+    for chunk in _read_chunks(csv_path, chunksize, num_cols):
+        n_raw += len(chunk)
+        chunk = dedup(chunk)
+        n_unique += len(chunk)
+        for col in num_cols:
+            values = chunk[col].to_numpy()
+            sketches[col].update(values)
+            nulls[col] += int(np.isnan(values).sum())
+            is_int[col] &= bool(np.all(values == np.round(values)))
+        for col in cat_cols:
+            nulls[col] += int(chunk[col].isna().sum())
+        for col, values in raw_values.items():
+            values.update(chunk[col].dropna().unique())
+    print(f"Pass 1: {n_raw:,} baris, {n_raw - n_unique:,} duplikat")
+
+    fills = {}
+    for col in num_cols:
+        fills[col] = sketches[col].quantiles([0.5])[0]
+
+    bounds = {}
+    for col in num_cols:
+        # Nilai yang di-fill median ikut dihitung saat menentukan kuartil
+        q1, q3 = sketches[col].quantiles([0.25, 0.75], fills[col], nulls[col])
+        iqr = q3 - q1
+        bounds[col] = (q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+
+    # ============================================
+    # Pass 2: modus kategori, min/max setelah filter outlier & kosakata kategori
+    # ============================================
+    # Batas outlier hanya bergantung pada kolom numerik, jadi modus kategori (dihitung
+    # sebelum filter) bisa dikumpulkan di pass yang sama; nilai fill-nya masuk kosakata
+    # jika ada baris kosong yang lolos filter.
+    counts = {col: Counter() for col in cat_cols if nulls[col] or col in raw_values}
+    null_kept = dict.fromkeys(counts, False)
+    col_min = dict.fromkeys(num_cols, np.inf)
+    col_max = dict.fromkeys(num_cols, -np.inf)
+    vocab = {col: set() for col in cat_cols}
+    dedup = _Deduplicator()
+    n_clean = 0
+    for chunk in _read_chunks(csv_path, chunksize, num_cols):
+        chunk = dedup(chunk)
+        for col, counter in counts.items():
+            counter.update(chunk[col].value_counts().to_dict())
+        chunk = _fill(chunk, fills)
+        chunk = chunk[_inlier_mask(chunk, bounds)]
+        n_clean += len(chunk)
+        for col in num_cols:
+            if len(chunk):
+                col_min[col] = min(col_min[col], chunk[col].min())
+                col_max[col] = max(col_max[col], chunk[col].max())
+        for col in cat_cols:
+            values = chunk[col]
+            if col in null_kept and values.isna().any():
+                null_kept[col] = True
+                values = values.dropna()
+            vocab[col].update(values.astype(str).unique())
+    print(f"Pass 2: {n_unique - n_clean:,} baris outlier dihapus, tersisa {n_clean:,}")
+
+    for col, counter in counts.items():
+        top = max(counter.values(), default=0)
+        # Sama seperti Series.mode()[0]: frekuensi tertinggi, nilai terkecil jika seri
+        fills[col] = min(v for v, n in counter.items() if n == top) if counter else np.nan
+        if null_kept[col]:
+            vocab[col].add(str(fills[col]))
+    del counts
+
+    vocab = {col: sorted(values) for col, values in vocab.items()}
+    raw_vocab = {col: sorted(str(v) for v in values) for col, values in raw_values.items()}
+    scale = {col: (col_max[col] - col_min[col]) or 1.0 for col in num_cols}
+
+    # ============================================
+    # Pass 3: transform & tulis output per chunk
+    # ============================================
+    dedup = _Deduplicator()
+    header = True
+    with ColumnarWriter(arrow_path(csv_path)) as raw_writer, \
+            ColumnarWriter(arrow_path(original_path)) as original_writer, \
+            ColumnarWriter(arrow_path(output_path)) as cleaned_writer:
+        for chunk in _read_chunks(csv_path, chunksize, num_cols):
+            raw_writer.write(_typed_raw(chunk, num_cols, is_int, raw_vocab))
+
+            chunk = _fill(dedup(chunk), fills)
+            chunk = chunk[_inlier_mask(chunk, bounds)].copy()
+            for col in num_cols:
+                chunk[col] = (chunk[col] - col_min[col]) / scale[col]
+
+            mode = "w" if header else "a"
+            original = add_release_columns(chunk)
+            original.to_csv(original_path, index=False, mode=mode, header=header)
+            original_writer.write(_typed_original(original, num_cols, vocab))
+
+            for col in cat_cols:
+                chunk[col] = pd.Categorical(chunk[col].astype(str), categories=vocab[col]).codes.astype(np.int32)
+            chunk.to_csv(output_path, index=False, mode=mode, header=header)
+            cleaned_writer.write(chunk.astype({col: np.float32 for col in num_cols}))
+            header = False
+
+    print(f"Pass 3: output ditulis ke {output_path} & {original_path} (+ .arrow)")
+
+    if preprocess_path:
+        Preprocessor(
+            columns, num_cols, cat_cols, fills,
+            [bounds[col][0] for col in num_cols], [bounds[col][1] for col in num_cols],
+            [col_min[col] for col in num_cols], [col_max[col] for col in num_cols], vocab,
+            strategy="iqr", source_fingerprint=dataset_fingerprint(csv_path),
+        ).save(preprocess_path)
+        print(f"Artefak preprocessing disimpan di: {preprocess_path}")
+    return {"rows_raw": n_raw, "rows_unique": n_unique, "rows_clean": n_clean}
+
+
+def _typed_raw(chunk, num_cols, is_int, raw_vocab):
+    # Tipe tetap untuk semua chunk (skema Arrow harus sama)
+    chunk = chunk.copy()
+    for col in num_cols:
+        if is_int[col] and col not in AUDIO_FEATURES:
+            chunk[col] = chunk[col].astype(np.int32)
+        else:
+            chunk[col] = chunk[col].astype(np.float32)
+    for col, categories in raw_vocab.items():
+        chunk[col] = pd.Categorical(chunk[col], categories=categories)
+    return chunk
+
+
+def _typed_original(chunk, num_cols, vocab):
+    chunk = chunk.astype({col: np.float32 for col in num_cols})
+    for col in CATEGORY_COLS:
+        if col in vocab:
+            chunk[col] = pd.Categorical(chunk[col].astype(str), categories=vocab[col])
+    return chunk
@@ -0,0 +1,182 @@
+# ============================================
+# Sufficient Statistics (Korelasi & Least Squares Inkremental)
+# ============================================
+# Menyimpan jumlah baris, jumlah per kolom, dan matriks cross-product (XᵀX)
+# dari dataset bersih. Korelasi, ranking top fitur, dan koefisien
+# Linear Regression dihitung langsung dari statistik ini, sehingga delta
+# katalog harian cukup di-append (O(batch)) tanpa scan ulang seluruh data.
+#
+#   python src/suffstats.py                       # build dari data/spotify_cleaned.csv
+#   python src/suffstats.py --append delta.csv    # tambah batch lagu baru (sudah di-clean)
+#   python src/suffstats.py --append delta.csv --refit   # + publikasikan model dari statistik
+#
+# Baris hasil --append belum ada di data/spotify_cleaned.csv: jumlahnya dicatat
+# (`appended`), dan src/model.py menolak melatih dari campuran statistik ini
+# dengan dataset bersih. Model untuk data yang di-append dibuat dengan --refit.
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import IDENTIFIER_COLS, load_table, dataset_fingerprint
+
+SUFFSTATS_PATH = "data/suffstats.npz"
+CLEANED_PATH = "data/spotify_cleaned.csv"
+TARGET = "track_popularity"
+
+
+class SufficientStats:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.n = 0
+        # Data digeser dengan rata-rata batch pertama supaya XᵀX stabil secara numerik
+        self.shift = None
+        self.sums = np.zeros(p)
+        self.cross = np.zeros((p, p))
+        self.source_fingerprint = None
+        self.appended = 0
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        stats = cls(df.columns if columns is None else columns)
+        stats.update(df)
+        return stats
+
+    def update(self, df):
+        X = df[self.columns].to_numpy(dtype=np.float64)
+        if len(X) == 0:
+            return self
+        if self.shift is None:
+            self.shift = X.mean(axis=0)
+        X = X - self.shift
+        self.n += len(X)
+        self.sums += X.sum(axis=0)
+        self.cross += X.T @ X
+        return self
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError("kolom sufficient statistics tidak sama")
+        if other.n == 0:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        # Geser statistik other ke shift milik self
+        d = other.shift - self.shift
+        self.cross += other.cross + np.outer(other.sums, d) + np.outer(d, other.sums) + other.n * np.outer(d, d)
+        self.sums += other.sums + other.n * d
+        self.n += other.n
+        return self
+
+    def mean(self):
+        return pd.Series(self.shift + self.sums / self.n, index=self.columns)
+
+    def cov(self):
+        m = self.sums / self.n
+        cov = (self.cross - self.n * np.outer(m, m)) / (self.n - 1)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def corr(self):
+        cov = self.cov().to_numpy()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+    def top_features(self, target=TARGET, k=5):
+        # Kolom ID/nama tidak diranking: sama dengan "topK" di src/model_search.py
+        corr_target = self.corr()[target].drop([target] + IDENTIFIER_COLS, errors="ignore")
+        return corr_target.abs().sort_values(ascending=False).index[:k].tolist()
+
+    def least_squares(self, features, target=TARGET):
+        # Koefisien OLS dengan intercept dari kovarians: Σxx β = Σxy
+        cov = self.cov()
+        beta = np.linalg.lstsq(cov.loc[features, features].to_numpy(), cov.loc[features, target].to_numpy(), rcond=None)[0]
+        mean = self.mean()
+        intercept = mean[target] - mean[features].to_numpy() @ beta
+        return beta, float(intercept)
+
+    def to_model(self, features, target=TARGET):
+        from sklearn.linear_model import LinearRegression
+        beta, intercept = self.least_squares(features, target)
+        model = LinearRegression()
+        model.coef_ = beta
+        model.intercept_ = intercept
+        model.n_features_in_ = len(features)
+        model.feature_names_in_ = np.array(features, dtype=object)
+        return model
+
+    def save(self, path=SUFFSTATS_PATH):
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, columns=np.array(self.columns), n=self.n, shift=self.shift,
+                 sums=self.sums, cross=self.cross, source_fingerprint=str(self.source_fingerprint),
+                 appended=self.appended)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=SUFFSTATS_PATH):
+        data = np.load(path, allow_pickle=False)
+        stats = cls(data["columns"].tolist())
+        stats.n = int(data["n"])
+        stats.shift = data["shift"]
+        stats.sums = data["sums"]
+        stats.cross = data["cross"]
+        stats.source_fingerprint = str(data["source_fingerprint"])
+        stats.appended = int(data["appended"]) if "appended" in data.files else 0
+        return stats
+
+
+def build_suffstats(cleaned_path=CLEANED_PATH, path=SUFFSTATS_PATH):
+    stats = SufficientStats.from_frame(load_table(cleaned_path))
+    stats.source_fingerprint = dataset_fingerprint(cleaned_path)
+    stats.save(path)
+    return stats
+
+
+def load_suffstats(cleaned_path=CLEANED_PATH, path=SUFFSTATS_PATH, df=None):
+    # Pakai store tersimpan selama dataset bersih sumbernya tidak berubah
+    fingerprint = dataset_fingerprint(cleaned_path)
+    if os.path.exists(path):
+        stats = SufficientStats.load(path)
+        if stats.source_fingerprint == fingerprint:
+            return stats
+    if df is None:
+        return build_suffstats(cleaned_path, path)
+    stats = SufficientStats.from_frame(df)
+    stats.source_fingerprint = fingerprint
+    stats.save(path)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sufficient statistics untuk korelasi & model")
+    parser.add_argument("--append", help="CSV/Arrow batch lagu baru (skala dataset bersih)")
+    parser.add_argument("--refit", action="store_true",
+                        help="Latih model dari statistik & publikasikan sebagai versi aktif di registry")
+    args = parser.parse_args()
+
+    if args.append:
+        stats = load_suffstats()
+        batch = load_table(args.append)
+        stats.update(batch)
+        stats.appended += len(batch)
+        stats.save()
+        print(f"✅ {len(batch):,} baris ditambahkan, total {stats.n:,} baris")
+    else:
+        stats = build_suffstats()
+        print(f"✅ Sufficient statistics dibangun dari {stats.n:,} baris: {SUFFSTATS_PATH}")
+
+    top_features = stats.top_features()
+    print("📊 Top 5 fitur:", top_features)
+
+    if args.refit:
+        from src.registry import save_model
+        model = stats.to_model(top_features)
+        save_model(model, top_features, TARGET,
+                   {"model": "LinearRegression (sufficient statistics)", "rows": stats.n, "appended": stats.appended})
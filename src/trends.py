@@ -0,0 +1,146 @@
+# ============================================
+# Indeks Tren per Tahun Rilis (Popularitas & Fitur Audio)
+# ============================================
+# Agregat per (tahun rilis, playlist_genre, playlist_subgenre): jumlah lagu dan
+# jumlah (Σ) popularitas asli (0-100) serta fitur audio dalam satuan aslinya
+# (nilai dari data mentah, bukan hasil MinMaxScaler). Rata-rata per tahun untuk
+# filter genre/subgenre/rentang tahun apa pun cukup menjumlahkan cell yang cocok,
+# tanpa groupby atau parsing tanggal saat render.
+# Tahun diambil dari kolom release_year hasil cleaning (src/cleaner.py).
+# Disimpan ke data/spotify_trends.npz (tanpa pickle) dengan versi & fingerprint dataset.
+#
+# Jalankan setelah cleaning:  python src/trends.py
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import AUDIO_FEATURES, load_table, dataset_fingerprint
+
+TRENDS_VERSION = 1
+TRENDS_PATH = "data/spotify_trends.npz"
+ORIGINAL_PATH = "data/spotify_cleaned_original.csv"
+RAW_PATH = "data/spotify_songs.csv"
+TARGET = "track_popularity"
+MEASURES = [TARGET] + AUDIO_FEATURES
+
+
+class TrendIndex:
+    def __init__(self, years, genres, subgenres, cell_year, cell_genre, cell_subgenre, n, sums, measures,
+                 fingerprint=""):
+        self.years = np.asarray(years, dtype=np.int16)
+        self.genres = np.asarray(genres, dtype=str)
+        self.subgenres = np.asarray(subgenres, dtype=str)
+        self.cell_year = np.asarray(cell_year, dtype=np.int16)
+        self.cell_genre = np.asarray(cell_genre, dtype=np.int32)
+        self.cell_subgenre = np.asarray(cell_subgenre, dtype=np.int32)
+        self.n = np.asarray(n, dtype=np.int64)
+        self.sums = np.asarray(sums, dtype=np.float64)
+        self.measures = list(measures)
+        self.fingerprint = fingerprint
+
+    def _mask(self, filters):
+        mask = np.ones(len(self.n), dtype=bool)
+        for labels, codes, dim in ((self.genres, self.cell_genre, "playlist_genre"),
+                                   (self.subgenres, self.cell_subgenre, "playlist_subgenre")):
+            if filters.get(dim):
+                mask &= np.isin(codes, np.flatnonzero(np.isin(labels, list(filters[dim]))))
+        if filters.get("year"):
+            lo, hi = filters["year"]
+            mask &= (self.cell_year >= lo) & (self.cell_year <= hi)
+        return mask
+
+    def series(self, measure, filters=None, by_genre=False):
+        # Rata-rata measure per tahun (DataFrame: index tahun; kolom "mean" & "n",
+        # atau satu kolom rata-rata per genre jika by_genre)
+        mask = self._mask(filters or {})
+        k = self.measures.index(measure)
+        year_pos = np.searchsorted(self.years, self.cell_year[mask])
+        n_years = len(self.years)
+        if not by_genre:
+            n = np.bincount(year_pos, weights=self.n[mask], minlength=n_years)
+            total = np.bincount(year_pos, weights=self.sums[mask, k], minlength=n_years)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frame = pd.DataFrame({"mean": total / n, "n": n.astype(np.int64)}, index=self.years)
+            return frame[frame["n"] > 0].rename_axis("release_year")
+        flat = year_pos * len(self.genres) + self.cell_genre[mask]
+        size = n_years * len(self.genres)
+        n = np.bincount(flat, weights=self.n[mask], minlength=size).reshape(n_years, -1)
+        total = np.bincount(flat, weights=self.sums[mask, k], minlength=size).reshape(n_years, -1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frame = pd.DataFrame(total / n, index=self.years, columns=self.genres)
+        return frame.loc[n.sum(axis=1) > 0, n.sum(axis=0) > 0].rename_axis("release_year")
+
+    def save(self, path=TRENDS_PATH):
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.int64(TRENDS_VERSION),
+            years=self.years, genres=self.genres, subgenres=self.subgenres,
+            cell_year=self.cell_year, cell_genre=self.cell_genre, cell_subgenre=self.cell_subgenre,
+            n=self.n, sums=self.sums,
+            measures=np.asarray(self.measures, dtype=str),
+            fingerprint=np.str_(self.fingerprint),
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=TRENDS_PATH):
+        with np.load(path, allow_pickle=False) as f:
+            if int(f["version"]) != TRENDS_VERSION:
+                raise ValueError(f"versi indeks tren {path} tidak didukung")
+            return cls(f["years"], f["genres"], f["subgenres"], f["cell_year"], f["cell_genre"],
+                       f["cell_subgenre"], f["n"], f["sums"], f["measures"].tolist(), str(f["fingerprint"]))
+
+
+def build_trends(original_path=ORIGINAL_PATH, raw_path=RAW_PATH):
+    original = load_table(original_path, ["track_id", "playlist_genre", "playlist_subgenre", "release_year"])
+    original = original[original["release_year"].to_numpy() >= 0]
+
+    # Nilai asli (bukan hasil scaling) di-join dari data mentah lewat track_id
+    raw = load_table(raw_path, ["track_id"] + MEASURES).drop_duplicates("track_id").set_index("track_id")
+    values = raw.reindex(original["track_id"])[MEASURES].to_numpy(dtype=np.float64)
+    values = np.nan_to_num(values)
+
+    genre_codes, genres = pd.factorize(original["playlist_genre"].astype("string").fillna(""), sort=True)
+    sub_codes, subgenres = pd.factorize(original["playlist_subgenre"].astype("string").fillna(""), sort=True)
+    year = original["release_year"].to_numpy(dtype=np.int64)
+    years = np.unique(year)
+
+    key = (np.searchsorted(years, year) * len(genres) + genre_codes) * len(subgenres) + sub_codes
+    cells, cell_of_row = np.unique(key, return_inverse=True)
+    n_cells = len(cells)
+    sums = np.stack([np.bincount(cell_of_row, weights=values[:, k], minlength=n_cells)
+                     for k in range(len(MEASURES))], axis=1)
+    return TrendIndex(
+        years, np.asarray(genres, dtype=str), np.asarray(subgenres, dtype=str),
+        years[cells // len(subgenres) // len(genres)], cells // len(subgenres) % len(genres),
+        cells % len(subgenres), np.bincount(cell_of_row, minlength=n_cells), sums, MEASURES,
+        dataset_fingerprint(original_path, raw_path),
+    )
+
+
+def load_trends(path=TRENDS_PATH, original_path=ORIGINAL_PATH, raw_path=RAW_PATH):
+    # Baca artefak; bangun ulang hanya jika belum ada, versi berbeda, atau dataset berubah
+    fingerprint = dataset_fingerprint(original_path, raw_path)
+    if os.path.exists(path):
+        try:
+            trends = TrendIndex.load(path)
+            if trends.fingerprint == fingerprint:
+                return trends
+        except (OSError, ValueError, KeyError):
+            pass
+    trends = build_trends(original_path, raw_path)
+    trends.save(path)
+    return trends
+
+
+if __name__ == "__main__":
+    trends = build_trends()
+    trends.save()
+    print(f"✅ Indeks tren (v{TRENDS_VERSION}, {len(trends.years)} tahun, {len(trends.n):,} cell, "
+          f"fingerprint {trends.fingerprint[:12]}) disimpan di: {TRENDS_PATH}")